@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+API Server
+Serves precomputed analysis results and model predictions to the dashboard
+
+The pipeline outputs (enhanced data, analysis results, correlation matrix,
+risk metrics, model predictions) are loaded into an immutable in-memory
+snapshot (financial_mcp.snapshot) off the event loop, and replaced
+atomically whenever they change. Request handlers only return the
+pre-serialized JSON body of the current snapshot: no disk access, no
+recomputation, no per-request serialization. Dashboards connected to the
+/ws WebSocket receive the full snapshot once and then only the changed
+entries whenever a new snapshot is published.
+
+Background jobs (financial_mcp.scheduler) keep the outputs current: an
+incremental fetch every REFRESH_INTERVAL seconds, followed by incremental
+analytics (VaR, correlations and risk metrics over the last MAX_HISTORY_DAYS)
+and a snapshot rebuild, and a full retrain every MODEL_RETRAIN_HOURS. Job timings are served at /api/scheduler.
+
+With REDIS_URL set, snapshots are shared through Redis
+(financial_mcp.result_cache): the process running the jobs publishes them,
+and workers started with RUN_SCHEDULER=0 adopt them every
+CACHE_POLL_INTERVAL seconds instead of computing their own; when no
+snapshot is shared (or it is older than CACHE_STALE_AFTER) one worker
+computes it while the others wait or keep serving the previous one. Without
+Redis each process keeps its snapshots in an in-process cache.
+
+Usage:
+    python api_server.py            # http://localhost:8000, API docs at /docs
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, Response
+from fastapi.staticfiles import StaticFiles
+
+from financial_mcp.result_cache import SharedSnapshotStore, cache_settings, connect_cache
+from financial_mcp.scheduler import JobScheduler, scheduler_settings
+from financial_mcp.snapshot import (
+    SNAPSHOT_ENDPOINTS, SnapshotStore, load_payloads, snapshot_message, delta_message
+)
+
+DASHBOARD_DIR = Path(__file__).parent / 'dashboard'
+DASHBOARD_PAGE = 'dashboard_html.html'
+
+ENHANCED_DATA_DIR = 'enhanced_data'
+MODEL_DIR = 'models'
+ANALYSIS_DIR = 'analysis_results'
+
+# REFRESH_INTERVAL, MODEL_RETRAIN_HOURS, MAX_HISTORY_DAYS and MODEL_KEEP_VERSIONS
+SETTINGS = scheduler_settings()
+
+# REDIS_URL, CACHE_TTL, CACHE_POLL_INTERVAL and CACHE_STALE_AFTER
+CACHE_SETTINGS = cache_settings()
+
+# Whether this process runs the pipeline jobs and publishes snapshots
+# (RUN_SCHEDULER=0 for additional API workers sharing the Redis cache)
+RUN_SCHEDULER = os.environ.get('RUN_SCHEDULER', '1').lower() not in ('0', 'false', 'no')
+
+# Messages queued per push client before it is resynchronized with a full snapshot
+CLIENT_QUEUE_SIZE = 16
+
+# Queue marker: send the client the full current snapshot
+_RESYNC = None
+
+def _default_store(follower: bool = not RUN_SCHEDULER) -> SharedSnapshotStore:
+    """Snapshot store over the pipeline output directories, shared through the result cache"""
+    registry = None
+    try:
+        from financial_mcp.model_registry import ModelRegistry
+        registry = ModelRegistry(MODEL_DIR)
+    except ImportError:
+        pass
+    cache = connect_cache(CACHE_SETTINGS['redis_url'], CACHE_SETTINGS['cache_ttl'])
+    loader = partial(load_payloads, ENHANCED_DATA_DIR, MODEL_DIR, (ANALYSIS_DIR, 'financial_data'),
+                     registry=registry)
+    return SharedSnapshotStore(loader, cache, follower=follower, stale_after=CACHE_SETTINGS['stale_after'])
+
+def create_pipeline_scheduler(store: SnapshotStore, settings: dict = None) -> JobScheduler:
+    """
+    Background jobs keeping the pipeline outputs and the snapshot current
+
+    Jobs:
+        fetch      incremental fetch every refresh_interval, then analytics
+        analytics  incremental analytics over max_history_days, then snapshot
+        snapshot   snapshot rebuild
+        retrain    full fetch and retrain every model_retrain_hours (also at
+                   start when no model is registered), keeping the last
+                   model_keep_versions model versions, then analytics
+
+    Args:
+        store: Snapshot store refreshed by the jobs
+        settings: Scheduler settings (default: from the environment)
+
+    Returns:
+        JobScheduler (not started)
+    """
+    from enhanced_fetch_data import EnhancedDataFetcher
+    from financial_mcp.analyze import update_analysis
+    from financial_mcp.model_backends import DEFAULT_BACKEND
+
+    settings = settings or SETTINGS
+    fetcher = EnhancedDataFetcher(
+        model_backend=os.environ.get('MODEL_BACKEND', DEFAULT_BACKEND),
+        training_mode=os.environ.get('TRAINING_MODE', 'per_asset'),
+        keep_model_versions=settings['model_keep_versions']
+    )
+    scheduler = JobScheduler()
+
+    # Fetch and retrain both rewrite enhanced_data/ and models/: one at a time
+    pipeline_lock = threading.Lock()
+
+    def fetch():
+        with pipeline_lock:
+            fetcher.refresh_enhanced_data(ENHANCED_DATA_DIR)
+        scheduler.run_job('analytics')
+
+    def analytics():
+        returns = fetcher.load_daily_returns(ENHANCED_DATA_DIR)
+        if not returns.empty:
+            update_analysis(returns, ANALYSIS_DIR, settings['max_history_days'])
+        scheduler.run_job('snapshot')
+
+    def retrain():
+        with pipeline_lock:
+            fetcher.retrain()
+        scheduler.run_job('analytics')
+
+    scheduler.add_job('fetch', fetch, settings['refresh_interval'], run_at_start=True)
+    scheduler.add_job('analytics', analytics)
+    scheduler.add_job('snapshot', store.refresh)
+    scheduler.add_job('retrain', retrain, settings['model_retrain_hours'] * 3600,
+                      run_at_start=not (Path(MODEL_DIR) / 'manifest.json').exists())
+    return scheduler
+
+class UpdateBroadcaster:
+    """
+    Pushes snapshot deltas to connected WebSocket clients
+
+    The delta message is built once per publication, in the publishing
+    thread, and the same bytes are queued for every client. Deltas are taken
+    against the last snapshot that changed anything, so publications without
+    changes push nothing. A client that falls CLIENT_QUEUE_SIZE messages
+    behind is resynchronized with a full snapshot instead.
+    """
+
+    def __init__(self, store: SnapshotStore):
+        self.store = store
+        self.clients = set()
+        self._loop = None
+        self._base = store.current
+        store.subscribe(self._on_publish)
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Event loop serving the WebSocket connections"""
+        self._loop = loop
+
+    def _on_publish(self, previous, snapshot) -> None:
+        message = delta_message(self._base, snapshot)
+        if message is None:
+            return
+        self._base = snapshot
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._fan_out, message)
+
+    def _fan_out(self, message: bytes) -> None:
+        for queue in list(self.clients):
+            if queue.full():
+                # Too far behind: drop the backlog and resynchronize
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_RESYNC)
+            else:
+                queue.put_nowait(message)
+
+    def connect(self) -> asyncio.Queue:
+        queue = asyncio.Queue(CLIENT_QUEUE_SIZE)
+        self.clients.add(queue)
+        return queue
+
+    def disconnect(self, queue: asyncio.Queue) -> None:
+        self.clients.discard(queue)
+
+async def _push_updates(websocket: WebSocket, store: SnapshotStore, queue: asyncio.Queue) -> None:
+    """Send queued messages until the client disconnects"""
+    receive = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            get = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({receive, get}, return_when=asyncio.FIRST_COMPLETED)
+            if get in done:
+                message = get.result()
+                if message is _RESYNC:
+                    message = snapshot_message(store.current)
+                await websocket.send_text(message.decode())
+            else:
+                get.cancel()
+            if receive in done:
+                if receive.result()['type'] == 'websocket.disconnect':
+                    return
+                # Client messages carry nothing; keep listening for the disconnect
+                receive = asyncio.ensure_future(websocket.receive())
+    finally:
+        receive.cancel()
+
+def _snapshot_handler(store: SnapshotStore, endpoint: str):
+    """GET handler returning one pre-serialized payload of the current snapshot"""
+    async def handler(request: Request) -> Response:
+        snapshot = store.current
+        etag = snapshot.etags[endpoint]
+        headers = {'ETag': etag, 'X-Snapshot-Version': str(snapshot.version), 'Cache-Control': 'no-cache'}
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(snapshot.bodies[endpoint], media_type='application/json', headers=headers)
+    handler.__name__ = endpoint.replace('-', '_')
+    return handler
+
+async def refresh_snapshot(store: SnapshotStore) -> bool:
+    """
+    Rebuild the snapshot (or adopt the shared one) in a worker thread
+
+    Returns:
+        False if the refresh failed
+    """
+    try:
+        version = store.current.version
+        snapshot = await asyncio.to_thread(store.refresh)
+        if snapshot.version != version:
+            print(f"🔄 Published snapshot v{snapshot.version} ({len(snapshot.payloads['prices'])} assets)")
+        return True
+    except Exception as e:
+        print(f"❌ Snapshot refresh failed, keeping v{store.current.version}: {e}")
+        return False
+
+async def _refresh_loop(store: SnapshotStore, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await refresh_snapshot(store)
+
+def create_app(
+    store: SnapshotStore = None,
+    scheduler_factory=None,
+    refresh_interval: float = SETTINGS['refresh_interval']
+) -> FastAPI:
+    """
+    Build the API application
+
+    Args:
+        store: Snapshot store to serve (default: pipeline outputs in the working directory)
+        scheduler_factory: Function building the JobScheduler of background
+            jobs from the store; None only reloads the snapshot periodically
+        refresh_interval: Seconds between snapshot reloads without a scheduler
+            (0 disables periodic reloads)
+
+    Returns:
+        FastAPI application
+    """
+    store = store if store is not None else _default_store()
+
+    broadcaster = UpdateBroadcaster(store)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        broadcaster.attach(asyncio.get_running_loop())
+        await refresh_snapshot(store)
+        task = None
+        scheduler = scheduler_factory(store) if scheduler_factory is not None else None
+        if scheduler is not None:
+            try:
+                scheduler.start()
+                app.state.scheduler = scheduler
+            except ImportError:
+                print("⚠️  apscheduler not available, only reloading the snapshot")
+                scheduler = None
+        if scheduler is None and refresh_interval > 0:
+            task = asyncio.create_task(_refresh_loop(store, refresh_interval))
+        try:
+            yield
+        finally:
+            if task is not None:
+                task.cancel()
+            if scheduler is not None:
+                scheduler.shutdown()
+
+    app = FastAPI(
+        title="Financial MCP API",
+        description="Precomputed market analytics and AI predictions",
+        lifespan=lifespan
+    )
+    app.state.store = store
+    app.state.scheduler = None
+    app.state.broadcaster = broadcaster
+
+    for endpoint in SNAPSHOT_ENDPOINTS:
+        app.add_api_route(f'/api/{endpoint}', _snapshot_handler(store, endpoint),
+                          methods=['GET'], response_class=Response, name=endpoint)
+
+    @app.get('/api/health', response_class=Response)
+    async def health() -> Response:
+        snapshot = store.current
+        body = {
+            'status': 'ok' if snapshot.version > 0 else 'starting',
+            'snapshot_version': snapshot.version,
+            'built_at': snapshot.built_at,
+            'age_seconds': round(time.time() - snapshot.built_at, 3),
+            'assets': len(snapshot.payloads['prices']),
+            'push_clients': len(broadcaster.clients),
+            'cache': getattr(getattr(store, 'cache', None), 'backend', None)
+        }
+        return Response(json.dumps(body), media_type='application/json')
+
+    @app.get('/api/scheduler', response_class=Response)
+    async def scheduler_metrics() -> Response:
+        scheduler = app.state.scheduler
+        body = {
+            'running': scheduler is not None and scheduler.running,
+            'settings': SETTINGS,
+            'jobs': scheduler.job_metrics() if scheduler is not None else {}
+        }
+        return Response(json.dumps(body), media_type='application/json')
+
+    @app.websocket('/ws')
+    async def updates(websocket: WebSocket, version: int = -1) -> None:
+        """
+        Push channel: the full snapshot on connect (unless the client already
+        has ?version=<current>), then one delta message per changed snapshot
+        """
+        await websocket.accept()
+        queue = broadcaster.connect()
+        try:
+            snapshot = store.current
+            if version != snapshot.version:
+                await websocket.send_text(snapshot_message(snapshot).decode())
+            await _push_updates(websocket, store, queue)
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            pass
+        finally:
+            broadcaster.disconnect(queue)
+
+    if DASHBOARD_DIR.exists():
+        @app.get('/', include_in_schema=False)
+        async def dashboard() -> FileResponse:
+            return FileResponse(DASHBOARD_DIR / DASHBOARD_PAGE)
+
+        # Scripts and styles referenced by the dashboard page
+        app.mount('/', StaticFiles(directory=DASHBOARD_DIR), name='dashboard')
+
+    return app
+
+if RUN_SCHEDULER:
+    app = create_app(scheduler_factory=create_pipeline_scheduler)
+else:
+    app = create_app(refresh_interval=CACHE_SETTINGS['poll_interval'])
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.environ.get('HOST', '0.0.0.0'), port=int(os.environ.get('PORT', 8000)))
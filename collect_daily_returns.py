@@ -4,8 +4,20 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import warnings
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
+from financial_mcp.price_cache import PriceCache, DEFAULT_CACHE_DIR
+from financial_mcp.resample import compound_returns, period_statistics
+
+# Price cache subdirectory of this script: unadjusted yf.download frames with
+# MultiIndex columns, unlike Ticker.history and the batched fetch (yf_batch)
+DOWNLOAD_CACHE_SUBDIR = 'yf_download'
+
+def _download_history(ticker, start_date, end_date, interval):
+    """Download a price history with yf.download for the price cache"""
+    return yf.download(ticker, start=start_date, end=end_date, interval=interval, progress=False)
+
 def get_daily_returns_data():
     """
     Collect daily returns data for S&P 500, Gold, BTC, ETH, XRP, and currency pairs
@@ -37,12 +49,15 @@ def get_daily_returns_data():
     all_data = {}
     daily_returns = {}
     
+    # Frames of this downloader differ from every other cached shape, so keep them apart
+    price_cache = PriceCache(Path(DEFAULT_CACHE_DIR) / DOWNLOAD_CACHE_SUBDIR, downloader=_download_history)
+    
     for asset_name, ticker in assets.items():
         try:
             print(f"Downloading {asset_name} ({ticker})...")
             
-            # Download historical data
-            data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+            # Download historical data (only missing ranges hit the network)
+            data = price_cache.get_history(ticker, start_date, end_date)
             
             if data.empty:
                 print(f"Warning: No data found for {asset_name}")
@@ -120,6 +135,10 @@ def analyze_currency_relationships(daily_returns):
     if not available_currencies:
         return currency_analysis
     
+    # Quarterly returns for all currencies in one pass
+    quarterly_panel = compound_returns({c: daily_returns[c] for c in available_currencies}, 'Q')
+    quarterly_stats = period_statistics(quarterly_panel)
+    
     # Calculate correlations between currencies and other assets
     for currency in available_currencies:
         currency_analysis[currency] = {
@@ -141,13 +160,13 @@ def analyze_currency_relationships(daily_returns):
         currency_analysis[currency]['annualized_volatility'] = currency_vol
         
         # Trend analysis (quarterly returns)
-        quarterly_returns = currency_returns.resample('Q').apply(lambda x: (1 + x/100).prod() - 1) * 100
+        quarterly_returns = quarterly_panel[currency].dropna()
         currency_analysis[currency]['trend_analysis'] = {
             'quarterly_returns': quarterly_returns.tolist(),
             'quarterly_dates': [d.strftime('%Y-Q%q') for d in quarterly_returns.index],
-            'best_quarter': quarterly_returns.max(),
-            'worst_quarter': quarterly_returns.min(),
-            'avg_quarterly_return': quarterly_returns.mean()
+            'best_quarter': quarterly_stats.loc[currency, 'best'],
+            'worst_quarter': quarterly_stats.loc[currency, 'worst'],
+            'avg_quarterly_return': quarterly_stats.loc[currency, 'average']
         }
     
     return currency_analysis
@@ -209,20 +228,22 @@ def create_monthly_summary(daily_returns):
     
     monthly_stats = {}
     
-    for asset, returns in daily_returns.items():
-        if len(returns) == 0:
+    # Resample every asset to monthly in one pass
+    monthly_panel = compound_returns(daily_returns, 'M')
+    period_stats = period_statistics(monthly_panel)
+    
+    for asset in monthly_panel.columns:
+        monthly_returns = monthly_panel[asset].dropna()
+        if len(monthly_returns) == 0:
             continue
-            
-        # Resample to monthly
-        monthly_returns = returns.resample('M').apply(lambda x: (1 + x/100).prod() - 1) * 100
         
         monthly_stats[asset] = {
             'monthly_returns': monthly_returns.tolist(),
             'monthly_dates': [d.strftime('%Y-%m') for d in monthly_returns.index],
-            'best_month': monthly_returns.max(),
-            'worst_month': monthly_returns.min(),
-            'avg_monthly_return': monthly_returns.mean(),
-            'monthly_volatility': monthly_returns.std()
+            'best_month': period_stats.loc[asset, 'best'],
+            'worst_month': period_stats.loc[asset, 'worst'],
+            'avg_monthly_return': period_stats.loc[asset, 'average'],
+            'monthly_volatility': period_stats.loc[asset, 'volatility']
         }
     
     return monthly_stats
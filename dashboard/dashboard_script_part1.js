@@ -1,20 +1,29 @@
 // Global variables
 let currentData = null;
+let currentVersion = -1;
 let charts = {};
+let socket = null;
+let reconnectDelay = 1000;
 let refreshInterval = null;
 
+// Snapshot payloads downloaded by a full HTTP load
+const API_ENDPOINTS = ['prices', 'predictions', 'correlations', 'alerts', 'opportunities', 'market-sentiment'];
+
+// Push channel reconnect backoff cap, and HTTP polling period while it is down
+const MAX_RECONNECT_DELAY = 30000;
+const FALLBACK_POLL_INTERVAL = 300000;
+
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', function() {
     initializeDashboard();
     setupEventListeners();
-    loadData();
 });
 
 function initializeDashboard() {
     console.log('Initializing AI-Enhanced Dashboard...');
     
-    // Set up auto-refresh (every 5 minutes)
-    refreshInterval = setInterval(loadData, 300000);
+    // The server pushes the full snapshot on connect, then only changes
+    connectUpdates();
 }
 
 function setupEventListeners() {
@@ -22,16 +31,78 @@ function setupEventListeners() {
     document.getElementById('timeFrame').addEventListener('change', updateCharts);
 }
 
+function connectUpdates() {
+    if (!('WebSocket' in window)) {
+        startPolling();
+        return;
+    }
+    
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    socket = new WebSocket(`${protocol}//${window.location.host}/ws?version=${currentVersion}`);
+    
+    socket.onopen = function() {
+        reconnectDelay = 1000;
+        stopPolling();
+    };
+    
+    socket.onmessage = function(event) {
+        const message = JSON.parse(event.data);
+        if (message.type === 'snapshot') {
+            setSnapshot(message.data, message.version);
+        } else if (message.type === 'delta') {
+            applyDelta(message);
+        }
+    };
+    
+    socket.onclose = function() {
+        socket = null;
+        startPolling();
+        setTimeout(connectUpdates, reconnectDelay);
+        reconnectDelay = Math.min(reconnectDelay * 2, MAX_RECONNECT_DELAY);
+    };
+}
+
+function resynchronize() {
+    // Reconnecting with an unknown version makes the server send the full snapshot
+    currentVersion = -1;
+    if (socket) {
+        socket.close();
+    } else {
+        loadData();
+    }
+}
+
+function startPolling() {
+    if (refreshInterval === null) {
+        loadData();
+        refreshInterval = setInterval(loadData, FALLBACK_POLL_INTERVAL);
+    }
+}
+
+function stopPolling() {
+    if (refreshInterval !== null) {
+        clearInterval(refreshInterval);
+        refreshInterval = null;
+    }
+}
+
 async function loadData() {
+    // Full download over HTTP (manual refresh, or while the push channel is down)
     try {
-        showLoading(true);
+        showLoading(currentData === null);
         
-        // In a real implementation, this would fetch from your backend API
-        // For demo purposes, we'll generate sample data
-        currentData = await generateSampleData();
+        const responses = await Promise.all(API_ENDPOINTS.map(endpoint => fetch(`/api/${endpoint}`)));
+        const data = {};
+        let version = Infinity;
+        for (let i = 0; i < API_ENDPOINTS.length; i++) {
+            if (!responses[i].ok) {
+                throw new Error(`/api/${API_ENDPOINTS[i]} returned ${responses[i].status}`);
+            }
+            data[API_ENDPOINTS[i]] = await responses[i].json();
+            version = Math.min(version, parseInt(responses[i].headers.get('X-Snapshot-Version') || '-1', 10));
+        }
         
-        updateDashboard();
-        showLoading(false);
+        setSnapshot(data, version);
         
     } catch (error) {
         console.error('Error loading data:', error);
@@ -48,81 +119,83 @@ function refreshData() {
     loadData();
 }
 
-async function generateSampleData() {
-    // This simulates real-time data that would come from your backend
-    const assets = ['SP500', 'Gold', 'Bitcoin', 'Ethereum', 'XRP', 'JPY_USD', 'EUR_USD', 'USD_Index'];
-    const data = {
-        prices: {},
-        predictions: {},
-        sentiment: Math.random() > 0.5 ? (Math.random() > 0.5 ? 'bullish' : 'bearish') : 'neutral',
-        alerts: [],
-        opportunities: [],
-        correlations: {}
-    };
-    
-    assets.forEach(asset => {
-        const basePrice = Math.random() * 1000 + 100;
-        const dailyReturn = (Math.random() - 0.5) * 10;
-        const volatility = Math.random() * 5 + 1;
-        
-        data.prices[asset] = {
-            current: basePrice,
-            change: dailyReturn,
-            volatility: volatility,
-            history: generatePriceHistory(basePrice, 30)
-        };
-        
-        data.predictions[asset] = {
-            ai: (Math.random() - 0.5) * 5,
-            traditional: (Math.random() - 0.5) * 5,
-            confidence: Math.random() * 0.8 + 0.2
-        };
-        
-        // Add high volatility alerts
-        if (volatility > 4) {
-            data.alerts.push(`High volatility detected in ${asset}: ${volatility.toFixed(2)}%`);
-        }
-        
-        // Add opportunities
-        if (Math.abs(data.predictions[asset].ai) > 2 && data.predictions[asset].confidence > 0.7) {
-            data.opportunities.push({
-                asset: asset,
-                prediction: data.predictions[asset].ai,
-                confidence: data.predictions[asset].confidence
-            });
-        }
+function parsePrice(price) {
+    // History dates arrive as ISO strings
+    return Object.assign({}, price, {
+        history: (price.history || []).map(d => Object.assign({}, d, { date: new Date(d.date) }))
     });
-    
-    // Generate correlation matrix
-    assets.forEach(asset1 => {
-        data.correlations[asset1] = {};
-        assets.forEach(asset2 => {
-            if (asset1 === asset2) {
-                data.correlations[asset1][asset2] = 1;
-            } else {
-                data.correlations[asset1][asset2] = (Math.random() - 0.5) * 2;
-            }
-        });
+}
+
+function setSnapshot(data, version) {
+    const prices = {};
+    Object.entries(data.prices || {}).forEach(([asset, price]) => {
+        prices[asset] = parsePrice(price);
     });
     
-    return data;
+    currentData = {
+        prices: prices,
+        predictions: data.predictions || {},
+        sentiment: (data['market-sentiment'] || {}).sentiment || 'neutral',
+        alerts: data.alerts || [],
+        opportunities: data.opportunities || [],
+        correlations: data.correlations || {}
+    };
+    currentVersion = version;
+    
+    updateDashboard();
+    showLoading(false);
 }
 
-function generatePriceHistory(basePrice, days) {
-    const history = [];
-    let currentPrice = basePrice;
+function applyDelta(message) {
+    if (currentData === null || currentVersion < message.base_version) {
+        // Missed an update
+        resynchronize();
+        return;
+    }
+    if (currentVersion >= message.version) {
+        return;
+    }
     
-    for (let i = 0; i < days; i++) {
-        const change = (Math.random() - 0.5) * 0.1;
-        currentPrice *= (1 + change);
-        history.push({
-            date: new Date(Date.now() - (days - i) * 24 * 60 * 60 * 1000),
-            price: currentPrice,
-            return: change * 100
+    const changes = message.changes;
+    ['prices', 'predictions', 'correlations'].forEach(key => {
+        if (!changes[key]) {
+            return;
+        }
+        Object.entries(changes[key].changed).forEach(([asset, entry]) => {
+            currentData[key][asset] = key === 'prices' ? parsePrice(entry) : entry;
+        });
+        changes[key].removed.forEach(asset => {
+            delete currentData[key][asset];
         });
+    });
+    if (changes.alerts) {
+        currentData.alerts = changes.alerts;
     }
+    if (changes.opportunities) {
+        currentData.opportunities = changes.opportunities;
+    }
+    if (changes['market-sentiment']) {
+        currentData.sentiment = changes['market-sentiment'].sentiment;
+    }
+    currentVersion = message.version;
     
-    return history;
+    // Redraw only the sections whose data changed
+    if (changes['market-sentiment']) updateMarketSentiment();
+    if (changes.alerts) updateAlerts();
+    if (changes.opportunities) updateOpportunities();
+    if (changes.prices) {
+        updateRealTimeData();
+        updateCharts();
+    }
+    if (changes.predictions) updatePredictionComparison();
+    if (changes.correlations) updateCorrelationMatrix();
+}
+
+function formatPercent(value) {
+    if (value === null || value === undefined) {
+        return 'n/a';
+    }
+    return `${value > 0 ? '+' : ''}${value.toFixed(2)}%`;
 }
 
 function updateDashboard() {
@@ -150,7 +223,7 @@ function updateAlerts() {
     if (currentData.alerts.length > 0) {
         container.style.display = 'block';
         list.innerHTML = currentData.alerts.map(alert => 
-            `<div class="alert-item">${alert}</div>`
+            `<div class="alert-item">${alert.message || alert}</div>`
         ).join('');
     } else {
         container.style.display = 'none';
@@ -162,13 +235,14 @@ function updateOpportunities() {
     
     if (currentData.opportunities.length > 0) {
         list.innerHTML = currentData.opportunities
-            .sort((a, b) => b.confidence - a.confidence)
+            .slice()
+            .sort((a, b) => (b.confidence || 0) - (a.confidence || 0))
             .slice(0, 5)
             .map(opp => `
                 <li class="opportunity-item">
-                    <strong>${opp.asset}</strong>: ${opp.prediction > 0 ? '+' : ''}${opp.prediction.toFixed(2)}%
+                    <strong>${opp.asset}</strong>: ${formatPercent(opp.prediction)}
                     <div class="confidence-bar">
-                        <div class="confidence-fill" style="width: ${opp.confidence * 100}%"></div>
+                        <div class="confidence-fill" style="width: ${(opp.confidence || 0) * 100}%"></div>
                     </div>
                 </li>
             `).join('');
@@ -185,7 +259,7 @@ function updateRealTimeData() {
             <h4>${asset}</h4>
             <div class="data-value">$${data.current.toFixed(2)}</div>
             <div class="data-change ${data.change >= 0 ? 'positive' : 'negative'}">
-                ${data.change >= 0 ? '+' : ''}${data.change.toFixed(2)}%
+                ${formatPercent(data.change)}
             </div>
         </div>
     `).join('');
@@ -5,11 +5,11 @@ function updatePredictionComparison() {
         <div class="prediction-item">
             <h4>${asset}</h4>
             <div class="prediction-values">
-                <span class="ai-prediction">AI: ${pred.ai > 0 ? '+' : ''}${pred.ai.toFixed(2)}%</span>
-                <span class="traditional-prediction">Trad: ${pred.traditional > 0 ? '+' : ''}${pred.traditional.toFixed(2)}%</span>
+                <span class="ai-prediction">AI: ${formatPercent(pred.ai)}</span>
+                <span class="traditional-prediction">Trad: ${formatPercent(pred.traditional)}</span>
             </div>
             <div class="confidence-bar">
-                <div class="confidence-fill" style="width: ${pred.confidence * 100}%"></div>
+                <div class="confidence-fill" style="width: ${(pred.confidence || 0) * 100}%"></div>
             </div>
         </div>
     `).join('');
@@ -29,6 +29,10 @@ function updateCorrelationMatrix() {
         html += `<tr><th>${asset1}</th>`;
         assets.forEach(asset2 => {
             const corr = currentData.correlations[asset1][asset2];
+            if (corr === null || corr === undefined) {
+                html += '<td class="corr-low">n/a</td>';
+                return;
+            }
             const absCorr = Math.abs(corr);
             let className = 'corr-low';
             
@@ -45,8 +49,15 @@ function updateCorrelationMatrix() {
 }
 
 function updateCharts() {
-    const selectedAsset = document.getElementById('assetSelect').value;
+    if (currentData === null || Object.keys(currentData.prices).length === 0) {
+        return;
+    }
+    
+    let selectedAsset = document.getElementById('assetSelect').value;
     const timeFrame = document.getElementById('timeFrame').value;
+    if (!(selectedAsset in currentData.prices)) {
+        selectedAsset = 'all';
+    }
     
     updatePriceChart(selectedAsset);
     updateVolatilityChart(selectedAsset);
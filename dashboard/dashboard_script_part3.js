@@ -96,21 +96,12 @@ function updateRiskReturnChart() {
     });
 }
 
-// WebSocket connection for real-time updates (optional)
-function initWebSocket() {
-    // This would connect to your WebSocket server for real-time updates
-    // const ws = new WebSocket('ws://localhost:8080/ws');
-    // ws.onmessage = function(event) {
-    //     const data = JSON.parse(event.data);
-    //     updateRealTimeData(data);
-    // };
-}
-
 // Export functions for testing
 if (typeof module !== 'undefined' && module.exports) {
     module.exports = {
         updateDashboard,
         updateCharts,
-        generateSampleData
+        setSnapshot,
+        applyDelta
     };
 }
\ No newline at end of file
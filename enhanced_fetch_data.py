@@ -4,7 +4,6 @@ Enhanced Financial Data Fetcher with AI Integration
 Builds upon the original fetch_financial_data.py with AI capabilities
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,18 +12,37 @@ import json
 import warnings
 warnings.filterwarnings('ignore')
 
-# AI/ML imports
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
+from financial_mcp.price_cache import PriceCache, DEFAULT_CACHE_DIR
+from financial_mcp.indicators import compute_indicators, TECHNICAL_INDICATORS, VOLATILITY_INDICATORS
+from financial_mcp.indicator_state import (
+    IndicatorState, FEATURE_COLUMNS, FEATURE_LAGS, feature_matrix_columns,
+    save_indicator_states, load_indicator_states
+)
+from financial_mcp.fetch_data import DEFAULT_ASSETS
+from financial_mcp.storage import load_frame, naive_datetime_index
+from financial_mcp.training import (
+    build_training_set, train_asset_models, train_pooled_model, compare_training_modes,
+    MIN_TRAINING_ROWS, TRAINING_MODES, POOLED_MODEL_NAME
+)
+from financial_mcp.backtest import walk_forward_backtest
+from financial_mcp.model_backends import DEFAULT_BACKEND, get_backend, benchmark_backends
+from financial_mcp.model_registry import ModelRegistry, data_fingerprint, DEFAULT_KEEP_VERSIONS
+from financial_mcp.online_model import train_online_models, save_online_models, load_online_models
+
+INDICATOR_STATE_FILE = 'enhanced_data/indicator_state.json'
+MODEL_REGISTRY_DIR = 'models'
+ONLINE_MODEL_DIR = 'models/online'
+
+# Asset class of each Yahoo Finance symbol (features of the pooled model)
+ASSET_CLASSES = {symbol: category for category, symbols in DEFAULT_ASSETS.items() for symbol in symbols}
 
 class EnhancedDataFetcher:
     """
     Enhanced version of the original data fetcher with AI capabilities
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, model_backend=DEFAULT_BACKEND, training_mode='per_asset',
+                 keep_model_versions=DEFAULT_KEEP_VERSIONS):
         self.assets = {
             'SP500': '^GSPC',
             'Gold': 'GC=F',
@@ -39,6 +57,30 @@ class EnhancedDataFetcher:
         self.start_date = '2020-01-01'
         self.end_date = datetime.now().strftime('%Y-%m-%d')
         
+        # Persistent price cache: refreshes only download the missing tail
+        self.price_cache = PriceCache(cache_dir)
+        
+        # Per-asset indicator state for incremental feature updates
+        self.indicator_states = {}
+        
+        # Regressor behind the prediction models (see financial_mcp.model_backends)
+        self.model_backend = get_backend(model_backend).name
+        
+        # One model per asset, or one pooled model for all assets
+        if training_mode not in TRAINING_MODES:
+            raise ValueError(f"Unknown training mode '{training_mode}'. Choose from: {', '.join(TRAINING_MODES)}")
+        self.training_mode = training_mode
+        self.asset_classes = {name: ASSET_CLASSES.get(symbol, 'other') for name, symbol in self.assets.items()}
+        
+        # Registered model versions kept on disk after each retrain (None keeps all)
+        self.keep_model_versions = keep_model_versions
+        
+        # Online (RLS) models updated on every refresh
+        self.online_models = {}
+        
+        # Raw bars processed by the last incremental update
+        self.new_bars = {}
+        
     def fetch_enhanced_data(self):
         """
         Fetch data with enhanced features for AI analysis
@@ -53,9 +95,8 @@ class EnhancedDataFetcher:
             print(f"Processing {asset_name} ({symbol})...")
             
             try:
-                # Fetch basic data
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(start=self.start_date, end=self.end_date)
+                # Fetch basic data (only missing ranges hit the network)
+                data = self.price_cache.get_history(symbol, self.start_date, self.end_date)
                 
                 if data.empty:
                     print(f"  ⚠️  No data found for {asset_name}")
@@ -63,56 +104,57 @@ class EnhancedDataFetcher:
                 
                 # Calculate basic returns
                 data['Daily_Return'] = data['Close'].pct_change() * 100
-                
-                # Add enhanced features
-                data = self._add_technical_indicators(data)
-                data = self._add_time_features(data)
-                data = self._add_volatility_features(data)
-                
                 all_data[asset_name] = data
-                enhanced_features[asset_name] = self._create_feature_matrix(data)
-                
-                print(f"  ✅ Successfully processed {len(data)} days")
-                print(f"  📊 Features created: {enhanced_features[asset_name].shape[1]}")
                 
             except Exception as e:
                 print(f"  ❌ Error processing {asset_name}: {str(e)}")
                 continue
         
+        if not all_data:
+            return all_data, enhanced_features
+        
+        # Technical and volatility indicators for every asset in one vectorized pass
+        indicators = self._compute_panel_indicators(all_data)
+        
+        for asset_name, data in all_data.items():
+            for feature, values in indicators.items():
+                data[feature] = values[asset_name].reindex(data.index)
+            data = self._add_time_features(data)
+            
+            all_data[asset_name] = data
+            enhanced_features[asset_name] = self._create_feature_matrix(data)
+            self.indicator_states[asset_name] = IndicatorState.from_history(data)
+            
+            print(f"  ✅ {asset_name}: processed {len(data)} days")
+            print(f"  📊 Features created: {enhanced_features[asset_name].shape[1]}")
+        
         return all_data, enhanced_features
     
+    def _compute_panel_indicators(self, all_data, indicators=TECHNICAL_INDICATORS + VOLATILITY_INDICATORS):
+        """
+        Compute indicators on the (date x asset) close/high/low panel of all assets
+        """
+        close = pd.DataFrame({name: data['Close'] for name, data in all_data.items()})
+        high = pd.DataFrame({name: data['High'] for name, data in all_data.items()})
+        low = pd.DataFrame({name: data['Low'] for name, data in all_data.items()})
+        return compute_indicators(close, high, low, indicators)
+    
+    def _add_indicators(self, data, indicators):
+        """
+        Add indicators from the vectorized engine to a single asset's data
+        """
+        results = compute_indicators(
+            data['Close'].to_numpy(), data['High'].to_numpy(), data['Low'].to_numpy(), indicators
+        )
+        for feature, values in results.items():
+            data[feature] = values[:, 0]
+        return data
+    
     def _add_technical_indicators(self, data):
         """
         Add technical indicators to the data
         """
-        # Moving averages
-        data['MA_5'] = data['Close'].rolling(window=5).mean()
-        data['MA_10'] = data['Close'].rolling(window=10).mean()
-        data['MA_20'] = data['Close'].rolling(window=20).mean()
-        data['MA_50'] = data['Close'].rolling(window=50).mean()
-        
-        # Exponential moving averages
-        data['EMA_12'] = data['Close'].ewm(span=12).mean()
-        data['EMA_26'] = data['Close'].ewm(span=26).mean()
-        
-        # MACD
-        data['MACD'] = data['EMA_12'] - data['EMA_26']
-        data['MACD_Signal'] = data['MACD'].ewm(span=9).mean()
-        data['MACD_Histogram'] = data['MACD'] - data['MACD_Signal']
-        
-        # RSI
-        data['RSI'] = self._calculate_rsi(data['Close'])
-        
-        # Bollinger Bands
-        data['BB_Upper'], data['BB_Lower'] = self._calculate_bollinger_bands(data['Close'])
-        data['BB_Width'] = data['BB_Upper'] - data['BB_Lower']
-        data['BB_Position'] = (data['Close'] - data['BB_Lower']) / data['BB_Width']
-        
-        # Price momentum
-        data['Momentum_5'] = data['Close'].pct_change(5)
-        data['Momentum_10'] = data['Close'].pct_change(10)
-        
-        return data
+        return self._add_indicators(data, TECHNICAL_INDICATORS)
     
     def _add_time_features(self, data):
         """
@@ -135,146 +177,300 @@ class EnhancedDataFetcher:
         """
         Add volatility-based features
         """
-        # Rolling volatility
-        data['Vol_5'] = data['Daily_Return'].rolling(window=5).std()
-        data['Vol_10'] = data['Daily_Return'].rolling(window=10).std()
-        data['Vol_20'] = data['Daily_Return'].rolling(window=20).std()
-        data['Vol_30'] = data['Daily_Return'].rolling(window=30).std()
-        
-        # Volatility ratios
-        data['Vol_Ratio_5_20'] = data['Vol_5'] / data['Vol_20']
-        data['Vol_Ratio_10_30'] = data['Vol_10'] / data['Vol_30']
-        
-        # High-Low volatility
-        data['HL_Volatility'] = (data['High'] - data['Low']) / data['Close']
-        
-        return data
-    
-    def _calculate_rsi(self, prices, window=14):
-        """
-        Calculate Relative Strength Index
-        """
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def _calculate_bollinger_bands(self, prices, window=20, num_std=2):
-        """
-        Calculate Bollinger Bands
-        """
-        rolling_mean = prices.rolling(window=window).mean()
-        rolling_std = prices.rolling(window=window).std()
-        
-        upper_band = rolling_mean + (rolling_std * num_std)
-        lower_band = rolling_mean - (rolling_std * num_std)
-        
-        return upper_band, lower_band
+        return self._add_indicators(data, VOLATILITY_INDICATORS)
     
     def _create_feature_matrix(self, data):
         """
         Create feature matrix for ML models
         """
-        feature_columns = [
-            'MA_5', 'MA_10', 'MA_20', 'MA_50',
-            'EMA_12', 'EMA_26', 'MACD', 'MACD_Signal', 'MACD_Histogram',
-            'RSI', 'BB_Width', 'BB_Position',
-            'Momentum_5', 'Momentum_10',
-            'Vol_5', 'Vol_10', 'Vol_20', 'Vol_30',
-            'Vol_Ratio_5_20', 'Vol_Ratio_10_30',
-            'HL_Volatility',
-            'Day_Sin', 'Day_Cos', 'Month_Sin', 'Month_Cos'
-        ]
-        
         # Select only available columns
-        available_columns = [col for col in feature_columns if col in data.columns]
+        available_columns = [col for col in FEATURE_COLUMNS if col in data.columns]
         features = data[available_columns].copy()
         
         # Add lagged features
-        for lag in [1, 2, 3, 5]:
+        for lag in FEATURE_LAGS:
             features[f'Close_lag_{lag}'] = data['Close'].shift(lag)
             features[f'Return_lag_{lag}'] = data['Daily_Return'].shift(lag)
         
         return features
     
-    def train_prediction_models(self, enhanced_features):
+    def update_enhanced_features(self, state_file=INDICATOR_STATE_FILE, online_model_dir=ONLINE_MODEL_DIR):
         """
-        Train AI models for each asset
+        Compute feature rows only for bars newer than the saved indicator state
+        
+        Assets without a saved state are seeded from their full history.
+        Online models learn from the new bars and are checkpointed.
         """
-        print("\nTraining AI prediction models...")
-        print("=" * 40)
+        print(f"Updating enhanced features to {self.end_date}")
+        print("=" * 60)
         
-        models = {}
-        model_performance = {}
+        if not self.indicator_states:
+            self.indicator_states = load_indicator_states(state_file)
+        if not self.online_models:
+            self.online_models = load_online_models(online_model_dir)
         
-        for asset_name, features in enhanced_features.items():
-            print(f"Training model for {asset_name}...")
-            
+        new_features = {}
+        self.new_bars = {}
+        
+        for asset_name, symbol in self.assets.items():
             try:
-                # Create target variable (next day return)
-                target = features.shift(-1)['Daily_Return'] if 'Daily_Return' in features.columns else None
-                
-                if target is None:
-                    # If Daily_Return not in features, we need to get it from original data
+                data = self.price_cache.get_history(symbol, self.start_date, self.end_date)
+                if data.empty:
+                    print(f"  ⚠️  No data found for {asset_name}")
                     continue
                 
-                # Remove NaN values
-                valid_indices = ~(features.isna().any(axis=1) | target.isna())
-                X = features[valid_indices]
-                y = target[valid_indices]
-                
-                if len(X) < 100:
-                    print(f"  ⚠️  Insufficient data for {asset_name}")
+                state = self.indicator_states.get(asset_name)
+                if state is None or state.last_date is None:
+                    self.indicator_states[asset_name] = IndicatorState.from_history(data)
+                    print(f"  🌱 {asset_name}: seeded state from {len(data)} days")
                     continue
                 
-                # Split data
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X, y, test_size=0.2, random_state=42, shuffle=False
+                # Only the bars after the state's last bar are processed
+                new_bars = data[data.index > state.last_date].dropna(subset=['Close'])
+                rows = [
+                    state.update(date, bar['Close'], bar['High'], bar['Low'])
+                    for date, bar in new_bars.iterrows()
+                ]
+                new_features[asset_name] = pd.DataFrame(
+                    rows, index=new_bars.index, columns=feature_matrix_columns()
                 )
+                self.new_bars[asset_name] = new_bars
+                print(f"  ✅ {asset_name}: {len(rows)} new rows")
                 
-                # Scale features
-                scaler = StandardScaler()
-                X_train_scaled = scaler.fit_transform(X_train)
-                X_test_scaled = scaler.transform(X_test)
-                
-                # Train model
-                model = RandomForestRegressor(
-                    n_estimators=100,
-                    random_state=42,
-                    n_jobs=-1
-                )
-                
-                model.fit(X_train_scaled, y_train)
-                
-                # Evaluate model
-                y_pred = model.predict(X_test_scaled)
-                r2 = r2_score(y_test, y_pred)
-                rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+                if asset_name in self.online_models:
+                    learned = self.online_models[asset_name].observe(new_features[asset_name], new_bars['Close'])
+                    print(f"  🔄 {asset_name}: online model learned from {learned} new bars")
                 
-                models[asset_name] = {
-                    'model': model,
-                    'scaler': scaler,
-                    'features': X.columns.tolist()
-                }
-                
-                model_performance[asset_name] = {
-                    'r2_score': r2,
-                    'rmse': rmse,
-                    'training_samples': len(X_train),
-                    'test_samples': len(X_test)
-                }
+            except Exception as e:
+                print(f"  ❌ Error updating {asset_name}: {str(e)}")
+                continue
+        
+        save_indicator_states(self.indicator_states, state_file)
+        if self.online_models:
+            save_online_models(self.online_models, online_model_dir)
+        return new_features
+    
+    def refresh_enhanced_data(self, directory='enhanced_data', state_file=INDICATOR_STATE_FILE,
+                              online_model_dir=ONLINE_MODEL_DIR):
+        """
+        Incremental refresh of the saved enhanced data
+        
+        Runs update_enhanced_features up to today and appends the new bars
+        and feature rows to <asset>_enhanced_data.csv and <asset>_features.csv.
+        Assets without saved files are left to the next full run.
+        
+        Returns:
+            Number of rows appended
+        """
+        self.end_date = datetime.now().strftime('%Y-%m-%d')
+        new_features = self.update_enhanced_features(state_file, online_model_dir)
+        
+        appended = 0
+        for asset_name, features in new_features.items():
+            if features.empty:
+                continue
+            data_file = os.path.join(directory, f'{asset_name}_enhanced_data.csv')
+            features_file = os.path.join(directory, f'{asset_name}_features.csv')
+            if not (os.path.exists(data_file) and os.path.exists(features_file)):
+                print(f"  ⚠️  No saved data for {asset_name}, skipping append")
+                continue
+            
+            try:
+                # Saved files and new bars may carry UTC offsets that change
+                # across DST; compare and append on naive wall-clock dates
+                features = features.set_axis(naive_datetime_index(features.index))
+                data = load_frame(data_file, parse_dates=True)
+                data = data[data.index < features.index[0]]
                 
-                print(f"  ✅ R² Score: {r2:.4f}, RMSE: {rmse:.4f}")
+                new_data = self.new_bars[asset_name].copy()
+                new_data.index = features.index
+                closes = pd.concat([data['Close'].iloc[-1:], new_data['Close']])
+                new_data['Daily_Return'] = closes.pct_change().iloc[1:] * 100
+                for column in features.columns:
+                    if column in data.columns and column not in new_data.columns:
+                        new_data[column] = features[column]
+                new_data = self._add_time_features(new_data)
+                pd.concat([data, new_data]).to_csv(data_file)
                 
+                saved = load_frame(features_file, parse_dates=True)
+                pd.concat([saved[saved.index < features.index[0]], features]).to_csv(features_file)
+                appended += len(features)
             except Exception as e:
-                print(f"  ❌ Error training model for {asset_name}: {str(e)}")
+                print(f"  ❌ Error appending {asset_name}: {str(e)}")
                 continue
         
+        print(f"  💾 Appended {appended} new rows to {directory}/")
+        return appended
+    
+    def load_daily_returns(self, directory='enhanced_data'):
+        """
+        Daily returns of every asset from the saved enhanced data
+        
+        Returns:
+            DataFrame with one Daily_Return column per asset (date index)
+        """
+        returns = {}
+        for asset_name in self.assets:
+            data_file = os.path.join(directory, f'{asset_name}_enhanced_data.csv')
+            if os.path.exists(data_file):
+                data = load_frame(data_file, parse_dates=True)
+                returns[asset_name] = data['Daily_Return']
+        return pd.DataFrame(returns).sort_index()
+    
+    def retrain(self):
+        """
+        Full run: fetch the complete history, retrain the AI and online
+        models, backtest them and save everything as a new model version
+        
+        Returns:
+            Tuple of (all_data, model_performance); empty when nothing was fetched
+        """
+        self.end_date = datetime.now().strftime('%Y-%m-%d')
+        all_data, enhanced_features = self.fetch_enhanced_data()
+        if not all_data:
+            return all_data, {}
+        
+        models, model_performance = self.train_prediction_models(enhanced_features, all_data)
+        self.train_online_models(enhanced_features, all_data)
+        backtest_results = self.backtest_prediction_models(enhanced_features, all_data)
+        self.save_enhanced_data(all_data, enhanced_features, models, model_performance, backtest_results)
+        return all_data, model_performance
+    
+    def _build_training_sets(self, enhanced_features, all_data):
+        """
+        Align each asset's feature matrix with its next-day Daily_Return
+        """
+        training_sets = {}
+        for asset_name, features in enhanced_features.items():
+            if asset_name not in all_data or 'Daily_Return' not in all_data[asset_name].columns:
+                print(f"  ⚠️  No return data for {asset_name}")
+                continue
+            
+            X, y = build_training_set(features, all_data[asset_name])
+            if len(X) < MIN_TRAINING_ROWS:
+                print(f"  ⚠️  Insufficient data for {asset_name}")
+                continue
+            training_sets[asset_name] = (X, y)
+        return training_sets
+    
+    def train_prediction_models(self, enhanced_features, all_data, n_jobs=None):
+        """
+        Train AI models for each asset
+        
+        The target is each asset's next-day Daily_Return from the raw data.
+        Models are trained in parallel, one process per asset, with the
+        configured model backend; in pooled mode a single model is trained
+        on all assets and returned under the 'pooled' key.
+        """
+        print("\nTraining AI prediction models...")
+        print("=" * 40)
+        
+        training_sets = self._build_training_sets(enhanced_features, all_data)
+        
+        if self.training_mode == 'pooled':
+            print(f"Training one pooled {self.model_backend} model on {len(training_sets)} assets...")
+            errors = {}
+            try:
+                model_data, model_performance = train_pooled_model(
+                    training_sets, self.asset_classes, n_jobs=n_jobs, backend=self.model_backend
+                )
+                models = {POOLED_MODEL_NAME: model_data}
+            except Exception as e:
+                print(f"  ❌ Error training pooled model: {str(e)}")
+                return {}, {}
+        else:
+            print(f"Training {len(training_sets)} {self.model_backend} models...")
+            models, model_performance, errors = train_asset_models(
+                training_sets, n_jobs=n_jobs, backend=self.model_backend
+            )
+        
+        for asset_name in training_sets:
+            if asset_name in errors:
+                print(f"  ❌ Error training model for {asset_name}: {errors[asset_name]}")
+                continue
+            performance = model_performance[asset_name]
+            print(f"  ✅ {asset_name}: R² Score: {performance['r2_score']:.4f}, RMSE: {performance['rmse']:.4f}")
+        
         return models, model_performance
     
-    def save_enhanced_data(self, all_data, enhanced_features, models, model_performance):
+    def train_online_models(self, enhanced_features, all_data):
+        """
+        Fit online (recursive least squares) models that are then updated
+        incrementally by update_enhanced_features
+        """
+        print("\nTraining online prediction models...")
+        print("=" * 40)
+        
+        training_sets = self._build_training_sets(enhanced_features, all_data)
+        closes = {asset_name: all_data[asset_name]['Close'] for asset_name in training_sets}
+        try:
+            self.online_models = train_online_models(training_sets, enhanced_features, closes)
+        except Exception as e:
+            print(f"  ❌ Error training online models: {str(e)}")
+            return {}
+        
+        for asset_name, model in self.online_models.items():
+            print(f"  ✅ {asset_name}: fitted on {model.count} rows")
+        return self.online_models
+    
+    def backtest_prediction_models(self, enhanced_features, all_data, n_jobs=None, **backtest_options):
+        """
+        Walk-forward backtest of the AI models
+        
+        Options (min_train_size, refit_every, embargo, window, train_size)
+        are passed to financial_mcp.backtest.walk_forward_backtest.
+        """
+        print("\nBacktesting AI prediction models (walk-forward)...")
+        print("=" * 40)
+        
+        training_sets = self._build_training_sets(enhanced_features, all_data)
+        backtest_results = walk_forward_backtest(
+            training_sets, n_jobs=n_jobs, backend=self.model_backend, **backtest_options
+        )
+        
+        for asset_name, result in backtest_results.items():
+            if 'error' in result:
+                print(f"  ❌ Error backtesting {asset_name}: {result['error']}")
+                continue
+            summary = result['summary']
+            print(f"  ✅ {asset_name}: {len(result['folds'])} folds, R² Score: {summary['r2_score']:.4f}, "
+                  f"RMSE: {summary['rmse']:.4f}, Direction: {summary['directional_accuracy']:.1%}")
+        
+        return backtest_results
+    
+    def benchmark_model_backends(self, enhanced_features, all_data, backends=None):
+        """
+        Compare model backends (training time, inference latency, accuracy)
+        on each asset's feature matrix
+        """
+        print("\nBenchmarking model backends...")
+        print("=" * 40)
+        
+        training_sets = self._build_training_sets(enhanced_features, all_data)
+        results = {}
+        for asset_name, (X, y) in training_sets.items():
+            results[asset_name] = benchmark_backends(X, y, backends)
+            print(f"\n{asset_name}:")
+            print(results[asset_name].round(4).to_string())
+        
+        return results
+    
+    def compare_training_modes(self, enhanced_features, all_data, n_jobs=None):
+        """
+        Compare per-asset and pooled training (training time, model size,
+        load time, prediction time, accuracy)
+        """
+        print("\nComparing per-asset and pooled training...")
+        print("=" * 40)
+        
+        training_sets = self._build_training_sets(enhanced_features, all_data)
+        comparison = compare_training_modes(
+            training_sets, self.asset_classes, n_jobs=n_jobs, backend=self.model_backend
+        )
+        print(comparison.round(4).to_string())
+        return comparison
+    
+    def save_enhanced_data(self, all_data, enhanced_features, models, model_performance, backtest_results=None):
         """
         Save enhanced data and models
         """
@@ -297,18 +493,38 @@ class EnhancedDataFetcher:
             features.to_csv(filename)
             print(f"  💾 Saved {asset_name} features to {filename}")
         
+        # Save indicator states for incremental updates
+        save_indicator_states(self.indicator_states, INDICATOR_STATE_FILE)
+        print(f"  💾 Saved indicator states to {INDICATOR_STATE_FILE}")
+        
+        # Checkpoint online models
+        if self.online_models:
+            save_online_models(self.online_models, ONLINE_MODEL_DIR)
+            print(f"  💾 Saved online models to {ONLINE_MODEL_DIR}")
+        
         # Save model performance
         with open('models/model_performance.json', 'w') as f:
             json.dump(model_performance, f, indent=2, default=str)
         print(f"  💾 Saved model performance to models/model_performance.json")
         
-        # Save models using joblib
+        # Save per-fold walk-forward metrics
+        if backtest_results:
+            folds = [result['folds'].assign(asset=asset_name)
+                     for asset_name, result in backtest_results.items() if 'folds' in result]
+            if folds:
+                pd.concat(folds).to_csv('models/backtest_folds.csv')
+                print(f"  💾 Saved walk-forward backtest folds to models/backtest_folds.csv")
+        
+        # Save models as a new registry version
         try:
-            import joblib
-            for asset_name, model_data in models.items():
-                filename = f'models/{asset_name}_model.joblib'
-                joblib.dump(model_data, filename)
-                print(f"  💾 Saved {asset_name} model to {filename}")
+            registry = ModelRegistry(MODEL_REGISTRY_DIR)
+            version = registry.register(models, model_performance, data_fingerprint(all_data))
+            for asset_name, entry in registry.models(version).items():
+                print(f"  💾 Saved {asset_name} model to models/{entry['file']}")
+            print(f"  💾 Registered model version {version} in models/manifest.json")
+            if self.keep_model_versions is not None:
+                for removed in registry.prune(self.keep_model_versions):
+                    print(f"  🗑️  Pruned model version {removed}")
         except ImportError:
             print("  ⚠️  joblib not available, models not saved")
         
@@ -369,22 +585,20 @@ def main():
     print("Enhanced Financial Data Fetcher with AI Integration")
     print("=" * 60)
     
-    # Initialize fetcher
-    fetcher = EnhancedDataFetcher()
+    # Initialize fetcher (MODEL_BACKEND selects the regressor, TRAINING_MODE per_asset or pooled)
+    fetcher = EnhancedDataFetcher(
+        model_backend=os.environ.get('MODEL_BACKEND', DEFAULT_BACKEND),
+        training_mode=os.environ.get('TRAINING_MODE', 'per_asset'),
+        keep_model_versions=int(os.environ.get('MODEL_KEEP_VERSIONS', DEFAULT_KEEP_VERSIONS))
+    )
     
-    # Fetch enhanced data
-    all_data, enhanced_features = fetcher.fetch_enhanced_data()
+    # Fetch, train, backtest and save everything
+    all_data, model_performance = fetcher.retrain()
     
     if not all_data:
         print("❌ No data was successfully fetched. Please check your internet connection.")
         return
     
-    # Train AI models
-    models, model_performance = fetcher.train_prediction_models(enhanced_features)
-    
-    # Save everything
-    fetcher.save_enhanced_data(all_data, enhanced_features, models, model_performance)
-    
     # Generate summary report
     fetcher.generate_summary_report(all_data, model_performance)
     
@@ -11,6 +11,8 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 
+from financial_mcp.price_cache import PriceCache
+
 def fetch_financial_data():
     """
     Fetch historical data for specified assets and calculate daily returns
@@ -43,14 +45,16 @@ def fetch_financial_data():
     all_data = {}
     daily_returns = {}
     
+    # Persistent price cache: re-runs only download the missing date ranges
+    price_cache = PriceCache()
+    
     # Fetch data for each asset
     for asset_name, symbol in assets.items():
         print(f"Fetching data for {asset_name} ({symbol})...")
         
         try:
             # Download data from Yahoo Finance
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(start=start_date, end=end_date)
+            data = price_cache.get_history(symbol, start_date, end_date)
             
             if data.empty:
                 print(f"  Warning: No data found for {asset_name}")
@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime
 import json
 
+from financial_mcp.resample import compound_returns, period_statistics
+
 # Define the assets and their Yahoo Finance tickers (including currencies)
 assets = {
     # Original assets
@@ -158,12 +160,17 @@ if all_returns:
     print("\nPerforming currency-specific analysis...")
     currency_analysis = {}
     
+    # Monthly and quarterly returns for all currencies in one pass
+    currency_columns = [f'{c}_Return' for c in currency_assets if f'{c}_Return' in combined_df.columns]
+    currency_panel = combined_df.set_index(pd.to_datetime(combined_df['Date']))[currency_columns].sort_index()
+    monthly_panel = compound_returns(currency_panel, 'M')
+    quarterly_panel = compound_returns(currency_panel, 'Q')
+    monthly_stats = period_statistics(monthly_panel)
+    quarterly_stats = period_statistics(quarterly_panel)
+    
     for currency in currency_assets:
         if f'{currency}_Return' in combined_df.columns:
             currency_returns = combined_df[f'{currency}_Return'].dropna()
-            combined_df['Date'] = pd.to_datetime(combined_df['Date'])
-            currency_df = combined_df[['Date', f'{currency}_Return']].dropna()
-            currency_df.set_index('Date', inplace=True)
             
             currency_analysis[currency] = {
                 'description': get_currency_description(currency),
@@ -188,29 +195,23 @@ if all_returns:
                         currency_analysis[currency]['correlations_with_others'][other_asset] = round(corr, 4)
             
             # Monthly analysis
-            monthly_returns = currency_df[f'{currency}_Return'].resample('M').apply(
-                lambda x: (1 + x/100).prod() - 1
-            ) * 100
-            
+            monthly = monthly_stats.loc[f'{currency}_Return']
             currency_analysis[currency]['monthly_stats'] = {
-                'avg_monthly_return': round(monthly_returns.mean(), 4),
-                'monthly_volatility': round(monthly_returns.std(), 4),
-                'best_month': round(monthly_returns.max(), 4),
-                'worst_month': round(monthly_returns.min(), 4),
-                'positive_months': int((monthly_returns > 0).sum()),
-                'total_months': len(monthly_returns)
+                'avg_monthly_return': round(monthly['average'], 4),
+                'monthly_volatility': round(monthly['volatility'], 4),
+                'best_month': round(monthly['best'], 4),
+                'worst_month': round(monthly['worst'], 4),
+                'positive_months': int(monthly['positive_periods']),
+                'total_months': int(monthly['total_periods'])
             }
             
             # Quarterly analysis
-            quarterly_returns = currency_df[f'{currency}_Return'].resample('Q').apply(
-                lambda x: (1 + x/100).prod() - 1
-            ) * 100
-            
+            quarterly = quarterly_stats.loc[f'{currency}_Return']
             currency_analysis[currency]['quarterly_stats'] = {
-                'avg_quarterly_return': round(quarterly_returns.mean(), 4),
-                'quarterly_volatility': round(quarterly_returns.std(), 4),
-                'best_quarter': round(quarterly_returns.max(), 4),
-                'worst_quarter': round(quarterly_returns.min(), 4)
+                'avg_quarterly_return': round(quarterly['average'], 4),
+                'quarterly_volatility': round(quarterly['volatility'], 4),
+                'best_quarter': round(quarterly['best'], 4),
+                'worst_quarter': round(quarterly['worst'], 4)
             }
             
             # Risk metrics
@@ -28,6 +28,27 @@ try:
     from . import analyze
     from . import visualize
     from . import cli
+    from . import price_cache
+    from . import storage
+    from . import panel_stats
+    from . import online_stats
+    from . import regression
+    from . import rolling
+    from . import correlation
+    from . import monte_carlo
+    from . import resample
+    from . import indicators
+    from . import indicator_state
+    from . import training
+    from . import model_backends
+    from . import backtest
+    from . import model_registry
+    from . import tree_inference
+    from . import online_model
+    from . import snapshot
+    from . import scheduler
+    from . import single_flight
+    from . import result_cache
 except ImportError:
     # Handle cases where dependencies might not be installed
     pass
@@ -43,6 +64,27 @@ __all__ = [
     'analyze',
     'visualize',
     'cli',
+    'price_cache',
+    'storage',
+    'panel_stats',
+    'online_stats',
+    'regression',
+    'rolling',
+    'correlation',
+    'monte_carlo',
+    'resample',
+    'indicators',
+    'indicator_state',
+    'training',
+    'model_backends',
+    'backtest',
+    'model_registry',
+    'tree_inference',
+    'online_model',
+    'snapshot',
+    'scheduler',
+    'single_flight',
+    'result_cache',
 ]
 
 # Version info tuple for programmatic access
@@ -8,14 +8,32 @@ including correlation analysis, risk metrics, and statistical analysis.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import json
-from scipy import stats
+
+from .correlation import pairwise_correlation, shrunk_correlation, DEFAULT_BLOCK_SIZE
+from .online_stats import OnlineReturnStatistics
+from .panel_stats import panel_statistics, var_quantiles
+from .regression import regress_on_benchmarks
+from .storage import save_frame, load_frame, find_frame, naive_datetime_index, DEFAULT_FORMAT
+
+# Candidate names of the combined daily returns file, without extension
+RETURNS_FILE_STEMS = [
+    "combined_daily_returns_2020_2024",
+    "all_assets_daily_returns_with_currencies_2020_2024",
+    "all_assets_daily_returns_2020_2024"
+]
+
+# Incremental return statistics state written by update_analysis
+RETURN_STATISTICS_FILE = "return_statistics.npz"
 
 def analyze_returns(daily_returns_df: pd.DataFrame) -> Dict:
     """
     Perform comprehensive analysis on daily returns data
     
+    All assets are processed together by the vectorized panel statistics
+    kernel; missing values are skipped per asset.
+    
     Args:
         daily_returns_df: DataFrame with daily returns data
         
@@ -23,39 +41,20 @@ def analyze_returns(daily_returns_df: pd.DataFrame) -> Dict:
         Dictionary containing analysis results
     """
     analysis_results = {}
+    panel = panel_statistics(daily_returns_df)
     
-    for asset in daily_returns_df.columns:
-        returns = daily_returns_df[asset].dropna()
+    for i, asset in enumerate(daily_returns_df.columns):
+        count = panel['count'][i]
         
-        if len(returns) == 0:
+        if count == 0:
             continue
-            
-        # Basic statistics
-        mean_return = returns.mean()
-        std_return = returns.std()
-        min_return = returns.min()
-        max_return = returns.max()
         
-        # Distribution statistics
-        skewness = returns.skew()
-        kurtosis = returns.kurtosis()
-        
-        # Risk metrics
-        var_95 = returns.quantile(0.05)  # 5% VaR
-        var_99 = returns.quantile(0.01)  # 1% VaR
+        mean_return = panel['mean_return'][i]
+        std_return = panel['std_return'][i]
         
         # Performance metrics
         sharpe_ratio = mean_return / std_return if std_return > 0 else 0
         
-        # Cumulative returns
-        cumulative_return = ((1 + returns / 100).cumprod() - 1).iloc[-1] * 100
-        
-        # Maximum drawdown
-        cumulative_series = (1 + returns / 100).cumprod()
-        rolling_max = cumulative_series.expanding().max()
-        drawdown = (cumulative_series - rolling_max) / rolling_max
-        max_drawdown = drawdown.min() * 100
-        
         # Volatility (annualized)
         annual_volatility = std_return * np.sqrt(252)  # Assuming 252 trading days
         
@@ -63,26 +62,37 @@ def analyze_returns(daily_returns_df: pd.DataFrame) -> Dict:
             'mean_return': float(mean_return),
             'std_return': float(std_return),
             'annual_volatility': float(annual_volatility),
-            'min_return': float(min_return),
-            'max_return': float(max_return),
-            'skewness': float(skewness),
-            'kurtosis': float(kurtosis),
-            'var_95': float(var_95),
-            'var_99': float(var_99),
+            'min_return': float(panel['min_return'][i]),
+            'max_return': float(panel['max_return'][i]),
+            'skewness': float(panel['skewness'][i]),
+            'kurtosis': float(panel['kurtosis'][i]),
+            'var_95': float(panel['var_95'][i]),  # 5% VaR
+            'var_99': float(panel['var_99'][i]),  # 1% VaR
             'sharpe_ratio': float(sharpe_ratio),
-            'cumulative_return': float(cumulative_return),
-            'max_drawdown': float(max_drawdown),
-            'count': int(len(returns))
+            'cumulative_return': float(panel['cumulative_return'][i]),
+            'max_drawdown': float(panel['max_drawdown'][i]),
+            'count': int(count)
         }
     
     return analysis_results
 
-def calculate_correlation_matrix(daily_returns_df: pd.DataFrame) -> pd.DataFrame:
+def calculate_correlation_matrix(
+    daily_returns_df: pd.DataFrame,
+    dtype=np.float64,
+    shrinkage: bool = False,
+    out: Optional[Union[str, Path]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> pd.DataFrame:
     """
     Calculate correlation matrix for all assets
     
     Args:
         daily_returns_df: DataFrame with daily returns data
+        dtype: Computation dtype (np.float32 halves memory for large universes)
+        shrinkage: Return the Ledoit-Wolf shrunk correlation instead of the
+            pairwise-complete sample correlation
+        out: Optional .npy path to stream the matrix to a memory-mapped file
+        block_size: Number of assets per block
         
     Returns:
         Correlation matrix DataFrame
@@ -91,16 +101,41 @@ def calculate_correlation_matrix(daily_returns_df: pd.DataFrame) -> pd.DataFrame
     cleaned_df = daily_returns_df.dropna(axis=1, how='all')
     
     # Calculate correlation matrix
-    correlation_matrix = cleaned_df.corr()
+    if shrinkage:
+        values, _ = shrunk_correlation(cleaned_df, block_size, dtype, out)
+    else:
+        values = pairwise_correlation(cleaned_df, block_size, dtype, out)
+    correlation_matrix = pd.DataFrame(values, index=cleaned_df.columns,
+                                      columns=cleaned_df.columns, copy=False)
     
     return correlation_matrix
 
-def calculate_risk_metrics(daily_returns_df: pd.DataFrame) -> Dict:
+def _beta_table(regression: pd.DataFrame, exclude: str) -> Dict:
+    """Convert a regression result frame into the risk_metrics betas format"""
+    betas = {}
+    for asset, row in regression.iterrows():
+        if asset == exclude or np.isnan(row['beta']):
+            continue
+        betas[asset] = {
+            'beta': float(row['beta']),
+            'alpha': float(row['alpha']),
+            'r_squared': float(row['r_squared']),
+            'p_value': float(row['p_value'])
+        }
+    return betas
+
+def calculate_risk_metrics(
+    daily_returns_df: pd.DataFrame,
+    benchmark: Optional[Union[str, List[str]]] = None
+) -> Dict:
     """
     Calculate various risk metrics for the portfolio
     
     Args:
         daily_returns_df: DataFrame with daily returns data
+        benchmark: Benchmark column(s) for beta/alpha; defaults to the first
+            asset. With several benchmarks, 'betas' holds the first one and
+            'betas_by_benchmark' holds all of them.
         
     Returns:
         Dictionary containing risk metrics
@@ -131,28 +166,25 @@ def calculate_risk_metrics(daily_returns_df: pd.DataFrame) -> Dict:
             'var_99': float(portfolio_var_99)
         }
     
-    # Individual asset beta (relative to market proxy - first asset)
+    # Individual asset beta relative to the benchmark(s)
     if len(cleaned_df.columns) > 1:
-        market_proxy = cleaned_df.iloc[:, 0]  # Use first asset as market proxy
+        if benchmark is None:
+            benchmarks = [cleaned_df.columns[0]]  # Use first asset as market proxy
+        elif isinstance(benchmark, str):
+            benchmarks = [benchmark]
+        else:
+            benchmarks = list(benchmark)
         
-        betas = {}
-        for asset in cleaned_df.columns[1:]:
-            asset_returns = cleaned_df[asset]
-            
-            # Calculate beta using linear regression
-            valid_data = pd.concat([market_proxy, asset_returns], axis=1).dropna()
-            if len(valid_data) > 1:
-                slope, intercept, r_value, p_value, std_err = stats.linregress(
-                    valid_data.iloc[:, 0], valid_data.iloc[:, 1]
-                )
-                betas[asset] = {
-                    'beta': float(slope),
-                    'alpha': float(intercept),
-                    'r_squared': float(r_value ** 2),
-                    'p_value': float(p_value)
-                }
+        # Closed-form regressions of every asset on every benchmark at once
+        regressions = regress_on_benchmarks(cleaned_df, benchmarks)
         
-        risk_metrics['betas'] = betas
+        risk_metrics['benchmark'] = benchmarks[0]
+        risk_metrics['betas'] = _beta_table(regressions[benchmarks[0]], benchmarks[0])
+        
+        if len(benchmarks) > 1:
+            risk_metrics['betas_by_benchmark'] = {
+                name: _beta_table(regression, name) for name, regression in regressions.items()
+            }
     
     return risk_metrics
 
@@ -160,7 +192,9 @@ def save_analysis_results(
     analysis_results: Dict,
     correlation_matrix: pd.DataFrame,
     risk_metrics: Dict,
-    output_dir: str = "financial_data"
+    output_dir: str = "financial_data",
+    file_format: str = DEFAULT_FORMAT,
+    compat_copies: bool = True
 ) -> None:
     """
     Save analysis results to files
@@ -170,6 +204,8 @@ def save_analysis_results(
         correlation_matrix: Correlation matrix DataFrame
         risk_metrics: Risk metrics dictionary
         output_dir: Output directory path
+        file_format: Storage format for the correlation matrix
+        compat_copies: Also write the legacy correlation_matrix_with_currencies.csv
     """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
@@ -183,14 +219,14 @@ def save_analysis_results(
     print(f"✓ Saved analysis_results.json")
     
     # Save correlation matrix
-    correlation_file = output_path / "correlation_matrix.csv"
-    correlation_matrix.to_csv(correlation_file)
-    print(f"✓ Saved correlation_matrix.csv")
+    correlation_file = save_frame(correlation_matrix, output_path, "correlation_matrix", file_format)
+    print(f"✓ Saved {correlation_file.name}")
     
     # Alternative naming for compatibility
-    alt_correlation_file = output_path / "correlation_matrix_with_currencies.csv"
-    correlation_matrix.to_csv(alt_correlation_file)
-    print(f"✓ Saved correlation_matrix_with_currencies.csv")
+    if compat_copies and file_format == 'csv':
+        alt_correlation_file = output_path / "correlation_matrix_with_currencies.csv"
+        correlation_matrix.to_csv(alt_correlation_file)
+        print(f"✓ Saved correlation_matrix_with_currencies.csv")
     
     # Save risk metrics
     risk_file = output_path / "risk_metrics.json"
@@ -198,12 +234,78 @@ def save_analysis_results(
         json.dump(risk_metrics, f, indent=2)
     print(f"✓ Saved risk_metrics.json")
 
-def load_data(input_dir: str = "financial_data") -> Optional[pd.DataFrame]:
+def update_analysis(
+    daily_returns_df: pd.DataFrame,
+    output_dir: str = "financial_data",
+    max_history_days: Optional[int] = None,
+    file_format: str = DEFAULT_FORMAT
+) -> Tuple[Dict, pd.DataFrame, Dict]:
+    """
+    Incremental analysis for scheduled refreshes
+    
+    Results have two scopes:
+    
+    - Full history: the per-asset moments, extremes, Sharpe ratio,
+      cumulative return and maximum drawdown. They come from an
+      OnlineReturnStatistics state saved in output_dir, which only consumes
+      rows newer than its last date and is rebuilt when rows in the
+      revision window before it change (late or restated values).
+    - Trailing max_history_days window: the tail and cross-asset figures,
+      i.e. the per-asset var_95/var_99 quantiles, the correlation matrix and
+      the risk metrics.
+    
+    Results are saved like save_analysis_results.
+    
+    Args:
+        daily_returns_df: DataFrame with daily returns data (date index)
+        output_dir: Output directory path (also holds the statistics state)
+        max_history_days: Calendar days of the trailing window; None uses
+            the full history
+        file_format: Storage format for the correlation matrix
+        
+    Returns:
+        Tuple of (analysis_results, correlation_matrix, risk_metrics)
+    """
+    daily_returns_df = daily_returns_df.set_axis(naive_datetime_index(daily_returns_df.index))
+    
+    state_file = Path(output_dir) / RETURN_STATISTICS_FILE
+    if state_file.exists():
+        state = OnlineReturnStatistics.load(state_file)
+        state.sync_frame(daily_returns_df)
+    else:
+        state = OnlineReturnStatistics.from_returns(daily_returns_df)
+    state.save(state_file)
+    
+    window = daily_returns_df
+    if max_history_days is not None and len(daily_returns_df):
+        start = daily_returns_df.index.max() - pd.Timedelta(days=max_history_days)
+        window = daily_returns_df[daily_returns_df.index > start]
+    
+    # Quantile VaR cannot be maintained incrementally: only the quantiles are
+    # computed over the window
+    analysis_results = state.results()
+    quantiles = var_quantiles(window)
+    columns = {asset: i for i, asset in enumerate(window.columns)}
+    for asset, results in analysis_results.items():
+        for metric, values in quantiles.items():
+            results[metric] = float(values[columns[asset]]) if asset in columns else float('nan')
+    
+    correlation_matrix = calculate_correlation_matrix(window)
+    risk_metrics = calculate_risk_metrics(window)
+    save_analysis_results(analysis_results, correlation_matrix, risk_metrics,
+                          output_dir, file_format, compat_copies=False)
+    return analysis_results, correlation_matrix, risk_metrics
+
+def load_data(
+    input_dir: str = "financial_data",
+    file_format: Optional[str] = None
+) -> Optional[pd.DataFrame]:
     """
     Load daily returns data from file
     
     Args:
         input_dir: Input directory path
+        file_format: Storage format to look for; None tries columnar files first
         
     Returns:
         DataFrame with daily returns data or None if not found
@@ -211,20 +313,13 @@ def load_data(input_dir: str = "financial_data") -> Optional[pd.DataFrame]:
     input_path = Path(input_dir)
     
     # Try different file names
-    possible_files = [
-        "combined_daily_returns_2020_2024.csv",
-        "all_assets_daily_returns_with_currencies_2020_2024.csv",
-        "all_assets_daily_returns_2020_2024.csv"
-    ]
-    
-    for filename in possible_files:
-        filepath = input_path / filename
-        if filepath.exists():
-            print(f"Loading data from {filename}")
-            return pd.read_csv(filepath, index_col=0, parse_dates=True)
+    filepath = find_frame(input_path, RETURNS_FILE_STEMS, file_format)
+    if filepath is not None:
+        print(f"Loading data from {filepath.name}")
+        return load_frame(filepath, parse_dates=True)
     
     print(f"Error: No data file found in {input_dir}")
-    print(f"Expected one of: {possible_files}")
+    print(f"Expected one of: {RETURNS_FILE_STEMS}")
     return None
 
 def main():
@@ -0,0 +1,178 @@
+"""
+Walk-Forward Backtest Module
+
+This module evaluates the next-day return models of EnhancedDataFetcher
+with walk-forward cross-validation instead of a single 80/20 split. The
+history is cut into consecutive test blocks; before each block the model is
+refit on an expanding (or fixed-length rolling) window of earlier rows,
+leaving an optional embargo gap between training and test rows.
+
+Folds only slice the precomputed feature matrix: every asset's arrays are
+written once to memory-mapped .npy files, and all (asset, fold) fits run
+concurrently on one process pool.
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .model_backends import DEFAULT_BACKEND, get_backend, fit_model, predict
+from .training import _save_arrays
+
+WINDOW_TYPES = ('expanding', 'rolling')
+
+# One year of trading days before the first refit, one quarter between refits
+DEFAULT_MIN_TRAIN_SIZE = 252
+DEFAULT_REFIT_EVERY = 63
+
+def walk_forward_splits(
+    n_samples: int,
+    min_train_size: int = DEFAULT_MIN_TRAIN_SIZE,
+    refit_every: int = DEFAULT_REFIT_EVERY,
+    embargo: int = 0,
+    window: str = 'expanding',
+    train_size: Optional[int] = None
+) -> List[Tuple[slice, slice]]:
+    """
+    Train/test row ranges of a walk-forward backtest
+
+    Args:
+        n_samples: Number of rows (in time order)
+        min_train_size: Training rows before the first refit
+        refit_every: Test rows per fold, i.e. rows between refits
+        embargo: Rows skipped between the end of training and the test block
+        window: 'expanding' (train from the first row) or 'rolling'
+            (train on the latest train_size rows)
+        train_size: Rolling window length (default: min_train_size)
+
+    Returns:
+        List of (train, test) slices; the last test block may be shorter
+    """
+    if window not in WINDOW_TYPES:
+        raise ValueError(f"Unsupported window '{window}'. Choose from: {', '.join(WINDOW_TYPES)}")
+    if min_train_size < 2 or refit_every < 2:
+        raise ValueError("min_train_size and refit_every must be at least 2")
+    if embargo < 0:
+        raise ValueError("embargo must not be negative")
+    train_size = train_size or min_train_size
+
+    splits = []
+    test_start = min_train_size + embargo
+    while test_start + 2 <= n_samples:
+        train_end = test_start - embargo
+        train_start = 0 if window == 'expanding' else max(0, train_end - train_size)
+        test_end = min(test_start + refit_every, n_samples)
+        splits.append((slice(train_start, train_end), slice(test_start, test_end)))
+        test_start = test_end
+    return splits
+
+def _fit_fold(task):
+    """Refit on one training window and predict the following test block"""
+    asset, fold, x_path, y_path, columns, train, test, random_state, backend = task
+    try:
+        X = np.load(x_path, mmap_mode='r')
+        y = np.load(y_path, mmap_mode='r')
+        model, scaler = fit_model(X[train], y[train], columns, random_state, backend, n_threads=1)
+        return asset, fold, predict(model, scaler, X[test], columns), None
+    except Exception as e:
+        return asset, fold, None, str(e)
+
+def _fold_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
+    """R², RMSE and directional accuracy of one set of predictions"""
+    residual = actual - predicted
+    total = np.sum((actual - actual.mean()) ** 2)
+    return {
+        'r2_score': float(1 - np.sum(residual ** 2) / total) if total > 0 else np.nan,
+        'rmse': float(np.sqrt(np.mean(residual ** 2))),
+        'directional_accuracy': float(np.mean(np.sign(predicted) == np.sign(actual)))
+    }
+
+def walk_forward_backtest(
+    training_sets: Dict[str, Tuple[pd.DataFrame, pd.Series]],
+    min_train_size: int = DEFAULT_MIN_TRAIN_SIZE,
+    refit_every: int = DEFAULT_REFIT_EVERY,
+    embargo: int = 0,
+    window: str = 'expanding',
+    train_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    random_state: int = 42,
+    backend: str = DEFAULT_BACKEND
+) -> Dict[str, Dict]:
+    """
+    Walk-forward backtest of the per-asset models
+
+    Args:
+        training_sets: Dictionary of asset name to (features, target), e.g.
+            from training.build_training_set
+        min_train_size: Training rows before the first refit
+        refit_every: Test rows per fold (rows between refits)
+        embargo: Rows skipped between training and test rows
+        window: 'expanding' or 'rolling'
+        train_size: Rolling window length (default: min_train_size)
+        n_jobs: Worker processes (default: CPU count)
+        random_state: Seed of every model
+        backend: Model backend (see model_backends.available_backends)
+
+    Returns:
+        Dictionary of asset name to {'folds': DataFrame of per-fold
+        train/test ranges, r2_score, rmse and directional_accuracy,
+        'predictions': out-of-sample predictions (Series), 'summary': the
+        same metrics over all out-of-sample rows}; assets whose fits failed
+        carry an 'error' message instead
+    """
+    get_backend(backend)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='financial_mcp_backtest_') as temp_dir:
+        tasks, splits = [], {}
+        for i, (asset, (X, y)) in enumerate(training_sets.items()):
+            splits[asset] = walk_forward_splits(len(X), min_train_size, refit_every, embargo, window, train_size)
+            if not splits[asset]:
+                results[asset] = {'error': f"Not enough rows for a walk-forward fold ({len(X)})"}
+                continue
+            x_path, y_path = _save_arrays(X, y, temp_dir, str(i))
+            for fold, (train, test) in enumerate(splits[asset]):
+                tasks.append((asset, fold, x_path, y_path, list(X.columns), train, test, random_state, backend))
+
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(tasks) <= 1:
+            outputs = [_fit_fold(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+                outputs = list(executor.map(_fit_fold, tasks))
+
+    predictions = {}
+    for asset, fold, predicted, error in outputs:
+        if error is not None:
+            results[asset] = {'error': error}
+        predictions.setdefault(asset, {})[fold] = predicted
+
+    for asset, fold_predictions in predictions.items():
+        if asset in results:
+            continue
+        X, y = training_sets[asset]
+        actual = np.asarray(y, dtype=float)
+        rows = []
+        for fold, (train, test) in enumerate(splits[asset]):
+            rows.append({
+                'fold': fold,
+                'train_start': X.index[train.start],
+                'train_end': X.index[train.stop - 1],
+                'test_start': X.index[test.start],
+                'test_end': X.index[test.stop - 1],
+                'training_samples': train.stop - train.start,
+                'test_samples': test.stop - test.start,
+                **_fold_metrics(actual[test], fold_predictions[fold])
+            })
+
+        # Test blocks are contiguous: out-of-sample rows run from the first to the last block
+        tested = slice(splits[asset][0][1].start, splits[asset][-1][1].stop)
+        predicted = np.concatenate([fold_predictions[fold] for fold in range(len(splits[asset]))])
+        results[asset] = {
+            'folds': pd.DataFrame(rows).set_index('fold'),
+            'predictions': pd.Series(predicted, index=X.index[tested], name='prediction'),
+            'summary': _fold_metrics(actual[tested], predicted)
+        }
+    return results
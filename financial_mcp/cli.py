@@ -6,13 +6,34 @@ Command Line Interface for Financial MCP
 import argparse
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
-from .fetch_data import main as fetch_main
+from .fetch_data import main as fetch_main, DEFAULT_MAX_WORKERS
+from .storage import SUPPORTED_FORMATS, DEFAULT_FORMAT
+from .rolling import DEFAULT_WINDOWS, rolling_analytics
+from .monte_carlo import SIMULATION_METHODS, monte_carlo_var
 from .analyze import main as analyze_main
 from .visualize import main as visualize_main
 from . import __version__, __description__
 
+def portfolio_weight(value: str) -> Tuple[str, float]:
+    """
+    Parse an ASSET=WEIGHT command line value
+
+    Args:
+        value: Asset name and weight separated by '='
+
+    Returns:
+        Tuple of (asset, weight)
+    """
+    asset, separator, weight = value.rpartition('=')
+    try:
+        if not (separator and asset):
+            raise ValueError
+        return asset, float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ASSET=WEIGHT, got '{value}'")
+
 def create_parser() -> argparse.ArgumentParser:
     """
     Create the main argument parser
@@ -28,6 +49,10 @@ def create_parser() -> argparse.ArgumentParser:
 Examples:
   financial-mcp fetch --start-date 2023-01-01 --end-date 2023-12-31
   financial-mcp analyze --input-dir ./data
+  financial-mcp analyze --benchmark SP500 BTC
+  financial-mcp analyze --format parquet --float32 --shrinkage
+  financial-mcp analyze --mc-paths 1000000 --mc-method student_t
+  financial-mcp analyze --mc-paths 100000 --mc-weights SP500=0.6 Gold=0.4
   financial-mcp visualize --output-dir ./plots
   financial-mcp run-all --start-date 2020-01-01
 
@@ -77,6 +102,37 @@ For more information, visit: https://github.com/Tatsuru-Kikuchi/MCP
         nargs='*',
         help='Specific assets to fetch (default: all supported assets)'
     )
+    fetch_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f'Number of concurrent downloads (default: {DEFAULT_MAX_WORKERS})'
+    )
+    fetch_parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=None,
+        help='Price cache directory; only missing date ranges are downloaded (default: no cache)'
+    )
+    fetch_parser.add_argument(
+        '--cache-max-age',
+        type=float,
+        default=None,
+        help='Days after which a cached symbol is downloaded again in full, so adjusted '
+             'prices reflect later dividends and splits (default: never)'
+    )
+    fetch_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=None,
+        help='Download tickers in chunks of this size, one request per chunk (default: one request per ticker)'
+    )
+    fetch_parser.add_argument(
+        '--format',
+        choices=SUPPORTED_FORMATS,
+        default=DEFAULT_FORMAT,
+        help=f'Storage format for data files (default: {DEFAULT_FORMAT})'
+    )
     
     # Analyze command
     analyze_parser = subparsers.add_parser(
@@ -96,6 +152,72 @@ For more information, visit: https://github.com/Tatsuru-Kikuchi/MCP
         default='financial_data',
         help='Output directory for analysis results (default: financial_data)'
     )
+    analyze_parser.add_argument(
+        '--format',
+        choices=SUPPORTED_FORMATS,
+        default=None,
+        help='Storage format of the input files (default: auto-detect)'
+    )
+    analyze_parser.add_argument(
+        '--benchmark',
+        type=str,
+        nargs='+',
+        default=None,
+        help='Benchmark asset(s) for beta/alpha regressions (default: first asset)'
+    )
+    analyze_parser.add_argument(
+        '--rolling',
+        action='store_true',
+        help='Also save rolling analytics (window x date x asset x metric array) for plots and the dashboard'
+    )
+    analyze_parser.add_argument(
+        '--rolling-windows',
+        type=int,
+        nargs='+',
+        default=list(DEFAULT_WINDOWS),
+        help=f"Window lengths for rolling analytics (default: {' '.join(map(str, DEFAULT_WINDOWS))})"
+    )
+    analyze_parser.add_argument(
+        '--float32',
+        action='store_true',
+        help='Compute the correlation matrix and rolling analytics in float32 to halve memory'
+    )
+    analyze_parser.add_argument(
+        '--shrinkage',
+        action='store_true',
+        help='Save the Ledoit-Wolf shrunk correlation matrix'
+    )
+    analyze_parser.add_argument(
+        '--no-compat-copies',
+        action='store_true',
+        help='Skip the legacy correlation_matrix_with_currencies.csv copy'
+    )
+    analyze_parser.add_argument(
+        '--mc-paths',
+        type=int,
+        default=0,
+        help='Monte Carlo paths for portfolio VaR/CVaR (default: 0, disabled)'
+    )
+    analyze_parser.add_argument(
+        '--mc-method',
+        choices=SIMULATION_METHODS,
+        default='gaussian',
+        help='Monte Carlo return model (default: gaussian)'
+    )
+    analyze_parser.add_argument(
+        '--mc-horizon',
+        type=int,
+        default=1,
+        help='Monte Carlo holding period in days (default: 1)'
+    )
+    analyze_parser.add_argument(
+        '--mc-weights',
+        type=portfolio_weight,
+        nargs='+',
+        default=None,
+        metavar='ASSET=WEIGHT',
+        help='Monte Carlo portfolio weights (default: equal weights over all assets)'
+    )
     
     # Visualize command
     visualize_parser = subparsers.add_parser(
@@ -115,6 +237,12 @@ For more information, visit: https://github.com/Tatsuru-Kikuchi/MCP
         default='plots',
         help='Output directory for plots (default: plots)'
     )
+    visualize_parser.add_argument(
+        '--format',
+        choices=SUPPORTED_FORMATS,
+        default=None,
+        help='Storage format of the input files (default: auto-detect)'
+    )
     
     # Run-all command
     runall_parser = subparsers.add_parser(
@@ -146,6 +274,97 @@ For more information, visit: https://github.com/Tatsuru-Kikuchi/MCP
         default='plots',
         help='Directory for plots (default: plots)'
     )
+    runall_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f'Number of concurrent downloads (default: {DEFAULT_MAX_WORKERS})'
+    )
+    runall_parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=None,
+        help='Price cache directory; only missing date ranges are downloaded (default: no cache)'
+    )
+    runall_parser.add_argument(
+        '--cache-max-age',
+        type=float,
+        default=None,
+        help='Days after which a cached symbol is downloaded again in full, so adjusted '
+             'prices reflect later dividends and splits (default: never)'
+    )
+    runall_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=None,
+        help='Download tickers in chunks of this size, one request per chunk (default: one request per ticker)'
+    )
+    runall_parser.add_argument(
+        '--format',
+        choices=SUPPORTED_FORMATS,
+        default=DEFAULT_FORMAT,
+        help=f'Storage format for data files (default: {DEFAULT_FORMAT})'
+    )
+    runall_parser.add_argument(
+        '--benchmark',
+        type=str,
+        nargs='+',
+        default=None,
+        help='Benchmark asset(s) for beta/alpha regressions (default: first asset)'
+    )
+    runall_parser.add_argument(
+        '--rolling',
+        action='store_true',
+        help='Also save rolling analytics (window x date x asset x metric array) for plots and the dashboard'
+    )
+    runall_parser.add_argument(
+        '--rolling-windows',
+        type=int,
+        nargs='+',
+        default=list(DEFAULT_WINDOWS),
+        help=f"Window lengths for rolling analytics (default: {' '.join(map(str, DEFAULT_WINDOWS))})"
+    )
+    runall_parser.add_argument(
+        '--float32',
+        action='store_true',
+        help='Compute the correlation matrix and rolling analytics in float32 to halve memory'
+    )
+    runall_parser.add_argument(
+        '--shrinkage',
+        action='store_true',
+        help='Save the Ledoit-Wolf shrunk correlation matrix'
+    )
+    runall_parser.add_argument(
+        '--no-compat-copies',
+        action='store_true',
+        help='Skip the legacy correlation_matrix_with_currencies.csv copy'
+    )
+    runall_parser.add_argument(
+        '--mc-paths',
+        type=int,
+        default=0,
+        help='Monte Carlo paths for portfolio VaR/CVaR (default: 0, disabled)'
+    )
+    runall_parser.add_argument(
+        '--mc-method',
+        choices=SIMULATION_METHODS,
+        default='gaussian',
+        help='Monte Carlo return model (default: gaussian)'
+    )
+    runall_parser.add_argument(
+        '--mc-horizon',
+        type=int,
+        default=1,
+        help='Monte Carlo holding period in days (default: 1)'
+    )
+    runall_parser.add_argument(
+        '--mc-weights',
+        type=portfolio_weight,
+        nargs='+',
+        default=None,
+        metavar='ASSET=WEIGHT',
+        help='Monte Carlo portfolio weights (default: equal weights over all assets)'
+    )
     
     return parser
 
@@ -173,7 +392,11 @@ def run_fetch(args) -> int:
         # Get data
         all_data, daily_returns = original_fetch(
             start_date=args.start_date,
-            end_date=args.end_date
+            end_date=args.end_date,
+            max_workers=args.jobs,
+            cache_dir=args.cache_dir,
+            batch_size=args.batch_size,
+            cache_max_age_days=args.cache_max_age
         )
         
         if not daily_returns:
@@ -181,7 +404,7 @@ def run_fetch(args) -> int:
             return 1
         
         # Save data
-        original_save(all_data, daily_returns, args.output_dir)
+        original_save(all_data, daily_returns, args.output_dir, args.format)
         
         print("\nFetch completed successfully!")
         return 0
@@ -213,29 +436,43 @@ def run_analyze(args) -> int:
         # Run analysis
         from . import analyze
         
-        # Set the paths and run
-        import pandas as pd
-        import os
-        
-        data_file = input_path / 'combined_daily_returns_2020_2024.csv'
-        if not data_file.exists():
-            print(f"Error: Data file not found: {data_file}")
+        # Load data
+        daily_returns_df = analyze.load_data(args.input_dir, args.format)
+        if daily_returns_df is None:
             print("Please run fetch command first")
             return 1
         
-        # Load data
-        daily_returns_df = pd.read_csv(data_file, index_col=0, parse_dates=True)
-        
         # Perform analysis
         analysis_results = analyze.analyze_returns(daily_returns_df)
-        correlation_matrix = analyze.calculate_correlation_matrix(daily_returns_df)
-        risk_metrics = analyze.calculate_risk_metrics(daily_returns_df)
+        correlation_matrix = analyze.calculate_correlation_matrix(
+            daily_returns_df,
+            dtype='float32' if args.float32 else 'float64',
+            shrinkage=args.shrinkage
+        )
+        risk_metrics = analyze.calculate_risk_metrics(daily_returns_df, args.benchmark)
+        if args.mc_paths > 0:
+            # Seeded so repeated runs report the same figures
+            risk_metrics['monte_carlo'] = monte_carlo_var(
+                daily_returns_df, weights=dict(args.mc_weights) if args.mc_weights else None,
+                n_paths=args.mc_paths, horizon=args.mc_horizon, method=args.mc_method, seed=0
+            )
         
         # Save results
         analyze.save_analysis_results(
-            analysis_results, correlation_matrix, risk_metrics, args.output_dir
+            analysis_results, correlation_matrix, risk_metrics, args.output_dir,
+            args.format or DEFAULT_FORMAT, compat_copies=not args.no_compat_copies
         )
         
+        # Rolling analytics (window x date x asset x metric) for plots and the
+        # dashboard: opt-in, the array grows with windows x dates x assets
+        if args.rolling:
+            rolling = rolling_analytics(
+                daily_returns_df, args.rolling_windows, benchmark=risk_metrics.get('benchmark'),
+                dtype='float32' if args.float32 else 'float64'
+            )
+            rolling.save(args.output_dir)
+            print("✓ Saved rolling_analytics.npy")
+        
         print("\nAnalysis completed successfully!")
         return 0
         
@@ -258,31 +495,23 @@ def run_visualize(args) -> int:
     
     try:
         from . import visualize
-        import pandas as pd
-        from pathlib import Path
-        
-        input_path = Path(args.input_dir)
         
         # Load data files
-        daily_returns_df = None
-        correlation_matrix = None
-        
-        data_file = input_path / 'combined_daily_returns_2020_2024.csv'
-        if data_file.exists():
-            daily_returns_df = pd.read_csv(data_file, index_col=0, parse_dates=True)
-        
-        corr_file = input_path / 'correlation_matrix.csv'
-        if corr_file.exists():
-            correlation_matrix = pd.read_csv(corr_file, index_col=0)
+        daily_returns_df, correlation_matrix = visualize.load_data_for_visualization(
+            args.input_dir, args.format
+        )
         
         if daily_returns_df is None and correlation_matrix is None:
             print("Error: No data files found in input directory")
             print("Please run fetch and analyze commands first")
             return 1
         
+        # Reuse precomputed rolling analytics when available
+        rolling = visualize.RollingAnalytics.load(args.input_dir)
+        
         # Create visualizations
         visualize.create_visualizations(
-            daily_returns_df, correlation_matrix, args.output_dir
+            daily_returns_df, correlation_matrix, args.output_dir, rolling
         )
         
         print("\nVisualization completed successfully!")
@@ -316,6 +545,11 @@ def run_all(args) -> int:
     fetch_args.end_date = args.end_date
     fetch_args.output_dir = args.data_dir
     fetch_args.assets = None
+    fetch_args.jobs = args.jobs
+    fetch_args.cache_dir = args.cache_dir
+    fetch_args.cache_max_age = args.cache_max_age
+    fetch_args.batch_size = args.batch_size
+    fetch_args.format = args.format
     
     if run_fetch(fetch_args) != 0:
         return 1
@@ -325,6 +559,17 @@ def run_all(args) -> int:
     analyze_args = Args()
     analyze_args.input_dir = args.data_dir
     analyze_args.output_dir = args.data_dir
+    analyze_args.format = args.format
+    analyze_args.benchmark = args.benchmark
+    analyze_args.rolling = args.rolling
+    analyze_args.rolling_windows = args.rolling_windows
+    analyze_args.float32 = args.float32
+    analyze_args.shrinkage = args.shrinkage
+    analyze_args.no_compat_copies = args.no_compat_copies
+    analyze_args.mc_paths = args.mc_paths
+    analyze_args.mc_method = args.mc_method
+    analyze_args.mc_horizon = args.mc_horizon
+    analyze_args.mc_weights = args.mc_weights
     
     if run_analyze(analyze_args) != 0:
         return 1
@@ -334,6 +579,7 @@ def run_all(args) -> int:
     viz_args = Args()
     viz_args.input_dir = args.data_dir
     viz_args.output_dir = args.plots_dir
+    viz_args.format = args.format
     
     if run_visualize(viz_args) != 0:
         return 1
@@ -13,8 +13,13 @@ from pathlib import Path
 from typing import Dict, Tuple, List, Optional
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
+from .panel_stats import panel_statistics
+from .price_cache import PriceCache
+from .storage import save_frame, DEFAULT_FORMAT
+
 # Default asset symbols
 DEFAULT_ASSETS = {
     'traditional': {
@@ -33,18 +38,196 @@ DEFAULT_ASSETS = {
     }
 }
 
+# Number of concurrent Yahoo Finance requests used by fetch_financial_data
+DEFAULT_MAX_WORKERS = 8
+
+# Number of tickers per yf.download call in batched mode
+DEFAULT_BATCH_SIZE = 50
+
+# Price cache subdirectory of batched downloads: yf.download frames are
+# tz-naive while Ticker.history frames are tz-aware, so they cannot share
+# entries (nor with collect_daily_returns.py, whose unadjusted MultiIndex
+# frames are cached under 'yf_download')
+BATCH_CACHE_SUBDIR = 'yf_batch'
+
+def _fetch_symbol_history(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    cache: Optional[PriceCache] = None
+) -> pd.DataFrame:
+    """
+    Download the price history of a single symbol
+    
+    Args:
+        symbol: Yahoo Finance ticker symbol
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        cache: Optional price cache; only missing ranges are downloaded
+        
+    Returns:
+        DataFrame of OHLCV data (empty if Yahoo Finance has no data)
+    """
+    if cache is not None:
+        return cache.get_history(symbol, start_date, end_date)
+    
+    ticker = yf.Ticker(symbol)
+    return ticker.history(start=start_date, end=end_date)
+
+def _chunks(items: List, size: int) -> List[List]:
+    """Split a list into consecutive chunks of at most size items"""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _download_batch(symbols: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Download several symbols with a single yf.download request
+    
+    Args:
+        symbols: Yahoo Finance ticker symbols
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        
+    Returns:
+        DataFrame with (ticker, field) column MultiIndex
+    """
+    return yf.download(
+        symbols,
+        start=start_date,
+        end=end_date,
+        group_by='ticker',
+        auto_adjust=True,
+        progress=False,
+        threads=False
+    )
+
+def split_batch_frame(frame: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split a multi-ticker download into one OHLCV frame per symbol
+    
+    Args:
+        frame: Result of yf.download for the given symbols
+        symbols: Symbols that were requested
+        
+    Returns:
+        Dictionary mapping symbol to its price frame (empty if not returned)
+    """
+    histories = {}
+    columns = frame.columns
+    
+    for symbol in symbols:
+        if isinstance(columns, pd.MultiIndex):
+            if symbol in columns.get_level_values(0):
+                data = frame[symbol]
+            elif symbol in columns.get_level_values(1):
+                data = frame.xs(symbol, axis=1, level=1)
+            else:
+                data = pd.DataFrame()
+        elif len(symbols) == 1:
+            data = frame
+        else:
+            data = pd.DataFrame()
+        
+        # Rows exist for the union of all trading days in the chunk
+        histories[symbol] = data.dropna(how='all').copy()
+    
+    return histories
+
+def _fetch_batched_histories(
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+    batch_size: int,
+    max_workers: int,
+    cache: Optional[PriceCache] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Download price histories in chunks of symbols, one request per chunk
+    
+    With a cache, symbols are grouped by the date range they are missing so
+    an incremental refresh downloads only the shared tail for each chunk.
+    
+    Args:
+        symbols: Yahoo Finance ticker symbols
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        batch_size: Maximum number of symbols per request
+        max_workers: Maximum number of concurrent requests
+        cache: Optional price cache
+        
+    Returns:
+        Dictionary mapping symbol to its price frame (failed symbols omitted)
+    """
+    # Group symbols by the date range they still need
+    requests = {}
+    for symbol in symbols:
+        gaps = cache.missing(symbol, start_date, end_date) if cache else [(start_date, end_date)]
+        for gap in gaps:
+            requests.setdefault(gap, []).append(symbol)
+    
+    jobs = [(gap, chunk) for gap, gap_symbols in requests.items()
+            for chunk in _chunks(gap_symbols, batch_size)]
+    
+    downloads = {symbol: [] for symbol in symbols}
+    failed = set()
+    
+    if jobs:
+        workers = max(1, min(max_workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_download_batch, chunk, gap[0], gap[1]): (gap, chunk)
+                for gap, chunk in jobs
+            }
+            for future in as_completed(futures):
+                gap, chunk = futures[future]
+                try:
+                    for symbol, data in split_batch_frame(future.result(), chunk).items():
+                        downloads[symbol].append((gap[0], gap[1], data))
+                except Exception as e:
+                    print(f"✗ Error fetching {', '.join(chunk)}: {e}")
+                    failed.update(chunk)
+    
+    histories = {}
+    for symbol in symbols:
+        if symbol in failed:
+            continue
+        if cache is not None:
+            cache.merge(symbol, downloads[symbol])
+            histories[symbol] = cache.get_history(symbol, start_date, end_date)
+        else:
+            histories[symbol] = downloads[symbol][0][2]
+    
+    return histories
+
 def fetch_financial_data(
     start_date: str = "2020-01-01",
     end_date: str = "2024-12-31",
-    assets: Optional[Dict] = None
+    assets: Optional[Dict] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cache_dir: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    cache_max_age_days: Optional[float] = None
 ) -> Tuple[Dict, Dict]:
     """
     Fetch financial data and calculate daily returns
     
+    Symbols are downloaded concurrently on a bounded thread pool, since
+    nearly all of the time is spent waiting on the network. With batch_size
+    set, each request downloads a whole chunk of symbols via yf.download.
+    
     Args:
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
         assets: Custom asset dictionary, uses DEFAULT_ASSETS if None
+        max_workers: Maximum number of concurrent downloads (1 fetches sequentially)
+        cache_dir: Optional price cache directory; when set, only date ranges
+            missing from the cache are downloaded (batched downloads are
+            cached in its BATCH_CACHE_SUBDIR subdirectory)
+        batch_size: Number of symbols per yf.download request; None downloads
+            each symbol with its own request
+        cache_max_age_days: Re-download a cached symbol's full history once
+            it is this many days old, so adjusted prices reflect later
+            dividends and splits (None: never)
         
     Returns:
         Tuple of (all_data_dict, daily_returns_dict)
@@ -61,13 +244,42 @@ def fetch_financial_data(
     print(f"Fetching data from {start_date} to {end_date}")
     print(f"Assets to fetch: {list(assets.keys())}")
     
+    if not assets:
+        return all_data, daily_returns
+    
+    cache = None
+    if cache_dir:
+        cache_path = Path(cache_dir) / BATCH_CACHE_SUBDIR if batch_size else Path(cache_dir)
+        cache = PriceCache(cache_path, max_age_days=cache_max_age_days)
+    
+    if batch_size:
+        # Download chunks of symbols, one request per chunk
+        histories = _fetch_batched_histories(
+            list(assets.keys()), start_date, end_date, batch_size, max_workers, cache
+        )
+    else:
+        # Download all symbols concurrently
+        histories = {}
+        workers = max(1, min(max_workers, len(assets)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_fetch_symbol_history, symbol, start_date, end_date, cache): symbol
+                for symbol in assets
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    histories[symbol] = future.result()
+                except Exception as e:
+                    print(f"✗ Error fetching {symbol}: {e}")
+    
+    # Assemble results in the order the assets were requested
     for symbol, name in assets.items():
+        if symbol not in histories:
+            continue
+        
         try:
-            print(f"Fetching {name} ({symbol})...")
-            
-            # Fetch data from Yahoo Finance
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(start=start_date, end=end_date)
+            data = histories[symbol]
             
             if data.empty:
                 print(f"Warning: No data found for {symbol}")
@@ -91,15 +303,17 @@ def fetch_financial_data(
 def save_data_to_csv(
     all_data: Dict,
     daily_returns: Dict,
-    output_dir: str = "financial_data"
+    output_dir: str = "financial_data",
+    file_format: str = DEFAULT_FORMAT
 ) -> None:
     """
-    Save fetched data to CSV files
+    Save fetched data to CSV (or columnar) files
     
     Args:
         all_data: Dictionary of raw price data
         daily_returns: Dictionary of daily returns data
         output_dir: Output directory path
+        file_format: Storage format ('csv', 'parquet' or 'feather')
     """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
@@ -114,11 +328,11 @@ def save_data_to_csv(
             save_data['Daily_Return'] = daily_returns[asset_name]
             save_data = save_data.dropna()
             
-            # Save to CSV
-            filename = f"{asset_name}_daily_returns_2020_2024.csv"
-            filepath = output_path / filename
-            save_data.to_csv(filepath)
-            print(f"✓ Saved {filename}")
+            # Save to file
+            filepath = save_frame(
+                save_data, output_path, f"{asset_name}_daily_returns_2020_2024", file_format
+            )
+            print(f"✓ Saved {filepath.name}")
     
     # Save combined daily returns
     if daily_returns:
@@ -126,14 +340,17 @@ def save_data_to_csv(
         combined_returns.index.name = 'Date'
         
         # Save combined file
-        combined_file = output_path / "combined_daily_returns_2020_2024.csv"
-        combined_returns.to_csv(combined_file)
-        print(f"✓ Saved combined_daily_returns_2020_2024.csv")
+        filepath = save_frame(
+            combined_returns, output_path, "combined_daily_returns_2020_2024", file_format
+        )
+        print(f"✓ Saved {filepath.name}")
         
         # Also save with different naming convention for compatibility
-        alt_combined_file = output_path / "all_assets_daily_returns_with_currencies_2020_2024.csv"
-        combined_returns.to_csv(alt_combined_file)
-        print(f"✓ Saved all_assets_daily_returns_with_currencies_2020_2024.csv")
+        # (only CSV consumers rely on the second name)
+        if file_format == 'csv':
+            alt_combined_file = output_path / "all_assets_daily_returns_with_currencies_2020_2024.csv"
+            combined_returns.to_csv(alt_combined_file)
+            print(f"✓ Saved all_assets_daily_returns_with_currencies_2020_2024.csv")
 
 def calculate_summary_statistics(daily_returns: Dict) -> Dict:
     """
@@ -147,17 +364,27 @@ def calculate_summary_statistics(daily_returns: Dict) -> Dict:
     """
     summary = {}
     
-    for asset_name, returns in daily_returns.items():
-        if len(returns) > 0:
+    if not daily_returns:
+        return summary
+    
+    # Align all series into one panel and compute every asset at once
+    returns_df = pd.DataFrame(daily_returns)
+    panel = panel_statistics(returns_df)
+    
+    for i, asset_name in enumerate(returns_df.columns):
+        count = panel['count'][i]
+        if count > 0:
+            mean_return = panel['mean_return'][i]
+            std_return = panel['std_return'][i]
             summary[asset_name] = {
-                'mean_return': float(returns.mean()),
-                'std_return': float(returns.std()),
-                'min_return': float(returns.min()),
-                'max_return': float(returns.max()),
-                'skewness': float(returns.skew()),
-                'kurtosis': float(returns.kurtosis()),
-                'count': int(len(returns)),
-                'sharpe_ratio': float(returns.mean() / returns.std()) if returns.std() > 0 else 0.0
+                'mean_return': float(mean_return),
+                'std_return': float(std_return),
+                'min_return': float(panel['min_return'][i]),
+                'max_return': float(panel['max_return'][i]),
+                'skewness': float(panel['skewness'][i]),
+                'kurtosis': float(panel['kurtosis'][i]),
+                'count': int(count),
+                'sharpe_ratio': float(mean_return / std_return) if std_return > 0 else 0.0
             }
     
     return summary
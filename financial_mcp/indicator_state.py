@@ -0,0 +1,307 @@
+"""
+Indicator State Module
+
+This module carries the EnhancedDataFetcher feature set forward one bar at
+a time. Each asset keeps a small state (ring buffers of recent closes,
+returns and RSI gains/losses, plus the running numerators and denominators
+of its EMAs), so appending a new bar produces the new feature row without
+recomputing the history. The rows match _create_feature_matrix on the full
+history, and states can be seeded from a history and persisted between
+runs.
+"""
+
+import json
+import math
+import numpy as np
+import pandas as pd
+from collections import deque
+from pathlib import Path
+from scipy.signal import lfilter
+from typing import Dict
+
+from .indicators import (
+    MA_WINDOWS, EMA_SPANS, MACD_SIGNAL_SPAN, RSI_WINDOW, BOLLINGER_WINDOW,
+    BOLLINGER_STD, MOMENTUM_PERIODS, VOLATILITY_WINDOWS, VOLATILITY_RATIOS
+)
+
+# Feature columns of EnhancedDataFetcher._create_feature_matrix (before lags)
+FEATURE_COLUMNS = [
+    'MA_5', 'MA_10', 'MA_20', 'MA_50',
+    'EMA_12', 'EMA_26', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'RSI', 'BB_Width', 'BB_Position',
+    'Momentum_5', 'Momentum_10',
+    'Vol_5', 'Vol_10', 'Vol_20', 'Vol_30',
+    'Vol_Ratio_5_20', 'Vol_Ratio_10_30',
+    'HL_Volatility',
+    'Day_Sin', 'Day_Cos', 'Month_Sin', 'Month_Cos'
+]
+
+# Lags of Close and Daily_Return appended to the feature matrix
+FEATURE_LAGS = (1, 2, 3, 5)
+
+# Bars of history each ring buffer must hold
+CLOSE_HISTORY = max(max(MA_WINDOWS), BOLLINGER_WINDOW, max(MOMENTUM_PERIODS) + 1, max(FEATURE_LAGS) + 1)
+RETURN_HISTORY = max(max(VOLATILITY_WINDOWS), max(FEATURE_LAGS) + 1)
+
+def feature_matrix_columns() -> list:
+    """Column order of the full feature matrix"""
+    columns = list(FEATURE_COLUMNS)
+    for lag in FEATURE_LAGS:
+        columns += [f'Close_lag_{lag}', f'Return_lag_{lag}']
+    return columns
+
+_MATRIX_COLUMNS = feature_matrix_columns()
+
+def _ewm_terms(values: np.ndarray, span: int):
+    """Final numerator and denominator of pandas' adjusted EWM over values"""
+    decay = 1.0 - 2.0 / (span + 1)
+    numerator = float(lfilter([1.0], [1.0, -decay], values)[-1]) if len(values) else 0.0
+    denominator = float((1.0 - decay ** len(values)) / (1.0 - decay))
+    return numerator, denominator
+
+def _mean_std(values):
+    """Mean and sample standard deviation of a short window"""
+    n = len(values)
+    mean = sum(values) / n
+    variance = sum([(v - mean) * (v - mean) for v in values]) / (n - 1)
+    return mean, math.sqrt(variance)
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Division with pandas float semantics (inf for x/0, NaN for 0/0)"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+class IndicatorState:
+    """
+    Per-asset indicator state updated in O(window) per new bar
+    """
+
+    def __init__(self):
+        self.closes = deque(maxlen=CLOSE_HISTORY)
+        self.returns = deque(maxlen=RETURN_HISTORY)
+        self.gains = deque(maxlen=RSI_WINDOW)
+        self.losses = deque(maxlen=RSI_WINDOW)
+        # Running [numerator, denominator] of each adjusted EWM
+        self.ema = {span: [0.0, 0.0] for span in EMA_SPANS}
+        self.signal = [0.0, 0.0]
+        self.count = 0
+        self.last_date = None
+
+    @staticmethod
+    def _decay(span: int) -> float:
+        return 1.0 - 2.0 / (span + 1)
+
+    def update(self, date, close: float, high: float = math.nan, low: float = math.nan) -> Dict[str, float]:
+        """
+        Append one bar and return its feature row
+
+        Args:
+            date: Bar timestamp
+            close: Close price
+            high: High price
+            low: Low price
+
+        Returns:
+            Dictionary of feature name to value in feature matrix order
+        """
+        close, high, low = float(close), float(high), float(low)
+        if self.closes:
+            previous = self.closes[-1]
+            daily_return = (close / previous - 1) * 100
+            delta = close - previous
+        else:
+            # First bar: no return, and zero gain/loss (as pandas where on the NaN diff)
+            daily_return = math.nan
+            delta = 0.0
+
+        self.closes.append(close)
+        self.returns.append(daily_return)
+        self.gains.append(delta if delta > 0 else 0.0)
+        self.losses.append(-delta if delta < 0 else 0.0)
+
+        for span, terms in self.ema.items():
+            decay = self._decay(span)
+            terms[0] = close + decay * terms[0]
+            terms[1] = 1.0 + decay * terms[1]
+        fast, slow = EMA_SPANS
+        macd = self.ema[fast][0] / self.ema[fast][1] - self.ema[slow][0] / self.ema[slow][1]
+        decay = self._decay(MACD_SIGNAL_SPAN)
+        self.signal[0] = macd + decay * self.signal[0]
+        self.signal[1] = 1.0 + decay * self.signal[1]
+
+        self.count += 1
+        self.last_date = pd.Timestamp(date)
+        return self.features(high, low)
+
+    def features(self, high: float = math.nan, low: float = math.nan) -> Dict[str, float]:
+        """
+        Feature row of the most recent bar
+
+        Args:
+            high: High price of the most recent bar
+            low: Low price of the most recent bar
+
+        Returns:
+            Dictionary of feature name to value in feature matrix order
+        """
+        nan = math.nan
+        closes = list(self.closes)
+        returns = list(self.returns)
+        close = closes[-1]
+        row = {}
+
+        for window in MA_WINDOWS:
+            row[f'MA_{window}'] = sum(closes[-window:]) / window if len(closes) >= window else nan
+
+        for span in EMA_SPANS:
+            row[f'EMA_{span}'] = self.ema[span][0] / self.ema[span][1]
+        fast, slow = EMA_SPANS
+        row['MACD'] = row[f'EMA_{fast}'] - row[f'EMA_{slow}']
+        row['MACD_Signal'] = self.signal[0] / self.signal[1]
+        row['MACD_Histogram'] = row['MACD'] - row['MACD_Signal']
+
+        if len(self.gains) == RSI_WINDOW:
+            rs = _divide(sum(self.gains) / RSI_WINDOW, sum(self.losses) / RSI_WINDOW)
+            row['RSI'] = 100 - (100 / (1 + rs))
+        else:
+            row['RSI'] = nan
+
+        if len(closes) >= BOLLINGER_WINDOW:
+            mean, std = _mean_std(closes[-BOLLINGER_WINDOW:])
+            upper = mean + std * BOLLINGER_STD
+            lower = mean - std * BOLLINGER_STD
+            row['BB_Width'] = upper - lower
+            row['BB_Position'] = _divide(close - lower, row['BB_Width'])
+        else:
+            row['BB_Width'] = row['BB_Position'] = nan
+
+        for period in MOMENTUM_PERIODS:
+            row[f'Momentum_{period}'] = close / closes[-1 - period] - 1 if len(closes) > period else nan
+
+        for window in VOLATILITY_WINDOWS:
+            # Only the first bar has no return, so a window is complete once it is past it
+            row[f'Vol_{window}'] = _mean_std(returns[-window:])[1] if self.count > window else nan
+        for short, long in VOLATILITY_RATIOS:
+            row[f'Vol_Ratio_{short}_{long}'] = _divide(row[f'Vol_{short}'], row[f'Vol_{long}'])
+
+        row['HL_Volatility'] = (high - low) / close
+
+        day, month = self.last_date.weekday(), self.last_date.month
+        row['Day_Sin'] = math.sin(2 * math.pi * day / 7)
+        row['Day_Cos'] = math.cos(2 * math.pi * day / 7)
+        row['Month_Sin'] = math.sin(2 * math.pi * month / 12)
+        row['Month_Cos'] = math.cos(2 * math.pi * month / 12)
+
+        for lag in FEATURE_LAGS:
+            row[f'Close_lag_{lag}'] = closes[-1 - lag] if len(closes) > lag else nan
+            row[f'Return_lag_{lag}'] = returns[-1 - lag] if len(returns) > lag else nan
+
+        return {column: row[column] for column in _MATRIX_COLUMNS}
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame) -> 'IndicatorState':
+        """
+        Seed the state from a price history
+
+        Args:
+            data: DataFrame with a Close column and a date index
+
+        Returns:
+            State positioned after the last bar of the history
+        """
+        state = cls()
+        close = data['Close'].dropna()
+        values = close.to_numpy(dtype=float)
+        if len(values) == 0:
+            return state
+
+        returns = np.empty_like(values)
+        returns[0] = np.nan
+        returns[1:] = (values[1:] / values[:-1] - 1) * 100
+        deltas = np.diff(values, prepend=values[0])
+
+        state.closes.extend(values[-CLOSE_HISTORY:].tolist())
+        state.returns.extend(returns[-RETURN_HISTORY:].tolist())
+        state.gains.extend(np.where(deltas > 0, deltas, 0.0)[-RSI_WINDOW:].tolist())
+        state.losses.extend(np.where(deltas < 0, -deltas, 0.0)[-RSI_WINDOW:].tolist())
+
+        ema_series = {}
+        for span in EMA_SPANS:
+            decay = cls._decay(span)
+            numerators = lfilter([1.0], [1.0, -decay], values)
+            denominators = (1.0 - decay ** np.arange(1, len(values) + 1)) / (1.0 - decay)
+            ema_series[span] = numerators / denominators
+            state.ema[span] = [float(numerators[-1]), float(denominators[-1])]
+
+        fast, slow = EMA_SPANS
+        state.signal = list(_ewm_terms(ema_series[fast] - ema_series[slow], MACD_SIGNAL_SPAN))
+
+        state.count = len(values)
+        state.last_date = pd.Timestamp(close.index[-1])
+        return state
+
+    def to_dict(self) -> Dict:
+        """Serializable representation of the state"""
+        return {
+            'closes': list(self.closes),
+            'returns': list(self.returns),
+            'gains': list(self.gains),
+            'losses': list(self.losses),
+            'ema': {str(span): terms for span, terms in self.ema.items()},
+            'signal': self.signal,
+            'count': self.count,
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict) -> 'IndicatorState':
+        """Restore a state written by to_dict()"""
+        state = cls()
+        state.closes.extend(payload['closes'])
+        state.returns.extend(payload['returns'])
+        state.gains.extend(payload['gains'])
+        state.losses.extend(payload['losses'])
+        state.ema = {int(span): list(terms) for span, terms in payload['ema'].items()}
+        state.signal = list(payload['signal'])
+        state.count = int(payload['count'])
+        if payload['last_date'] is not None:
+            state.last_date = pd.Timestamp(payload['last_date'])
+        return state
+
+def save_indicator_states(states: Dict[str, IndicatorState], path: str) -> None:
+    """
+    Persist per-asset indicator states
+
+    Args:
+        states: Dictionary of asset name to state
+        path: Output file (.json)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {asset: state.to_dict() for asset, state in states.items()}
+
+    # Write to a temporary file first so a crash never leaves a torn state
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    tmp_path.replace(path)
+
+def load_indicator_states(path: str) -> Dict[str, IndicatorState]:
+    """
+    Load indicator states written by save_indicator_states()
+
+    Args:
+        path: State file (.json)
+
+    Returns:
+        Dictionary of asset name to state (empty if the file does not exist)
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        payload = json.load(f)
+    return {asset: IndicatorState.from_dict(state) for asset, state in payload.items()}
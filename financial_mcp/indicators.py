@@ -0,0 +1,309 @@
+"""
+Technical Indicators Module
+
+This module computes technical indicators (moving averages, EMAs, MACD, RSI,
+Bollinger Bands, momentum and volatility features) for a whole
+(date x asset) close/high/low panel in one vectorized pass. Rolling windows
+come from cumulative sums and EMAs from a linear filter along the date axis,
+so every asset is processed by the same array operations instead of one
+pandas call per asset and indicator.
+
+Windows count each asset's own observations (as the per-asset pandas
+calculations in EnhancedDataFetcher do), so assets with different trading
+calendars can share one panel. Additional indicators can be registered with
+register_indicator().
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from typing import Callable, Dict, Optional, Sequence, Union
+
+from .rolling import _pack, _unpack, _cumsum0, _window_sum
+
+MA_WINDOWS = (5, 10, 20, 50)
+EMA_SPANS = (12, 26)
+MACD_SIGNAL_SPAN = 9
+RSI_WINDOW = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_STD = 2
+MOMENTUM_PERIODS = (5, 10)
+VOLATILITY_WINDOWS = (5, 10, 20, 30)
+VOLATILITY_RATIOS = ((5, 20), (10, 30))
+
+# Indicator groups used by EnhancedDataFetcher
+TECHNICAL_INDICATORS = ('moving_average', 'ema', 'macd', 'rsi', 'bollinger', 'momentum')
+VOLATILITY_INDICATORS = ('volatility', 'hl_volatility')
+
+# Registered indicators in evaluation order: name -> function(panel) -> {column: array}
+_INDICATORS: Dict[str, Callable] = {}
+
+class IndicatorPanel:
+    """
+    Packed price panel handed to indicator functions
+
+    Each column holds one asset's observations contiguously from the top,
+    with a NaN tail, so windows and EMAs run over the asset's own history.
+    Indicator functions read close, high, low and returns, may use outputs
+    of earlier indicators through features, and return packed arrays of the
+    same shape.
+    """
+
+    def __init__(self, close: np.ndarray, high: Optional[np.ndarray] = None,
+                 low: Optional[np.ndarray] = None):
+        """
+        Args:
+            close: Packed close prices (observation x asset)
+            high: Packed high prices aligned with close, optional
+            low: Packed low prices aligned with close, optional
+        """
+        self.close = close
+        self.high = high
+        self.low = low
+        self.features: Dict[str, np.ndarray] = {}
+        self._cumsum_cache = {}
+
+        # Daily percentage returns (NaN on each asset's first observation)
+        self.returns = self.pct_change(close, 1) * 100
+
+    @staticmethod
+    def shift(values: np.ndarray, periods: int) -> np.ndarray:
+        """Values from `periods` observations earlier (NaN before the start)"""
+        out = np.full_like(values, np.nan)
+        if periods < len(values):
+            out[periods:] = values[:len(values) - periods]
+        return out
+
+    def pct_change(self, values: np.ndarray, periods: int) -> np.ndarray:
+        """Fractional change over `periods` observations"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return values / self.shift(values, periods) - 1
+
+    def _cumulative_sums(self, values: np.ndarray):
+        """Leading-zero cumulative count, sum and sum of squares, shared by all windows"""
+        key = id(values)
+        cached = self._cumsum_cache.get(key)
+        if cached is not None and cached[0] is values:
+            return cached[1]
+
+        valid = ~np.isnan(values)
+        # Center each column so the cumulative sums keep their precision
+        counts = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            center = np.nan_to_num(np.where(valid, values, 0.0).sum(axis=0) / counts)
+        deviations = np.where(valid, values - center, 0.0)
+
+        sums = (center, _cumsum0(valid.astype(float)), _cumsum0(deviations),
+                _cumsum0(deviations * deviations))
+        self._cumsum_cache[key] = (values, sums)
+        return sums
+
+    def rolling_mean(self, values: np.ndarray, window: int) -> np.ndarray:
+        """
+        Trailing window mean
+
+        Windows containing a missing value are NaN (pandas min_periods=window).
+        """
+        center, count_sum, first_sum, _ = self._cumulative_sums(values)
+        full = _window_sum(count_sum, window) == window
+        mean = _window_sum(first_sum, window)
+        mean /= window
+        mean += center
+        mean[~full] = np.nan
+        return mean
+
+    def rolling_std(self, values: np.ndarray, window: int) -> np.ndarray:
+        """
+        Trailing window sample standard deviation
+
+        Windows containing a missing value are NaN (pandas min_periods=window).
+        """
+        _, count_sum, first_sum, second_sum = self._cumulative_sums(values)
+        full = _window_sum(count_sum, window) == window
+        sum1 = _window_sum(first_sum, window)
+        variance = _window_sum(second_sum, window)
+        variance -= sum1 * sum1 / window
+        variance /= window - 1
+        with np.errstate(invalid='ignore'):
+            std = np.sqrt(np.maximum(variance, 0.0, out=variance), out=variance)
+        std[~full] = np.nan
+        return std
+
+    @staticmethod
+    def ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+        """
+        Exponentially weighted mean as pandas ewm(span=span).mean()
+
+        Uses adjusted weights; values must not contain missing observations
+        before the packed NaN tail.
+        """
+        alpha = 2.0 / (span + 1)
+        decay = 1.0 - alpha
+        numerator = lfilter([1.0], [1.0, -decay], values, axis=0)
+        steps = np.arange(1, len(values) + 1, dtype=float)
+        denominator = (1.0 - decay ** steps) / alpha
+        return numerator / denominator.reshape((-1,) + (1,) * (values.ndim - 1))
+
+def register_indicator(name: str, func: Optional[Callable] = None):
+    """
+    Register an indicator function
+
+    The function receives an IndicatorPanel and returns a dictionary of
+    column name to packed array. Indicators run in registration order;
+    registering an existing name replaces it in place. Can be used as a
+    decorator: @register_indicator('my_indicator').
+
+    Args:
+        name: Indicator name
+        func: Indicator function
+
+    Returns:
+        The function (or a decorator when func is omitted)
+    """
+    def decorator(f: Callable) -> Callable:
+        _INDICATORS[name] = f
+        return f
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+def available_indicators() -> list:
+    """Names of the registered indicators in evaluation order"""
+    return list(_INDICATORS)
+
+@register_indicator('moving_average')
+def _moving_averages(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    return {f'MA_{w}': panel.rolling_mean(panel.close, w) for w in MA_WINDOWS}
+
+@register_indicator('ema')
+def _exponential_moving_averages(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    return {f'EMA_{span}': panel.ewm_mean(panel.close, span) for span in EMA_SPANS}
+
+@register_indicator('macd')
+def _macd(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    fast, slow = EMA_SPANS
+    fast_ema = panel.features.get(f'EMA_{fast}')
+    slow_ema = panel.features.get(f'EMA_{slow}')
+    if fast_ema is None:
+        fast_ema = panel.ewm_mean(panel.close, fast)
+    if slow_ema is None:
+        slow_ema = panel.ewm_mean(panel.close, slow)
+
+    macd = fast_ema - slow_ema
+    signal = panel.ewm_mean(macd, MACD_SIGNAL_SPAN)
+    return {'MACD': macd, 'MACD_Signal': signal, 'MACD_Histogram': macd - signal}
+
+@register_indicator('rsi')
+def _rsi(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    delta = np.diff(panel.close, axis=0, prepend=np.nan)
+    # First observation has no change and counts as zero gain/loss (as pandas where)
+    first = np.isnan(delta) & ~np.isnan(panel.close)
+    delta = np.where(first, 0.0, delta)
+    gain = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    loss = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+
+    averages = []
+    for moves in (gain, loss):
+        mean = panel.rolling_mean(moves, RSI_WINDOW)
+        # Exact zero when the window has no moves (no cumulative-sum residue)
+        moving = _window_sum(_cumsum0((moves > 0).astype(float)), RSI_WINDOW)
+        averages.append(np.where(moving == 0, 0.0, mean))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = averages[0] / averages[1]
+        rsi = 100 - (100 / (1 + rs))
+    return {'RSI': rsi}
+
+@register_indicator('bollinger')
+def _bollinger_bands(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    mean = panel.rolling_mean(panel.close, BOLLINGER_WINDOW)
+    std = panel.rolling_std(panel.close, BOLLINGER_WINDOW)
+    upper = mean + std * BOLLINGER_STD
+    lower = mean - std * BOLLINGER_STD
+    width = upper - lower
+    with np.errstate(invalid='ignore', divide='ignore'):
+        position = (panel.close - lower) / width
+    return {'BB_Upper': upper, 'BB_Lower': lower, 'BB_Width': width, 'BB_Position': position}
+
+@register_indicator('momentum')
+def _momentum(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    return {f'Momentum_{p}': panel.pct_change(panel.close, p) for p in MOMENTUM_PERIODS}
+
+@register_indicator('volatility')
+def _volatility(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    result = {f'Vol_{w}': panel.rolling_std(panel.returns, w) for w in VOLATILITY_WINDOWS}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for short, long in VOLATILITY_RATIOS:
+            result[f'Vol_Ratio_{short}_{long}'] = result[f'Vol_{short}'] / result[f'Vol_{long}']
+    return result
+
+@register_indicator('hl_volatility')
+def _hl_volatility(panel: IndicatorPanel) -> Dict[str, np.ndarray]:
+    if panel.high is None or panel.low is None:
+        return {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {'HL_Volatility': (panel.high - panel.low) / panel.close}
+
+def compute_indicators(
+    close: Union[pd.DataFrame, np.ndarray],
+    high: Optional[Union[pd.DataFrame, np.ndarray]] = None,
+    low: Optional[Union[pd.DataFrame, np.ndarray]] = None,
+    indicators: Optional[Sequence[str]] = None
+) -> Dict[str, Union[pd.DataFrame, np.ndarray]]:
+    """
+    Compute technical indicators for every asset of a price panel
+
+    Args:
+        close: (date x asset) close prices; NaN where an asset has no bar
+        high: (date x asset) high prices, optional
+        low: (date x asset) low prices, optional
+        indicators: Registered indicator names to compute (default: all)
+
+    Returns:
+        Dictionary of feature name to a (date x asset) DataFrame (or array
+        when close is an array); NaN where the asset has no bar
+    """
+    names = list(_INDICATORS) if indicators is None else list(indicators)
+    unknown = [name for name in names if name not in _INDICATORS]
+    if unknown:
+        raise ValueError(f"Unknown indicator(s): {unknown}. Available: {available_indicators()}")
+
+    is_frame = isinstance(close, pd.DataFrame)
+    if is_frame:
+        index, columns = close.index, close.columns
+        high = high.reindex(index=index, columns=columns) if high is not None else None
+        low = low.reindex(index=index, columns=columns) if low is not None else None
+
+    close_values = np.asarray(close, dtype=float)
+    if close_values.ndim == 1:
+        close_values = close_values[:, None]
+    mask = ~np.isnan(close_values)
+
+    # Pack each asset's bars to the top so windows follow its own calendar
+    complete = bool(mask.all())
+    if complete:
+        packed_close, order = close_values, None
+    else:
+        packed_close, order, _ = _pack(close_values, mask)
+
+    def pack(values):
+        if values is None:
+            return None
+        values = np.asarray(values, dtype=float).reshape(close_values.shape)
+        return values if complete else np.take_along_axis(values, order, axis=0)
+
+    panel = IndicatorPanel(packed_close, pack(high), pack(low))
+    for name in names:
+        panel.features.update(_INDICATORS[name](panel))
+
+    results = {}
+    for feature, packed in panel.features.items():
+        if complete:
+            values = packed
+        else:
+            values = _unpack(packed, order)
+            values[~mask] = np.nan
+        results[feature] = (pd.DataFrame(values, index=index, columns=columns, copy=False)
+                            if is_frame else values)
+    return results
@@ -0,0 +1,210 @@
+"""
+Model Backends Module
+
+This module defines the regressors behind the next-day return models as
+pluggable backends. A backend creates an unfitted scikit-learn estimator
+and states whether features are standardized first:
+
+- random_forest: 100-tree RandomForestRegressor on StandardScaler features
+  (the original EnhancedDataFetcher model)
+- hist_gradient_boosting: HistGradientBoostingRegressor, which bins features
+  into histograms, trains much faster on large sample counts and needs no
+  scaling
+
+Additional backends can be registered with register_backend(), and
+benchmark_backends() compares training time, inference latency and accuracy
+of several backends on the same feature matrix.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Sequence
+
+DEFAULT_BACKEND = 'random_forest'
+
+class ModelBackend:
+    """
+    Named estimator factory with its preprocessing choice
+    """
+
+    def __init__(self, name: str, factory: Callable, scale_features: bool = True):
+        """
+        Args:
+            name: Backend name
+            factory: Function(random_state) returning an unfitted regressor
+            scale_features: Standardize features before fitting
+        """
+        self.name = name
+        self.factory = factory
+        self.scale_features = scale_features
+
+    def create(self, random_state: int):
+        """Unfitted estimator seeded with random_state"""
+        return self.factory(random_state)
+
+# Registered backends: name -> ModelBackend
+_BACKENDS: Dict[str, ModelBackend] = {}
+
+def register_backend(name: str, factory: Optional[Callable] = None, scale_features: bool = True):
+    """
+    Register a model backend
+
+    The factory receives a random_state and returns an unfitted regressor
+    with fit/predict. Registering an existing name replaces it. Can be used
+    as a decorator: @register_backend('my_model', scale_features=False).
+
+    Args:
+        name: Backend name
+        factory: Estimator factory
+        scale_features: Standardize features before fitting
+
+    Returns:
+        The factory (or a decorator when factory is omitted)
+    """
+    def decorator(f: Callable) -> Callable:
+        _BACKENDS[name] = ModelBackend(name, f, scale_features)
+        return f
+
+    if factory is None:
+        return decorator
+    return decorator(factory)
+
+def available_backends() -> list:
+    """Names of the registered backends"""
+    return list(_BACKENDS)
+
+def get_backend(name: str) -> ModelBackend:
+    """Look up a registered backend"""
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown model backend '{name}'. Available: {available_backends()}")
+    return _BACKENDS[name]
+
+@register_backend('random_forest')
+def _random_forest(random_state: int):
+    from sklearn.ensemble import RandomForestRegressor
+    # Single-threaded: parallelism comes from the process pool
+    return RandomForestRegressor(n_estimators=100, random_state=random_state, n_jobs=1)
+
+@register_backend('hist_gradient_boosting', scale_features=False)
+def _hist_gradient_boosting(random_state: int):
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    return HistGradientBoostingRegressor(max_iter=100, random_state=random_state)
+
+def fit_model(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    columns: list,
+    random_state: int = 42,
+    backend: str = DEFAULT_BACKEND,
+    n_threads: Optional[int] = None,
+    n_jobs: Optional[int] = None
+):
+    """
+    Fit one model with a backend
+
+    Args:
+        X_train: Training features
+        y_train: Training target
+        columns: Feature names
+        random_state: Seed of the estimator
+        backend: Registered backend name
+        n_threads: Limit on native (OpenMP/BLAS) threads while fitting, e.g.
+            1 inside process-pool workers
+        n_jobs: Override of the estimator's n_jobs, for estimators that have
+            one (e.g. a single large model using every core)
+
+    Returns:
+        Tuple of (model, scaler); scaler is None for backends without scaling
+    """
+    spec = get_backend(backend)
+    # Column names keep the fitted estimators' feature-name checks
+    X_train = pd.DataFrame(X_train, columns=columns, copy=False)
+    scaler = None
+    if spec.scale_features:
+        from sklearn.preprocessing import StandardScaler
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+
+    model = spec.create(random_state)
+    if n_jobs is not None and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+    if n_threads is None:
+        model.fit(X_train, y_train)
+    else:
+        from threadpoolctl import threadpool_limits
+        with threadpool_limits(limits=n_threads):
+            model.fit(X_train, y_train)
+    return model, scaler
+
+def predict(model, scaler, X: np.ndarray, columns: list) -> np.ndarray:
+    """Predictions of a fitted (model, scaler) pair"""
+    X = pd.DataFrame(X, columns=columns, copy=False)
+    if scaler is not None:
+        X = scaler.transform(X)
+    return model.predict(X)
+
+def benchmark_backends(
+    X: pd.DataFrame,
+    y: pd.Series,
+    backends: Optional[Sequence[str]] = None,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    latency_samples: int = 200
+) -> pd.DataFrame:
+    """
+    Compare backends on the same feature matrix
+
+    Every backend is trained on the same chronological split and evaluated
+    on the held-out rows.
+
+    Args:
+        X: Feature matrix (time order)
+        y: Next-day return target
+        backends: Backend names (default: all registered)
+        test_size: Fraction of the most recent rows held out
+        random_state: Seed of every model
+        latency_samples: Single-row predictions timed per backend
+
+    Returns:
+        DataFrame indexed by backend with train_seconds,
+        batch_predict_seconds, single_predict_ms (median) and
+        single_predict_p99_ms, r2_score, rmse and directional_accuracy
+    """
+    from .training import chronological_split
+
+    columns = list(X.columns)
+    values = X.to_numpy(dtype=float)
+    target = np.asarray(y, dtype=float)
+    split = chronological_split(len(values), test_size)
+    X_train, X_test = values[:split], values[split:]
+    y_train, y_test = target[:split], target[split:]
+
+    rows = {}
+    for name in backends or available_backends():
+        start = time.perf_counter()
+        model, scaler = fit_model(X_train, y_train, columns, random_state, name)
+        train_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = predict(model, scaler, X_test, columns)
+        batch_seconds = time.perf_counter() - start
+
+        latencies = []
+        for i in range(min(latency_samples, len(X_test))):
+            start = time.perf_counter()
+            predict(model, scaler, X_test[i:i + 1], columns)
+            latencies.append(time.perf_counter() - start)
+        latencies = np.array(latencies) * 1000
+
+        residual = y_test - y_pred
+        rows[name] = {
+            'train_seconds': train_seconds,
+            'batch_predict_seconds': batch_seconds,
+            'single_predict_ms': float(np.median(latencies)) if len(latencies) else np.nan,
+            'single_predict_p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else np.nan,
+            'r2_score': float(1 - np.sum(residual ** 2) / np.sum((y_test - y_test.mean()) ** 2)),
+            'rmse': float(np.sqrt(np.mean(residual ** 2))),
+            'directional_accuracy': float(np.mean(np.sign(y_pred) == np.sign(y_test)))
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
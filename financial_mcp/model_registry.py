@@ -0,0 +1,345 @@
+"""
+Model Registry Module
+
+This module stores trained prediction models as immutable, numbered
+versions under one directory and describes them in a manifest.json: per
+model the file, its sha256, size, backend, features and metrics, plus a
+fingerprint of the training data. Servers open the registry without
+unpickling anything; each model is loaded on first use with
+joblib.load(mmap_mode='r'), and an LRU bound caps how many models stay
+resident in memory. get_predictor() serves tree ensembles through compiled
+array-backed inference; a predictor is evicted together with its model.
+
+Several processes can register into one directory: a new version number is
+reserved by creating its v<N>/ directory, and the manifest is re-read and
+rewritten under an exclusive lock on manifest.lock.
+
+Layout:
+    models/manifest.json
+    models/v1/SP500.joblib
+    models/v2/pooled.joblib
+"""
+
+import hashlib
+import json
+import shutil
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_LOCK_FILE = 'manifest.lock'
+
+# Models kept in memory by default
+DEFAULT_MAX_LOADED = 32
+
+# Versions kept on disk by default when pruning
+DEFAULT_KEEP_VERSIONS = 5
+
+def data_fingerprint(frames: Dict[str, pd.DataFrame]) -> str:
+    """
+    Fingerprint of a set of training frames
+
+    Args:
+        frames: Dictionary of asset name to DataFrame (raw data or features)
+
+    Returns:
+        sha256 hex digest over the asset names, index and values
+    """
+    digest = hashlib.sha256()
+    for asset in sorted(frames):
+        digest.update(str(asset).encode())
+        digest.update(pd.util.hash_pandas_object(frames[asset], index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _file_sha256(path: Path) -> str:
+    """sha256 hex digest of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _jsonable(value):
+    """Plain JSON types for metrics (numpy scalars, nested dicts)"""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+class ModelRegistry:
+    """
+    Versioned store of trained models with lazy, memory-mapped loading
+    """
+
+    def __init__(self, directory: str = 'models', max_loaded: int = DEFAULT_MAX_LOADED):
+        """
+        Args:
+            directory: Registry directory (holds manifest.json and v<N>/)
+            max_loaded: Maximum number of models resident in memory
+        """
+        if max_loaded < 1:
+            raise ValueError("max_loaded must be at least 1")
+        self.directory = Path(directory)
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+        # Predictors of resident models only (evicted along with _loaded)
+        self._predictors = {}
+        self._lock = threading.RLock()
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict:
+        path = self.directory / MANIFEST_FILE
+        if not path.exists():
+            return {'latest': None, 'versions': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self) -> None:
+        # Write to a temporary file first so readers never see a torn manifest
+        path = self.directory / MANIFEST_FILE
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        tmp_path.replace(path)
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Exclusive lock between processes updating the manifest (POSIX only)"""
+        try:
+            import fcntl
+        except ImportError:
+            fcntl = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / MANIFEST_LOCK_FILE, 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reserve_version(self) -> int:
+        """Next version number, reserved by creating its directory"""
+        self.refresh()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        existing = [int(path.name[1:]) for path in self.directory.glob('v*') if path.name[1:].isdigit()]
+        version = max(self.versions() + existing, default=0) + 1
+        while True:
+            try:
+                (self.directory / f"v{version}").mkdir()
+                return version
+            except FileExistsError:
+                # Taken by another process in the meantime
+                version += 1
+
+    def refresh(self) -> None:
+        """Re-read the manifest (e.g. after another process registered a version)"""
+        self.manifest = self._read_manifest()
+
+    @property
+    def latest_version(self) -> Optional[int]:
+        """Most recently registered version"""
+        return self.manifest['latest']
+
+    def versions(self) -> List[int]:
+        """Registered versions, oldest first"""
+        return sorted(int(version) for version in self.manifest['versions'])
+
+    def register(
+        self,
+        models: Dict[str, Dict],
+        model_performance: Optional[Dict[str, Dict]] = None,
+        fingerprint: Optional[str] = None
+    ) -> int:
+        """
+        Save a set of trained models as a new version
+
+        Args:
+            models: Dictionary of model name (asset or 'pooled') to model data
+                ({'model', 'scaler', 'features', ...})
+            model_performance: Dictionary of asset name to metrics (a pooled
+                model records the metrics of all its assets)
+            fingerprint: Fingerprint of the training data (see data_fingerprint)
+
+        Returns:
+            The new version number
+        """
+        import joblib
+
+        model_performance = model_performance or {}
+        version = self._reserve_version()
+        version_dir = self.directory / f"v{version}"
+
+        entries = {}
+        for name, model_data in models.items():
+            path = version_dir / f"{name}.joblib"
+            # Uncompressed so arrays can be memory-mapped on load
+            joblib.dump(model_data, path)
+
+            metrics = model_performance.get(name)
+            if metrics is None and 'assets' in model_data:
+                # Pooled model: metrics of every asset it serves
+                metrics = {asset: model_performance[asset]
+                           for asset in model_data['assets'] if asset in model_performance}
+            entries[name] = {
+                'file': str(path.relative_to(self.directory)),
+                'sha256': _file_sha256(path),
+                'bytes': path.stat().st_size,
+                'backend': model_data.get('backend'),
+                'features': list(model_data.get('features', [])),
+                'metrics': _jsonable(metrics or {})
+            }
+
+        with self._manifest_lock():
+            # Keep versions other processes registered since this one started
+            self.refresh()
+            self.manifest['versions'][str(version)] = {
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'data_fingerprint': fingerprint,
+                'models': entries
+            }
+            self.manifest['latest'] = max(self.versions())
+            self._write_manifest()
+        return version
+
+    def models(self, version: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Manifest entries of a version
+
+        Args:
+            version: Version number (default: latest)
+
+        Returns:
+            Dictionary of model name to its manifest entry
+        """
+        return self._version_entry(version)['models']
+
+    def _version_entry(self, version: Optional[int]) -> Dict:
+        version = self.latest_version if version is None else version
+        entry = self.manifest['versions'].get(str(version))
+        if entry is None:
+            raise KeyError(f"Model version {version} is not registered")
+        return entry
+
+    def get(self, name: str, version: Optional[int] = None) -> Dict:
+        """
+        Model data of one model, loaded on first use
+
+        Args:
+            name: Model name (asset or 'pooled')
+            version: Version number (default: latest)
+
+        Returns:
+            The model data dictionary saved by register()
+        """
+        import joblib
+
+        with self._lock:
+            version = self.latest_version if version is None else version
+            key = (version, name)
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+                return self._loaded[key]
+
+            entry = self.models(version).get(name)
+            if entry is None:
+                raise KeyError(f"Model '{name}' is not registered in version {version}")
+            model_data = joblib.load(self.directory / entry['file'], mmap_mode='r')
+
+            self._loaded[key] = model_data
+            while len(self._loaded) > self.max_loaded:
+                evicted, _ = self._loaded.popitem(last=False)
+                # A predictor keeps its model alive: evict both together
+                self._predictors.pop(evicted, None)
+            return model_data
+
+    def get_predictor(self, name: str, version: Optional[int] = None) -> Callable:
+        """
+        Prediction function of one model
+
+        Tree ensembles are compiled to array-backed inference (see
+        tree_inference); other models fall back to scaler + model.predict.
+
+        Args:
+            name: Model name (asset or 'pooled')
+            version: Version number (default: latest)
+
+        Returns:
+            Function mapping an (n_rows x n_features) array of unscaled model
+            inputs ('model_features' for pooled models, else 'features') to
+            predictions
+        """
+        from .model_backends import predict
+        from .tree_inference import compile_model_data
+
+        with self._lock:
+            version = self.latest_version if version is None else version
+            key = (version, name)
+            if key in self._predictors:
+                self._loaded.move_to_end(key)
+                return self._predictors[key]
+
+            model_data = self.get(name, version)
+            compiled = compile_model_data(model_data)
+            if compiled is not None:
+                predictor = compiled.predict
+            else:
+                columns = model_data.get('model_features', model_data['features'])
+                def predictor(X, model=model_data['model'], scaler=model_data.get('scaler')):
+                    return predict(model, scaler, np.array(X, dtype=float, ndmin=2), columns)
+
+            self._predictors[key] = predictor
+            return predictor
+
+    def loaded(self) -> List[tuple]:
+        """(version, name) of the resident models, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def verify(self, version: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Check the model files of a version against their recorded hashes
+
+        Returns:
+            Dictionary of model name to whether its sha256 matches
+        """
+        return {
+            name: _file_sha256(self.directory / entry['file']) == entry['sha256']
+            for name, entry in self.models(version).items()
+        }
+
+    def prune(self, keep: int = DEFAULT_KEEP_VERSIONS) -> List[int]:
+        """
+        Delete all but the most recent versions
+
+        Args:
+            keep: Number of versions to keep
+
+        Returns:
+            The deleted version numbers
+        """
+        with self._manifest_lock(), self._lock:
+            self.refresh()
+            removed = self.versions()[:-keep] if keep > 0 else self.versions()
+            for version in removed:
+                del self.manifest['versions'][str(version)]
+                self._loaded = OrderedDict((k, v) for k, v in self._loaded.items() if k[0] != version)
+                self._predictors = {k: v for k, v in self._predictors.items() if k[0] != version}
+            if removed:
+                remaining = self.versions()
+                self.manifest['latest'] = remaining[-1] if remaining else None
+                self._write_manifest()
+        for version in removed:
+            shutil.rmtree(self.directory / f"v{version}", ignore_errors=True)
+        return removed
@@ -0,0 +1,259 @@
+"""
+Monte Carlo Risk Module
+
+This module simulates portfolio returns from correlated multi-asset models
+(Gaussian, Student-t or bootstrapped historical days) and reports VaR, CVaR
+and the loss distribution for arbitrary portfolio weights.
+
+Simulation runs in chunks of paths so memory stays bounded, each chunk has
+its own seed spawned from one SeedSequence (results are identical for any
+number of workers), and chunks are spread across a process pool. Over a
+one-day horizon the portfolio return of the Gaussian and Student-t models is
+exactly a one-dimensional draw, so only the projection onto the weights is
+sampled; multi-day horizons simulate full asset paths and compound them.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Union
+
+from .correlation import shrunk_correlation
+
+SIMULATION_METHODS = ('gaussian', 'student_t', 'bootstrap')
+DEFAULT_CONFIDENCE_LEVELS = (0.95, 0.99)
+
+# Simulated values held in memory per chunk (float64)
+CHUNK_ELEMENTS = 2 ** 22
+
+# Model parameters of the current simulation, set once per worker process
+_WORKER_STATE = {}
+
+def _init_worker(state: Dict) -> None:
+    """Install the simulation parameters in a worker process"""
+    global _WORKER_STATE
+    _WORKER_STATE = state
+
+def _t_scale(rng: np.random.Generator, dof: float, size) -> np.ndarray:
+    """Student-t mixing factor scaled to unit variance"""
+    return np.sqrt((dof - 2) / rng.chisquare(dof, size))
+
+def _simulate_chunk(task) -> np.ndarray:
+    """Simulate portfolio returns (percent) for one chunk of paths"""
+    seed, n_paths = task
+    state = _WORKER_STATE
+    rng = np.random.default_rng(seed)
+    method, horizon = state['method'], state['horizon']
+
+    if method == 'bootstrap':
+        days = rng.integers(0, len(state['history']), size=(n_paths, horizon))
+        if horizon == 1:
+            return state['history_portfolio'][days[:, 0]]
+        asset_returns = state['history'][days]
+    else:
+        if horizon == 1:
+            shocks = rng.standard_normal(n_paths)
+            if method == 'student_t':
+                shocks *= _t_scale(rng, state['dof'], n_paths)
+            return state['portfolio_mean'] + state['portfolio_std'] * shocks
+
+        n_assets = len(state['mean'])
+        shocks = rng.standard_normal((n_paths, horizon, n_assets)) @ state['cholesky'].T
+        if method == 'student_t':
+            shocks *= _t_scale(rng, state['dof'], (n_paths, horizon))[..., None]
+        asset_returns = state['mean'] + shocks
+
+    # Buy-and-hold: compound each asset over the horizon, then weight
+    growth = np.prod(1 + asset_returns / 100, axis=1)
+    return (growth - 1) @ state['weights'] * 100
+
+def _resolve_weights(
+    daily_returns_df: pd.DataFrame,
+    weights: Optional[Union[Dict[str, float], Sequence[float], pd.Series]]
+) -> pd.Series:
+    """Return portfolio weights indexed by asset"""
+    if weights is None:
+        assets = daily_returns_df.dropna(axis=1, how='all').columns
+        return pd.Series(1.0 / len(assets), index=assets)
+
+    if isinstance(weights, (dict, pd.Series)):
+        weights = pd.Series(weights, dtype=float)
+        missing = [asset for asset in weights.index if asset not in daily_returns_df.columns]
+        if missing:
+            raise ValueError(
+                f"Weighted asset(s) not found in returns data: {missing}. "
+                f"Available columns: {list(daily_returns_df.columns)}"
+            )
+        return weights
+
+    weights = np.asarray(weights, dtype=float)
+    if len(weights) != len(daily_returns_df.columns):
+        raise ValueError(
+            f"Expected {len(daily_returns_df.columns)} weights, got {len(weights)}"
+        )
+    return pd.Series(weights, index=daily_returns_df.columns)
+
+def _cholesky(covariance: np.ndarray) -> np.ndarray:
+    """Cholesky factor, falling back to an eigen factor for singular matrices"""
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+def _model_state(
+    daily_returns_df: pd.DataFrame,
+    weights: pd.Series,
+    method: str,
+    horizon: int,
+    dof: float
+) -> Dict:
+    """Estimate the simulation parameters from the returns history"""
+    returns = daily_returns_df[list(weights.index)]
+    w = weights.to_numpy()
+    state = {'method': method, 'horizon': horizon, 'dof': dof, 'weights': w}
+
+    if method == 'bootstrap':
+        # Resample whole days; an asset without a quote that day holds flat
+        history = returns.dropna(how='all').fillna(0.0)
+        if history.empty:
+            raise ValueError("Bootstrap needs at least one day with returns for the weighted assets")
+        state['history'] = history.to_numpy()
+        state['history_portfolio'] = state['history'] @ w
+        return state
+
+    # Shrunk correlation keeps the covariance positive definite for ragged histories
+    mean = returns.mean().to_numpy()
+    std = returns.std().fillna(0).to_numpy()
+    correlation, _ = shrunk_correlation(returns)
+    covariance = np.nan_to_num(std[:, None] * correlation * std[None, :])
+
+    state['mean'] = np.nan_to_num(mean)
+    state['cholesky'] = _cholesky(covariance)
+    state['portfolio_mean'] = float(state['mean'] @ w)
+    state['portfolio_std'] = float(np.sqrt(max(w @ covariance @ w, 0.0)))
+    return state
+
+def simulate_portfolio_returns(
+    daily_returns_df: pd.DataFrame,
+    weights: Optional[Union[Dict[str, float], Sequence[float], pd.Series]] = None,
+    n_paths: int = 100000,
+    horizon: int = 1,
+    method: str = 'gaussian',
+    dof: float = 5.0,
+    seed: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None
+) -> np.ndarray:
+    """
+    Simulate portfolio returns over a horizon
+
+    Args:
+        daily_returns_df: DataFrame with daily returns data (percent)
+        weights: Portfolio weights as {asset: weight}, a Series, or a sequence
+            aligned with the columns; defaults to equal weights
+        n_paths: Number of simulated paths
+        horizon: Holding period in days
+        method: 'gaussian', 'student_t' or 'bootstrap'
+        dof: Degrees of freedom for the Student-t model (> 2)
+        seed: Seed for reproducible results
+        chunk_size: Paths per chunk; defaults to a bounded memory budget
+        n_jobs: Worker processes (default: CPU count)
+
+    Returns:
+        Array of n_paths simulated portfolio returns (percent)
+    """
+    if method not in SIMULATION_METHODS:
+        raise ValueError(f"Unsupported method '{method}'. Choose from: {', '.join(SIMULATION_METHODS)}")
+    if method == 'student_t' and dof <= 2:
+        raise ValueError("Student-t degrees of freedom must be greater than 2")
+    if horizon < 1:
+        raise ValueError("Horizon must be at least one day")
+
+    weights = _resolve_weights(daily_returns_df, weights)
+    state = _model_state(daily_returns_df, weights, method, horizon, dof)
+
+    if chunk_size is None:
+        per_path = 1 if horizon == 1 else horizon * len(weights)
+        chunk_size = max(1, CHUNK_ELEMENTS // per_path)
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = list(zip(seeds, sizes))
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(tasks) <= 1:
+        _init_worker(state)
+        chunks = [_simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)),
+                                 initializer=_init_worker, initargs=(state,)) as executor:
+            chunks = list(executor.map(_simulate_chunk, tasks))
+
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+def monte_carlo_var(
+    daily_returns_df: pd.DataFrame,
+    weights: Optional[Union[Dict[str, float], Sequence[float], pd.Series]] = None,
+    n_paths: int = 100000,
+    horizon: int = 1,
+    method: str = 'gaussian',
+    dof: float = 5.0,
+    seed: Optional[int] = None,
+    confidence_levels: Sequence[float] = DEFAULT_CONFIDENCE_LEVELS,
+    bins: int = 100,
+    chunk_size: Optional[int] = None,
+    n_jobs: Optional[int] = None
+) -> Dict:
+    """
+    Monte Carlo VaR and CVaR for a portfolio
+
+    VaR and CVaR follow the historical figures in analyze: VaR is the
+    (1 - confidence) quantile of returns and CVaR the mean return at or
+    below it, both in percent (negative for losses).
+
+    Args:
+        daily_returns_df: DataFrame with daily returns data (percent)
+        weights: Portfolio weights (see simulate_portfolio_returns)
+        n_paths: Number of simulated paths
+        horizon: Holding period in days
+        method: 'gaussian', 'student_t' or 'bootstrap'
+        dof: Degrees of freedom for the Student-t model
+        seed: Seed for reproducible results
+        confidence_levels: Confidence levels to report (e.g. 0.95 -> var_95)
+        bins: Number of histogram bins for the loss distribution
+        chunk_size: Paths per chunk
+        n_jobs: Worker processes (default: CPU count)
+
+    Returns:
+        Dictionary with the simulation settings, mean return, volatility,
+        var_XX/cvar_XX per confidence level and a loss histogram
+        (losses are negated returns)
+    """
+    weights = _resolve_weights(daily_returns_df, weights)
+    simulated = simulate_portfolio_returns(
+        daily_returns_df, weights, n_paths, horizon, method, dof, seed, chunk_size, n_jobs
+    )
+
+    results = {
+        'method': method,
+        'n_paths': int(n_paths),
+        'horizon': int(horizon),
+        'seed': seed,
+        'weights': {str(asset): float(w) for asset, w in weights.items()},
+        'mean_return': float(simulated.mean()),
+        'volatility': float(simulated.std(ddof=1)),
+    }
+
+    for confidence in confidence_levels:
+        label = f"{round(confidence * 100):d}"
+        var = np.quantile(simulated, 1 - confidence)
+        results[f'var_{label}'] = float(var)
+        results[f'cvar_{label}'] = float(simulated[simulated <= var].mean())
+
+    counts, bin_edges = np.histogram(-simulated, bins=bins)
+    results['loss_distribution'] = {
+        'bin_edges': bin_edges.tolist(),
+        'counts': counts.tolist()
+    }
+    return results
@@ -0,0 +1,263 @@
+"""
+Online Model Module
+
+This module provides an online-learning alternative to the periodically
+retrained forests: a recursive least squares (RLS) regressor with
+exponential forgetting. Each new bar costs one O(n_features^2) update, so
+the model stays current on every refresh cycle without a full retrain, and
+the forgetting factor lets it track changing market regimes.
+
+Features are standardized with a scaler frozen at the initial fit. The next-day
+target of a feature row is only known one bar later, so each model keeps its
+latest row pending and learns from it when the next close arrives. Models
+are checkpointed to disk (one .npz per asset) between runs.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List
+
+# Weight of the previous observation relative to the newest (effective memory 1 / (1 - lambda) bars)
+DEFAULT_FORGETTING = 0.995
+
+# Initial inverse-covariance scale (weak ridge prior on the weights)
+DEFAULT_DELTA = 100.0
+
+class OnlineRLSRegressor:
+    """
+    Recursive least squares regressor with forgetting and an intercept
+    """
+
+    def __init__(self, columns: List[str], forgetting: float = DEFAULT_FORGETTING,
+                 delta: float = DEFAULT_DELTA):
+        """
+        Args:
+            columns: Feature names, in input order
+            forgetting: Forgetting factor lambda in (0, 1]
+            delta: Initial inverse-covariance scale
+        """
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting must be in (0, 1]")
+        self.columns = list(columns)
+        self.forgetting = forgetting
+        self.delta = delta
+
+        n = len(self.columns) + 1
+        self.weights = np.zeros(n)
+        self.covariance = np.eye(n) * delta
+        self.mean = np.zeros(len(self.columns))
+        self.scale = np.ones(len(self.columns))
+        self.count = 0
+
+        # Latest feature row (and its close) waiting for the next bar's return
+        self.pending_row = None
+        self.pending_close = np.nan
+        self.last_date = None
+
+    def _design(self, X) -> np.ndarray:
+        """Standardized rows with a leading intercept column"""
+        X = np.array(X, dtype=float, ndmin=2)
+        design = np.empty((len(X), len(self.columns) + 1))
+        design[:, 0] = 1.0
+        design[:, 1:] = (X - self.mean) / self.scale
+        return design
+
+    def fit(self, X, y) -> 'OnlineRLSRegressor':
+        """
+        Initial fit on a history
+
+        Freezes the scaler on X and sets the state RLS would reach after
+        processing the rows in order (exponentially weighted ridge solution).
+
+        Args:
+            X: Feature rows in time order (DataFrame or array)
+            y: Targets
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        valid = np.isfinite(X).all(axis=1) & np.isfinite(y)
+        X, y = X[valid], y[valid]
+        if len(X) == 0:
+            raise ValueError("No complete rows to fit the online model")
+
+        self.mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+
+        design = self._design(X)
+        decay = self.forgetting ** np.arange(len(X) - 1, -1, -1)
+        precision = (self.forgetting ** len(X)) * np.eye(design.shape[1]) / self.delta
+        precision += (design * decay[:, None]).T @ design
+        self.covariance = np.linalg.inv(precision)
+        self.covariance = (self.covariance + self.covariance.T) / 2
+        self.weights = self.covariance @ (design.T @ (decay * y))
+        self.count = len(X)
+        return self
+
+    def partial_fit(self, X, y) -> 'OnlineRLSRegressor':
+        """
+        Update the model with new rows (one RLS step per row)
+
+        Rows with missing values are skipped.
+
+        Args:
+            X: Feature rows in time order
+            y: Targets
+
+        Returns:
+            self
+        """
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        lam = self.forgetting
+        for x, target in zip(self._design(X), y):
+            if not (np.isfinite(x).all() and np.isfinite(target)):
+                continue
+            px = self.covariance @ x
+            gain = px / (lam + x @ px)
+            self.weights += gain * (target - x @ self.weights)
+            self.covariance -= np.outer(gain, px)
+            self.covariance /= lam
+            self.count += 1
+        # Keep the covariance symmetric against rounding drift
+        self.covariance = (self.covariance + self.covariance.T) / 2
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        """Predictions for feature rows"""
+        return self._design(X) @ self.weights
+
+    def observe(self, features: pd.DataFrame, closes: pd.Series) -> int:
+        """
+        Learn from newly arrived bars
+
+        The pending row from the previous bar is fitted on the return to the
+        first new close, and so on; the last new row becomes pending.
+
+        Args:
+            features: Feature rows of the new bars (date index, self.columns)
+            closes: Close prices of the new bars (same index)
+
+        Returns:
+            Number of rows learned from
+        """
+        learned = 0
+        values = features[self.columns].to_numpy(dtype=float)
+        closes = closes.reindex(features.index).to_numpy(dtype=float)
+        for date, row, close in zip(features.index, values, closes):
+            if not np.isfinite(close):
+                continue
+            if self.pending_row is not None and np.isfinite(self.pending_close):
+                target = (close / self.pending_close - 1) * 100
+                count = self.count
+                self.partial_fit(self.pending_row, [target])
+                learned += self.count - count
+            self.pending_row = row if np.isfinite(row).all() else None
+            self.pending_close = close
+            self.last_date = pd.Timestamp(date)
+        return learned
+
+    def save(self, path: str) -> None:
+        """
+        Checkpoint the model to disk
+
+        Args:
+            path: Output file (.npz)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            'columns': self.columns,
+            'forgetting': self.forgetting,
+            'delta': self.delta,
+            'count': self.count,
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None
+        }
+        pending = self.pending_row if self.pending_row is not None else np.full(len(self.columns), np.nan)
+
+        # Write to a temporary file first so a crash never leaves a torn checkpoint
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, metadata=np.array(json.dumps(metadata)), weights=self.weights,
+                     covariance=self.covariance, mean=self.mean, scale=self.scale,
+                     pending_row=pending, pending_close=np.array(self.pending_close),
+                     has_pending=np.array(self.pending_row is not None))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'OnlineRLSRegressor':
+        """
+        Load a checkpoint written by save()
+
+        Args:
+            path: Checkpoint file (.npz)
+
+        Returns:
+            Restored model
+        """
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+            model = cls(metadata['columns'], metadata['forgetting'], metadata['delta'])
+            model.weights = data['weights'].copy()
+            model.covariance = data['covariance'].copy()
+            model.mean = data['mean'].copy()
+            model.scale = data['scale'].copy()
+            model.count = int(metadata['count'])
+            if bool(data['has_pending']):
+                model.pending_row = data['pending_row'].copy()
+            model.pending_close = float(data['pending_close'])
+            if metadata['last_date'] is not None:
+                model.last_date = pd.Timestamp(metadata['last_date'])
+        return model
+
+def train_online_models(
+    training_sets: Dict[str, tuple],
+    enhanced_features: Dict[str, pd.DataFrame],
+    closes: Dict[str, pd.Series],
+    forgetting: float = DEFAULT_FORGETTING
+) -> Dict[str, OnlineRLSRegressor]:
+    """
+    Fit one online model per asset and leave its latest bar pending
+
+    Args:
+        training_sets: Dictionary of asset name to (features, target)
+        enhanced_features: Full feature matrices (including the latest row,
+            whose target is not known yet)
+        closes: Dictionary of asset name to close prices
+        forgetting: Forgetting factor
+
+    Returns:
+        Dictionary of asset name to fitted model
+    """
+    models = {}
+    for asset, (X, y) in training_sets.items():
+        model = OnlineRLSRegressor(list(X.columns), forgetting).fit(X, y)
+        features = enhanced_features[asset]
+        latest = features.index[-1]
+        row = features[model.columns].iloc[-1].to_numpy(dtype=float)
+        model.pending_row = row if np.isfinite(row).all() else None
+        model.pending_close = float(closes[asset].get(latest, np.nan))
+        model.last_date = pd.Timestamp(latest)
+        models[asset] = model
+    return models
+
+def save_online_models(models: Dict[str, OnlineRLSRegressor], directory: str) -> None:
+    """Checkpoint every model to <directory>/<asset>.npz"""
+    for asset, model in models.items():
+        model.save(Path(directory) / f"{asset}.npz")
+
+def load_online_models(directory: str) -> Dict[str, OnlineRLSRegressor]:
+    """
+    Load the checkpoints written by save_online_models()
+
+    Returns:
+        Dictionary of asset name to model (empty if the directory does not exist)
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return {}
+    return {path.stem: OnlineRLSRegressor.load(path) for path in sorted(directory.glob('*.npz'))}
@@ -0,0 +1,323 @@
+"""
+Online Statistics Module
+
+This module provides an incremental statistics state that updates per-asset
+return metrics in O(1) per new bar instead of rescanning the full history.
+The state holds Welford-style central moment accumulators, the growth of one
+unit (cumulative product), its running peak for drawdowns, and observation
+counts, and can be persisted to disk between runs.
+
+Rows are consumed in date order and cannot be taken back, so the state also
+keeps a hash of each row consumed in the last REVISION_DAYS before its last
+date, where late values of a lagging asset and restated returns land.
+sync_frame() compares only those rows and rebuilds the state from scratch
+when one of them changed, instead of silently drifting away from the
+full-history figures. Older rows are treated as final.
+
+The metrics match analyze.analyze_returns on the same history, except for the
+quantile-based VaR figures, which cannot be maintained exactly in O(1).
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import hashlib
+import json
+
+# Calendar days before the last processed date checked for late or restated rows
+REVISION_DAYS = 14
+
+def _rows_between(daily_returns_df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Rows with start < date <= end, found by binary search on a sorted index"""
+    index = daily_returns_df.index
+    if not index.is_monotonic_increasing:
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index > start
+        if end is not None:
+            mask &= index <= end
+        return daily_returns_df[mask]
+
+    first = 0 if start is None else index.searchsorted(start, side='right')
+    last = len(index) if end is None else index.searchsorted(end, side='right')
+    return daily_returns_df.iloc[first:last]
+
+def _row_hashes(rows: pd.DataFrame) -> Dict[str, str]:
+    """Hash of the observed (asset, return) pairs of each row, keyed by date"""
+    hashes = {}
+    for date, row in rows.iterrows():
+        observed = sorted((str(asset), float(value)) for asset, value in row.dropna().items())
+        hashes[pd.Timestamp(date).isoformat()] = hashlib.sha256(json.dumps(observed).encode()).hexdigest()
+    return hashes
+
+class OnlineReturnStatistics:
+    """
+    Incrementally updated return statistics for a set of assets
+
+    Each call to update() consumes one row of percentage returns (asset ->
+    return, NaN for no observation) and refreshes every accumulator with a
+    constant amount of work per asset.
+    """
+
+    _STATE_FIELDS = ('count', 'mean', 'm2', 'm3', 'm4', 'growth', 'peak',
+                     'min_drawdown', 'min_return', 'max_return')
+
+    def __init__(self, assets: Optional[List[str]] = None):
+        """
+        Args:
+            assets: Initial asset names; assets seen later are added on the fly
+        """
+        self.assets = []
+        self._index = {}
+        self.last_date = None
+        self.row_hashes = None
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.m3 = np.zeros(0)
+        self.m4 = np.zeros(0)
+        self.growth = np.ones(0)
+        self.peak = np.full(0, np.nan)
+        self.min_drawdown = np.zeros(0)
+        self.min_return = np.full(0, np.inf)
+        self.max_return = np.full(0, -np.inf)
+        if assets:
+            self._add_assets(assets)
+
+    def _add_assets(self, assets: List[str]) -> None:
+        """Append zero-initialized state for new assets"""
+        new_assets = [asset for asset in assets if asset not in self._index]
+        if not new_assets:
+            return
+
+        for asset in new_assets:
+            self._index[asset] = len(self.assets)
+            self.assets.append(asset)
+
+        n = len(new_assets)
+        self.count = np.concatenate([self.count, np.zeros(n, dtype=np.int64)])
+        self.mean = np.concatenate([self.mean, np.zeros(n)])
+        self.m2 = np.concatenate([self.m2, np.zeros(n)])
+        self.m3 = np.concatenate([self.m3, np.zeros(n)])
+        self.m4 = np.concatenate([self.m4, np.zeros(n)])
+        self.growth = np.concatenate([self.growth, np.ones(n)])
+        self.peak = np.concatenate([self.peak, np.full(n, np.nan)])
+        self.min_drawdown = np.concatenate([self.min_drawdown, np.zeros(n)])
+        self.min_return = np.concatenate([self.min_return, np.full(n, np.inf)])
+        self.max_return = np.concatenate([self.max_return, np.full(n, -np.inf)])
+
+    def update(self, new_returns_row: Union[pd.Series, Dict[str, float]]) -> None:
+        """
+        Consume one bar of returns
+
+        Args:
+            new_returns_row: Mapping of asset name to percentage return; NaN
+                values are skipped. A Series name (e.g. from iterrows) is
+                recorded as the last processed date.
+        """
+        row = pd.Series(new_returns_row, dtype=float)
+        self._add_assets(list(row.index))
+
+        positions = np.array([self._index[asset] for asset in row.index], dtype=np.intp)
+        values = row.to_numpy()
+        observed = ~np.isnan(values)
+        positions = positions[observed]
+        x = values[observed]
+
+        if len(x):
+            # Higher-moment update (Terriberry's extension of Welford)
+            n1 = self.count[positions].astype(float)
+            n = n1 + 1
+            mean = self.mean[positions]
+            m2 = self.m2[positions]
+            m3 = self.m3[positions]
+
+            delta = x - mean
+            delta_n = delta / n
+            delta_n2 = delta_n ** 2
+            term1 = delta * delta_n * n1
+
+            self.mean[positions] = mean + delta_n
+            self.m4[positions] += (term1 * delta_n2 * (n * n - 3 * n + 3)
+                                   + 6 * delta_n2 * m2 - 4 * delta_n * m3)
+            self.m3[positions] = m3 + term1 * delta_n * (n - 2) - 3 * delta_n * m2
+            self.m2[positions] = m2 + term1
+            self.count[positions] += 1
+
+            # Extremes
+            self.min_return[positions] = np.minimum(self.min_return[positions], x)
+            self.max_return[positions] = np.maximum(self.max_return[positions], x)
+
+            # Cumulative growth, running peak and drawdown
+            growth = self.growth[positions] * (1 + x / 100)
+            peak = np.fmax(self.peak[positions], growth)
+            self.growth[positions] = growth
+            self.peak[positions] = peak
+            self.min_drawdown[positions] = np.minimum(
+                self.min_drawdown[positions], (growth - peak) / peak
+            )
+
+        if row.name is not None:
+            self.last_date = pd.Timestamp(row.name)
+
+    def update_frame(self, daily_returns_df: pd.DataFrame) -> int:
+        """
+        Consume every row newer than the last processed date
+
+        Args:
+            daily_returns_df: DataFrame with daily returns data (date index)
+
+        Returns:
+            Number of rows applied
+        """
+        self._add_assets(list(daily_returns_df.columns))
+
+        new_rows = _rows_between(daily_returns_df, start=self.last_date)
+        for date, row in new_rows.iterrows():
+            self.update(row)
+        return len(new_rows)
+
+    def _recent_rows(self, daily_returns_df: pd.DataFrame, revision_days: int) -> pd.DataFrame:
+        """Rows in the revision window ending at the last processed date"""
+        start = self.last_date - pd.Timedelta(days=revision_days)
+        return _rows_between(daily_returns_df, start, self.last_date)
+
+    def sync_frame(self, daily_returns_df: pd.DataFrame, revision_days: int = REVISION_DAYS) -> int:
+        """
+        Bring the state in line with a returns history that may have changed
+
+        Rows newer than the last processed date are applied incrementally.
+        If a row in the revision_days before it was added, removed or changed
+        since it was consumed (a late or restated value), the state is
+        rebuilt from the full history. Only those rows are compared, so an
+        unchanged history costs O(new rows + revision window).
+
+        Args:
+            daily_returns_df: DataFrame with daily returns data (date index)
+            revision_days: Calendar days before the last processed date in
+                which rows may still change
+
+        Returns:
+            Number of rows applied
+        """
+        if self.last_date is not None and \
+                self.row_hashes != _row_hashes(self._recent_rows(daily_returns_df, revision_days)):
+            self.__init__(list(daily_returns_df.columns))
+
+        applied = self.update_frame(daily_returns_df)
+        if self.last_date is not None:
+            self.row_hashes = _row_hashes(self._recent_rows(daily_returns_df, revision_days))
+        return applied
+
+    @classmethod
+    def from_returns(cls, daily_returns_df: pd.DataFrame) -> 'OnlineReturnStatistics':
+        """
+        Build the state from a full returns history
+
+        Args:
+            daily_returns_df: DataFrame with daily returns data
+
+        Returns:
+            Initialized statistics state
+        """
+        state = cls(list(daily_returns_df.columns))
+        state.sync_frame(daily_returns_df)
+        return state
+
+    def results(self) -> Dict:
+        """
+        Return the current metrics in the analyze_returns format
+
+        Returns:
+            Dictionary of per-asset metrics (without the quantile VaR figures)
+        """
+        results = {}
+
+        for i, asset in enumerate(self.assets):
+            n = int(self.count[i])
+            if n == 0:
+                continue
+
+            m2, m3, m4 = self.m2[i], self.m3[i], self.m4[i]
+            mean_return = self.mean[i]
+            std_return = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+
+            # Bias-corrected skewness and excess kurtosis (as pandas)
+            if n < 3:
+                skewness = np.nan
+            elif m2 == 0:
+                skewness = 0.0
+            else:
+                skewness = (n * np.sqrt(n - 1) / (n - 2)) * (m3 / m2 ** 1.5)
+
+            if n < 4:
+                kurtosis = np.nan
+            elif m2 == 0:
+                kurtosis = 0.0
+            else:
+                kurtosis = ((n * (n + 1) * (n - 1) * m4) / ((n - 2) * (n - 3) * m2 ** 2)
+                            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+
+            sharpe_ratio = mean_return / std_return if std_return > 0 else 0
+
+            results[asset] = {
+                'mean_return': float(mean_return),
+                'std_return': float(std_return),
+                'annual_volatility': float(std_return * np.sqrt(252)),
+                'min_return': float(self.min_return[i]),
+                'max_return': float(self.max_return[i]),
+                'skewness': float(skewness),
+                'kurtosis': float(kurtosis),
+                'sharpe_ratio': float(sharpe_ratio),
+                'cumulative_return': float((self.growth[i] - 1) * 100),
+                'max_drawdown': float(self.min_drawdown[i] * 100),
+                'count': n
+            }
+
+        return results
+
+    def save(self, path: str) -> None:
+        """
+        Persist the state to disk
+
+        Args:
+            path: Output file (.npz)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            'assets': self.assets,
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+            'row_hashes': self.row_hashes
+        }
+        arrays = {field: getattr(self, field) for field in self._STATE_FIELDS}
+
+        # Write to a temporary file first so a crash never leaves a torn state
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, metadata=np.array(json.dumps(metadata)), **arrays)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'OnlineReturnStatistics':
+        """
+        Load a state written by save()
+
+        Args:
+            path: State file (.npz)
+
+        Returns:
+            Restored statistics state
+        """
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+            state = cls()
+            state.assets = list(metadata['assets'])
+            state._index = {asset: i for i, asset in enumerate(state.assets)}
+            if metadata['last_date'] is not None:
+                state.last_date = pd.Timestamp(metadata['last_date'])
+            state.row_hashes = metadata.get('row_hashes')
+            for field in cls._STATE_FIELDS:
+                setattr(state, field, data[field].copy())
+        return state
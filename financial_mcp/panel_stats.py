@@ -0,0 +1,147 @@
+"""
+Panel Statistics Module
+
+This module provides a NaN-aware NumPy kernel that computes the per-asset
+return statistics used across the package (moments, quantile VaR, cumulative
+return and maximum drawdown) for every column of a returns matrix at once.
+
+Results match the pandas per-column calculations (sample standard deviation,
+bias-corrected skewness and excess kurtosis, linearly interpolated
+quantiles) with missing values skipped column by column.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Union
+
+# Quantiles reported as historical VaR
+VAR_QUANTILES = {
+    'var_95': 0.05,
+    'var_99': 0.01,
+}
+
+def _sorted_quantile(sorted_values: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """
+    Linearly interpolated quantile of each column of a column-sorted array
+
+    NaNs must be sorted to the end of each column, as np.sort does.
+    """
+    result = np.full(sorted_values.shape[1], np.nan)
+    valid = counts > 0
+    if not valid.any():
+        return result
+
+    position = (counts[valid] - 1) * q
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, counts[valid] - 1)
+    fraction = position - lower
+
+    columns = np.flatnonzero(valid)
+    low_values = sorted_values[lower, columns]
+    high_values = sorted_values[upper, columns]
+    result[valid] = low_values + (high_values - low_values) * fraction
+    return result
+
+def var_quantiles(returns: Union[pd.DataFrame, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Historical VaR quantiles of every column of a returns matrix
+
+    Only the sort needed for the quantiles is done, without the moment and
+    drawdown passes of panel_statistics.
+
+    Args:
+        returns: (date x asset) matrix of percentage returns; NaN marks a
+            missing observation
+
+    Returns:
+        Dictionary mapping each VAR_QUANTILES name to an array with one value
+        per column (NaN for columns without observations)
+    """
+    values = np.asarray(returns, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    counts = (~np.isnan(values)).sum(axis=0)
+    sorted_values = np.sort(values, axis=0)
+    return {name: _sorted_quantile(sorted_values, counts, q) for name, q in VAR_QUANTILES.items()}
+
+def panel_statistics(returns: Union[pd.DataFrame, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compute return statistics for every column of a returns matrix
+
+    Args:
+        returns: (date x asset) matrix of percentage returns; NaN marks a
+            missing observation
+
+    Returns:
+        Dictionary mapping metric name to an array with one value per column:
+        count, mean_return, std_return, min_return, max_return, skewness,
+        kurtosis, var_95, var_99, cumulative_return and max_drawdown.
+        Metrics that are undefined for a column (e.g. too few observations)
+        are NaN.
+    """
+    values = np.asarray(returns, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_rows, n_cols = values.shape
+
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    has_data = counts > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Central moments (two passes for numerical stability)
+        mean = np.where(valid, values, 0.0).sum(axis=0) / counts
+        deviations = np.where(valid, values - mean, 0.0)
+        squared = deviations ** 2
+        m2 = squared.sum(axis=0)
+        m3 = (squared * deviations).sum(axis=0)
+        m4 = (squared ** 2).sum(axis=0)
+
+        std = np.where(counts > 1, np.sqrt(m2 / (counts - 1)), np.nan)
+
+        # Bias-corrected sample skewness (as pandas Series.skew)
+        skewness = (counts * np.sqrt(counts - 1) / (counts - 2)) * (m3 / m2 ** 1.5)
+        skewness = np.where(m2 == 0, 0.0, skewness)
+        skewness = np.where(counts < 3, np.nan, skewness)
+
+        # Bias-corrected excess kurtosis (as pandas Series.kurtosis)
+        numerator = counts * (counts + 1) * (counts - 1) * m4
+        denominator = (counts - 2) * (counts - 3) * m2 ** 2
+        adjustment = 3 * (counts - 1) ** 2 / ((counts - 2) * (counts - 3))
+        kurtosis = np.where(denominator == 0, 0.0, numerator / denominator - adjustment)
+        kurtosis = np.where(counts < 4, np.nan, kurtosis)
+
+        # Growth of 1 unit, holding flat over missing observations
+        growth = np.cumprod(np.where(valid, 1 + values / 100, 1.0), axis=0)
+        final_growth = growth[-1] if n_rows else np.ones(n_cols)
+
+        # Drawdown from the running peak of the observed growth path
+        observed_growth = np.where(valid, growth, np.nan)
+        running_peak = np.fmax.accumulate(observed_growth, axis=0)
+        drawdown = np.where(valid, (observed_growth - running_peak) / running_peak, np.inf)
+        max_drawdown = drawdown.min(axis=0, initial=np.inf)
+
+    # Order statistics from one sort (NaNs sort to the end)
+    sorted_values = np.sort(values, axis=0)
+    if n_rows:
+        min_return = sorted_values[0]
+        max_return = sorted_values[np.maximum(counts - 1, 0), np.arange(n_cols)]
+    else:
+        min_return = max_return = np.full(n_cols, np.nan)
+
+    result = {
+        'count': counts,
+        'mean_return': np.where(has_data, mean, np.nan),
+        'std_return': std,
+        'min_return': np.where(has_data, min_return, np.nan),
+        'max_return': np.where(has_data, max_return, np.nan),
+        'skewness': skewness,
+        'kurtosis': kurtosis,
+    }
+    for name, q in VAR_QUANTILES.items():
+        result[name] = _sorted_quantile(sorted_values, counts, q)
+
+    result['cumulative_return'] = np.where(has_data, (final_growth - 1) * 100, np.nan)
+    result['max_drawdown'] = np.where(has_data, max_drawdown * 100, np.nan)
+    return result
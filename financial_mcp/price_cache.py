@@ -0,0 +1,321 @@
+"""
+Price Cache Module
+
+This module provides a persistent on-disk cache of price histories keyed by
+(symbol, interval). Each entry records the date ranges it already holds, so a
+refresh only downloads the missing tail or gaps and merges them into the
+stored history instead of downloading the full history again.
+
+Coverage is only recorded up to the last bar actually received: yfinance
+returns an empty frame (rather than raising) on errors and rate limits, so
+an empty download never marks a range as held and is retried next time.
+
+Prices are stored as downloaded, i.e. adjusted for dividends and splits as
+of the download date. Since only missing ranges are fetched, older bars are
+not re-adjusted after a later dividend or split; set max_age_days to
+re-download an entry's full history once it is that old (or call
+invalidate() after a corporate action).
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import quote
+import json
+import os
+
+import yfinance as yf
+
+# Type of the function used to download missing ranges:
+# downloader(symbol, start_date, end_date, interval) -> DataFrame
+Downloader = Callable[[str, str, str, str], pd.DataFrame]
+
+DEFAULT_CACHE_DIR = "price_cache"
+
+def yahoo_history_downloader(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1d"
+) -> pd.DataFrame:
+    """
+    Download a price history with yf.Ticker(...).history
+
+    Args:
+        symbol: Yahoo Finance ticker symbol
+        start_date: Start date in YYYY-MM-DD format (inclusive)
+        end_date: End date in YYYY-MM-DD format (exclusive)
+        interval: Bar interval (e.g. '1d', '1h')
+
+    Returns:
+        DataFrame of OHLCV data
+    """
+    return yf.Ticker(symbol).history(start=start_date, end=end_date, interval=interval)
+
+def _naive_index(index: pd.Index) -> pd.DatetimeIndex:
+    """Return a timezone-naive copy of a datetime index for date comparisons"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index
+
+def _merge_ranges(ranges: List[Tuple[pd.Timestamp, pd.Timestamp]]) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Coalesce overlapping or adjacent [start, end) ranges"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def missing_ranges(
+    covered: List[Tuple[pd.Timestamp, pd.Timestamp]],
+    start: pd.Timestamp,
+    end: pd.Timestamp
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Compute the parts of [start, end) not contained in the covered ranges
+
+    Args:
+        covered: Sorted, non-overlapping [start, end) ranges already held
+        start: Requested start (inclusive)
+        end: Requested end (exclusive)
+
+    Returns:
+        List of missing [start, end) ranges
+    """
+    gaps = []
+    cursor = start
+    for range_start, range_end in covered:
+        if range_end <= cursor:
+            continue
+        if range_start >= end:
+            break
+        if range_start > cursor:
+            gaps.append((cursor, range_start))
+        cursor = max(cursor, range_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+class PriceCache:
+    """
+    Persistent per-symbol price cache with incremental (delta) refresh
+
+    Each (symbol, interval) entry is stored as a pickled DataFrame next to a
+    small JSON manifest listing the [start, end) date ranges that have been
+    downloaded. Ranges reaching today or later are only recorded up to the
+    start of today, so the current (possibly incomplete) bar is always
+    downloaded again on the next refresh.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        downloader: Optional[Downloader] = None,
+        max_age_days: Optional[float] = None
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the cache files
+            downloader: Function used to download missing ranges
+                (defaults to yf.Ticker(...).history)
+            max_age_days: Re-download an entry's full history when its last
+                full download is older than this, so adjusted prices pick up
+                dividends and splits (None: only ever fetch missing ranges)
+        """
+        if max_age_days is not None and max_age_days <= 0:
+            raise ValueError("max_age_days must be positive")
+        self.cache_dir = Path(cache_dir)
+        self.downloader = downloader or yahoo_history_downloader
+        self.max_age_days = max_age_days
+
+    def _paths(self, symbol: str, interval: str) -> Tuple[Path, Path]:
+        """Return the (data, manifest) paths for a cache entry"""
+        key = f"{quote(symbol, safe='')}__{interval}"
+        return self.cache_dir / f"{key}.pkl", self.cache_dir / f"{key}.json"
+
+    def _load(self, symbol: str, interval: str) -> Tuple[Optional[pd.DataFrame], List, Optional[pd.Timestamp]]:
+        """Load a cache entry, returning (data, covered_ranges, date of the first download)"""
+        data_path, manifest_path = self._paths(symbol, interval)
+        if not data_path.exists() or not manifest_path.exists():
+            return None, [], None
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        covered = [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in manifest['ranges']]
+        created = pd.Timestamp(manifest['created']) if manifest.get('created') else None
+        return pd.read_pickle(data_path), covered, created
+
+    def _store(self, symbol: str, interval: str, data: pd.DataFrame, covered: List,
+               created: pd.Timestamp) -> None:
+        """Atomically write a cache entry"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data_path, manifest_path = self._paths(symbol, interval)
+
+        manifest = {
+            'symbol': symbol,
+            'interval': interval,
+            'created': created.strftime('%Y-%m-%d'),
+            'ranges': [[s.strftime('%Y-%m-%d'), e.strftime('%Y-%m-%d')] for s, e in covered]
+        }
+
+        tmp_data = data_path.with_suffix('.pkl.tmp')
+        tmp_manifest = manifest_path.with_suffix('.json.tmp')
+        data.to_pickle(tmp_data)
+        with open(tmp_manifest, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_manifest, manifest_path)
+
+    def covered_ranges(self, symbol: str, interval: str = "1d") -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Return the [start, end) ranges held for a symbol
+
+        Args:
+            symbol: Ticker symbol
+            interval: Bar interval
+
+        Returns:
+            List of covered date ranges
+        """
+        return self._load(symbol, interval)[1]
+
+    def expired(self, symbol: str, interval: str = "1d") -> bool:
+        """
+        Whether an entry is older than max_age_days and must be downloaded again
+
+        Entries written before creation dates were recorded count as expired.
+        """
+        if self.max_age_days is None:
+            return False
+        data, _, created = self._load(symbol, interval)
+        if data is None:
+            return False
+        return created is None or pd.Timestamp.now() - created > pd.Timedelta(days=self.max_age_days)
+
+    def missing(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "1d"
+    ) -> List[Tuple[str, str]]:
+        """
+        Return the parts of [start_date, end_date) not held in the cache
+
+        An expired entry (see max_age_days) is dropped first, so the whole
+        range is reported missing.
+
+        Args:
+            symbol: Ticker symbol
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            interval: Bar interval
+
+        Returns:
+            List of missing (start_date, end_date) ranges in YYYY-MM-DD format
+        """
+        if self.expired(symbol, interval):
+            self.invalidate(symbol, interval)
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        covered = self._load(symbol, interval)[1]
+        return [
+            (gap_start.strftime('%Y-%m-%d'), gap_end.strftime('%Y-%m-%d'))
+            for gap_start, gap_end in missing_ranges(covered, start, end)
+        ]
+
+    def merge(
+        self,
+        symbol: str,
+        downloads: List[Tuple[str, str, Optional[pd.DataFrame]]],
+        interval: str = "1d"
+    ) -> None:
+        """
+        Merge downloaded ranges into the cache
+
+        A range is only recorded as covered up to the day after its last
+        received bar: an empty download (no bars, or a failed request that
+        yfinance reported as an empty frame) covers nothing and is retried.
+
+        Args:
+            symbol: Ticker symbol
+            downloads: List of (start_date, end_date, data) for each downloaded
+                range; data may be empty or None when the range had no bars
+            interval: Bar interval
+        """
+        if not downloads:
+            return
+
+        today = pd.Timestamp.now().normalize()
+        data, covered, created = self._load(symbol, interval)
+
+        frames = [] if data is None else [data]
+        for start_date, end_date, delta in downloads:
+            if delta is None or delta.empty:
+                continue
+            frames.append(delta)
+            # Never mark beyond the data received, nor today or later, as complete
+            start = pd.Timestamp(start_date).normalize()
+            received = _naive_index(delta.index).max().normalize() + pd.Timedelta(days=1)
+            end = min(pd.Timestamp(end_date).normalize(), received, today)
+            if start < end:
+                covered.append((start, end))
+
+        if frames:
+            data = pd.concat(frames)
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+        else:
+            data = pd.DataFrame()
+        self._store(symbol, interval, data, _merge_ranges(covered), created if created is not None else today)
+
+    def get_history(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        """
+        Return the price history for [start_date, end_date), downloading only
+        the ranges that are not already cached
+
+        Args:
+            symbol: Ticker symbol
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (exclusive)
+            interval: Bar interval
+
+        Returns:
+            DataFrame of price data for the requested range
+        """
+        downloads = [
+            (gap_start, gap_end, self.downloader(symbol, gap_start, gap_end, interval))
+            for gap_start, gap_end in self.missing(symbol, start_date, end_date, interval)
+        ]
+        self.merge(symbol, downloads, interval)
+
+        data = self._load(symbol, interval)[0]
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        index = _naive_index(data.index)
+        return data[(index >= start) & (index < end)].copy()
+
+    def invalidate(self, symbol: str, interval: str = "1d") -> None:
+        """
+        Remove a cache entry so the next request downloads the full range
+
+        Args:
+            symbol: Ticker symbol
+            interval: Bar interval
+        """
+        for path in self._paths(symbol, interval):
+            if path.exists():
+                path.unlink()
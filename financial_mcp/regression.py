@@ -0,0 +1,101 @@
+"""
+Regression Module
+
+This module provides a closed-form, vectorized regression engine that
+computes beta, alpha, R² and p-values for every asset against one or more
+benchmark columns at once. Sums over pairwise-complete observations are
+obtained with a handful of matrix multiplies, so each asset/benchmark pair
+uses exactly the rows where both have data (as a per-pair dropna would).
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from typing import Dict, List, Union
+
+def regress_on_benchmarks(
+    daily_returns_df: pd.DataFrame,
+    benchmarks: Union[str, List[str]]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Regress every asset on each benchmark using pairwise-complete data
+
+    Args:
+        daily_returns_df: DataFrame with daily returns data
+        benchmarks: Benchmark column name(s)
+
+    Returns:
+        Dictionary mapping benchmark name to a DataFrame indexed by asset with
+        columns beta, alpha, r_squared, p_value and n_obs (the results of
+        scipy.stats.linregress(benchmark, asset) on the overlapping rows).
+        Pairs with fewer than two overlapping rows or a constant benchmark
+        are NaN; for a constant asset, beta and alpha are defined but
+        r_squared and p_value are NaN (as linregress).
+    """
+    if isinstance(benchmarks, str):
+        benchmarks = [benchmarks]
+
+    missing = [b for b in benchmarks if b not in daily_returns_df.columns]
+    if missing:
+        raise ValueError(
+            f"Benchmark(s) not found in returns data: {missing}. "
+            f"Available columns: {list(daily_returns_df.columns)}"
+        )
+
+    values = daily_returns_df.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+
+    # Shift by column means for numerical stability (regression is shift invariant)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.where(valid, values, 0.0).sum(axis=0) / valid.sum(axis=0)
+    centers = np.nan_to_num(centers)
+
+    y = np.where(valid, values - centers, 0.0)
+    mask = valid.astype(float)
+
+    bench_positions = [daily_returns_df.columns.get_loc(b) for b in benchmarks]
+    x = y[:, bench_positions]
+    x_mask = mask[:, bench_positions]
+
+    # Pairwise sums, shape (n_assets, n_benchmarks)
+    n = mask.T @ x_mask
+    sum_x = mask.T @ x
+    sum_y = y.T @ x_mask
+    sum_xx = mask.T @ (x ** 2)
+    sum_yy = (y ** 2).T @ x_mask
+    sum_xy = y.T @ x
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = sum_x / n
+        mean_y = sum_y / n
+        ssx = sum_xx - sum_x * mean_x
+        ssy = sum_yy - sum_y * mean_y
+        sxy = sum_xy - sum_x * mean_y
+
+        beta = sxy / ssx
+        alpha = (mean_y + centers[:, None]) - beta * (mean_x + centers[bench_positions][None, :])
+
+        r = np.clip(sxy / np.sqrt(ssx * ssy), -1.0, 1.0)
+        # Zero-variance asset: correlation undefined
+        r = np.where(ssy > 0, r, np.nan)
+
+        # Two-sided t-test on the slope, as scipy.stats.linregress
+        dof = n - 2
+        t_stat = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p_value = 2 * stats.t.sf(np.abs(t_stat), np.maximum(dof, 1))
+        p_value = np.where(dof == 0, 0.0, p_value)
+
+    undefined = (n < 2) | ~(ssx > 0)
+    results = {}
+    for j, benchmark in enumerate(benchmarks):
+        frame = pd.DataFrame({
+            'beta': beta[:, j],
+            'alpha': alpha[:, j],
+            'r_squared': r[:, j] ** 2,
+            'p_value': p_value[:, j],
+            'n_obs': n[:, j].astype(int),
+        }, index=daily_returns_df.columns)
+        frame.loc[undefined[:, j], ['beta', 'alpha', 'r_squared', 'p_value']] = np.nan
+        results[benchmark] = frame
+
+    return results
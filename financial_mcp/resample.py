@@ -0,0 +1,106 @@
+"""
+Resampling Module
+
+This module compounds daily percentage returns into weekly, monthly,
+quarterly or yearly period returns for every asset of a panel at once.
+Daily returns are turned into log growth factors, summed per period with a
+single grouped reduction and converted back, instead of running a Python
+lambda for each period of each asset. Period statistics (best, worst,
+average, volatility) are derived from the compounded result.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from typing import Dict, Union
+
+# Period frequencies and the pandas aliases for their period ends (newest first)
+FREQUENCY_ALIASES = {
+    'W': ('W',),
+    'M': ('ME', 'M'),
+    'Q': ('QE', 'Q'),
+    'Y': ('YE', 'A'),
+}
+
+def resample_rule(freq: str) -> str:
+    """
+    Resolve a period frequency to a rule understood by the installed pandas
+
+    Args:
+        freq: 'W', 'M', 'Q', 'Y' or any pandas offset alias
+
+    Returns:
+        Offset alias for DataFrame.resample
+    """
+    for alias in FREQUENCY_ALIASES.get(freq.upper(), (freq,)):
+        try:
+            to_offset(alias)
+            return alias
+        except ValueError:
+            continue
+    raise ValueError(f"Unsupported resampling frequency '{freq}'. Choose from: {', '.join(FREQUENCY_ALIASES)}")
+
+def compound_returns(
+    daily_returns: Union[pd.DataFrame, pd.Series, Dict[str, pd.Series]],
+    freq: str = 'M'
+) -> pd.DataFrame:
+    """
+    Compound daily percentage returns into period returns
+
+    Matches resample(freq).apply(lambda x: (1 + x/100).prod() - 1) * 100 on
+    each asset's own history: missing days are skipped, periods without
+    observations inside an asset's history compound to 0, and periods before
+    its first or after its last observation are NaN.
+
+    Args:
+        daily_returns: (date x asset) percentage returns, a single Series or
+            a dictionary of per-asset Series
+        freq: 'W', 'M', 'Q', 'Y' or any pandas offset alias
+
+    Returns:
+        DataFrame of period returns (percent) indexed by period end
+    """
+    if isinstance(daily_returns, dict):
+        daily_returns = pd.DataFrame(daily_returns)
+    elif isinstance(daily_returns, pd.Series):
+        daily_returns = daily_returns.to_frame()
+
+    rule = resample_rule(freq)
+    values = daily_returns.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+
+    with np.errstate(divide='ignore'):
+        log_growth = np.where(valid, np.log1p(np.where(valid, values, 0.0) / 100), 0.0)
+
+    index = pd.DatetimeIndex(daily_returns.index)
+    period_log_growth = pd.DataFrame(log_growth, index=index, columns=daily_returns.columns).resample(rule).sum()
+    counts = pd.DataFrame(valid, index=index, columns=daily_returns.columns).resample(rule).sum()
+
+    # Periods between each asset's first and last observation
+    observed = counts.to_numpy() > 0
+    active = np.logical_and.accumulate(~observed, axis=0)
+    active |= np.logical_and.accumulate(~observed[::-1], axis=0)[::-1]
+
+    period_returns = np.expm1(period_log_growth.to_numpy()) * 100
+    period_returns[active] = np.nan
+    return pd.DataFrame(period_returns, index=period_log_growth.index, columns=daily_returns.columns)
+
+def period_statistics(period_returns: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize compounded period returns for every asset
+
+    Args:
+        period_returns: Output of compound_returns
+
+    Returns:
+        DataFrame indexed by asset with columns best, worst, average,
+        volatility, positive_periods and total_periods
+    """
+    return pd.DataFrame({
+        'best': period_returns.max(),
+        'worst': period_returns.min(),
+        'average': period_returns.mean(),
+        'volatility': period_returns.std(),
+        'positive_periods': (period_returns > 0).sum(),
+        'total_periods': period_returns.notna().sum(),
+    })
@@ -0,0 +1,450 @@
+"""
+Result Cache Module
+
+This module shares computed results between processes. RedisCache stores
+serialized values in Redis with TTLs, so several API workers and the
+refresh worker read one computed state instead of each recomputing it;
+LRUCache is the in-process fallback used when Redis is not configured,
+not installed or not reachable (and while a Redis outage lasts).
+
+SharedSnapshotStore publishes API snapshots through a cache under version
+keys. The writer (the process running the pipeline jobs) stores every
+endpoint body of a new snapshot, then moves the latest-version pointer;
+followers (the other API workers) adopt the newest snapshot from the cache
+and only compute one themselves when the cache holds none. All processes
+serve the same snapshot versions.
+
+Follower computations are single-flight: concurrent refreshes in a process
+share one computation (financial_mcp.single_flight), and across processes
+the worker holding the snapshot:lock key computes while the others wait for
+its snapshot (and keep serving the one they have if it does not arrive in
+time). The lock holds a random token and is only released by its owner, so
+a computation outliving the lock never frees another worker's lock.
+
+A cached snapshot older than CACHE_STALE_AFTER (the writer stopped
+publishing) is still served while one worker recomputes in the background
+(stale-while-revalidate), so no request waits on a recomputation and a
+traffic spike never triggers more than one.
+
+Keys:
+    snapshot:counter               last snapshot version handed out
+    snapshot:lock                  token of the follower computing a snapshot
+    snapshot:latest                {"version": N, "built_at": t}
+    snapshot:<N>:<endpoint>        JSON body of one endpoint
+
+Settings are read from the environment:
+    REDIS_URL              Redis connection URL (default: in-process cache only)
+    CACHE_TTL              seconds cached results live (default 3600)
+    CACHE_POLL_INTERVAL    seconds between follower checks for a new snapshot (default 5)
+    CACHE_STALE_AFTER      age (seconds) after which followers revalidate a snapshot (default 900)
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+from .single_flight import SingleFlight
+from .snapshot import SNAPSHOT_ENDPOINTS, Snapshot, SnapshotStore, empty_payloads
+
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_POLL_INTERVAL = 5
+DEFAULT_STALE_AFTER = 900
+
+# Seconds a follower may hold the computation lock (longer than a snapshot load)
+DEFAULT_LOCK_TTL = 120
+
+# Seconds between checks for the snapshot of the follower holding the lock
+LOCK_POLL_INTERVAL = 0.1
+
+# Entries kept by the in-process cache
+DEFAULT_MAX_ENTRIES = 256
+
+# Prefix of every Redis key written by this module
+DEFAULT_KEY_PREFIX = 'financial_mcp:'
+
+def cache_settings(environ: Optional[Mapping[str, str]] = None) -> Dict:
+    """
+    Result cache settings from environment variables
+
+    Args:
+        environ: Environment mapping (default: os.environ)
+
+    Returns:
+        Dictionary with redis_url (None when unset), cache_ttl,
+        poll_interval and stale_after (seconds)
+    """
+    environ = os.environ if environ is None else environ
+    settings = {
+        'redis_url': environ.get('REDIS_URL') or None,
+        'cache_ttl': float(environ.get('CACHE_TTL', DEFAULT_CACHE_TTL)),
+        'poll_interval': float(environ.get('CACHE_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)),
+        'stale_after': float(environ.get('CACHE_STALE_AFTER', DEFAULT_STALE_AFTER))
+    }
+    for name in ('cache_ttl', 'poll_interval', 'stale_after'):
+        if settings[name] <= 0:
+            raise ValueError(f"{name} must be positive, got {settings[name]}")
+    return settings
+
+class LRUCache:
+    """
+    Thread-safe in-process cache of byte values with TTLs and an LRU bound
+    """
+
+    backend = 'lru'
+    shared = False
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: Optional[float] = DEFAULT_CACHE_TTL):
+        """
+        Args:
+            max_entries: Maximum number of entries; the least recently used go first
+            default_ttl: Seconds an entry lives unless set() says otherwise (None: forever)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expiry(self, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.monotonic() + ttl if ttl is not None else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value for ttl seconds (default: default_ttl)"""
+        with self._lock:
+            self._entries[key] = (value, self._expiry(ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set_many(self, values: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        for key, value in values.items():
+            self.set(key, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Store a value only if the key is absent (or expired)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                return False
+            self._entries[key] = (value, self._expiry(ttl))
+            self._entries.move_to_end(key)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_if(self, key: str, value: bytes) -> bool:
+        """Delete the key only if it still holds value (compare-and-delete)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != value or (entry[1] is not None and entry[1] <= time.monotonic()):
+                return False
+            del self._entries[key]
+            return True
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Increment an integer counter (created at 0, never expires)"""
+        with self._lock:
+            value, _ = self._entries.get(key, (b'0', None))
+            value = int(value) + amount
+            self._entries[key] = (str(value).encode(), None)
+            self._entries.move_to_end(key)
+            return value
+
+class RedisCache:
+    """
+    Cache of byte values in Redis, shared by every process using the same server
+
+    Redis errors never reach the caller: the operation is served by an
+    in-process LRUCache instead, and Redis is used again once it answers.
+    """
+
+    backend = 'redis'
+    shared = True
+
+    def __init__(self, client, prefix: str = DEFAULT_KEY_PREFIX, default_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 fallback: Optional[LRUCache] = None):
+        """
+        Args:
+            client: redis.Redis client (or a compatible one, e.g. fakeredis)
+            prefix: Prefix of every key
+            default_ttl: Seconds an entry lives unless set() says otherwise (None: forever)
+            fallback: Cache used while Redis is unavailable (default: a new LRUCache)
+        """
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.fallback = fallback if fallback is not None else LRUCache(default_ttl=default_ttl)
+        self.available = True
+
+    def _call(self, operation: Callable, fallback: Callable):
+        from redis.exceptions import RedisError
+
+        try:
+            result = operation()
+        except (RedisError, OSError) as e:
+            if self.available:
+                print(f"⚠️  Redis unavailable, using the in-process cache: {e}")
+                self.available = False
+            return fallback()
+        if not self.available:
+            print("✅ Redis available again")
+            self.available = True
+        return result
+
+    def _ttl_ms(self, ttl: Optional[float]) -> Optional[int]:
+        ttl = self.default_ttl if ttl is None else ttl
+        return max(1, int(ttl * 1000)) if ttl is not None else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._call(lambda: self.client.get(self.prefix + key), lambda: self.fallback.get(key))
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return self._call(lambda: self.client.mget([self.prefix + key for key in keys]),
+                          lambda: self.fallback.get_many(keys))
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._call(lambda: self.client.set(self.prefix + key, value, px=self._ttl_ms(ttl)),
+                   lambda: self.fallback.set(key, value, ttl))
+
+    def set_many(self, values: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        """Store several values in one transaction"""
+        def operation():
+            pipeline = self.client.pipeline(transaction=True)
+            for key, value in values.items():
+                pipeline.set(self.prefix + key, value, px=self._ttl_ms(ttl))
+            pipeline.execute()
+
+        self._call(operation, lambda: self.fallback.set_many(values, ttl))
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Store a value only if the key is absent (SET NX)"""
+        return self._call(lambda: bool(self.client.set(self.prefix + key, value, px=self._ttl_ms(ttl), nx=True)),
+                          lambda: self.fallback.add(key, value, ttl))
+
+    def delete(self, key: str) -> None:
+        self._call(lambda: self.client.delete(self.prefix + key), lambda: self.fallback.delete(key))
+
+    def delete_if(self, key: str, value: bytes) -> bool:
+        """Delete the key only if it still holds value (WATCH/MULTI compare-and-delete)"""
+        from redis.exceptions import WatchError
+
+        name = self.prefix + key
+
+        def operation():
+            with self.client.pipeline() as pipeline:
+                try:
+                    pipeline.watch(name)
+                    if pipeline.get(name) != value:
+                        pipeline.unwatch()
+                        return False
+                    pipeline.multi()
+                    pipeline.delete(name)
+                    pipeline.execute()
+                    return True
+                except WatchError:
+                    # Rewritten between the check and the delete: no longer ours
+                    return False
+
+        return self._call(operation, lambda: self.fallback.delete_if(key, value))
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self._call(lambda: int(self.client.incr(self.prefix + key, amount)),
+                          lambda: self.fallback.incr(key, amount))
+
+def connect_cache(redis_url: Optional[str] = None, default_ttl: float = DEFAULT_CACHE_TTL, prefix: str = DEFAULT_KEY_PREFIX):
+    """
+    Redis-backed cache when Redis is configured and reachable, else an in-process LRU
+
+    Args:
+        redis_url: Redis connection URL (e.g. redis://redis:6379/0); None uses
+            the in-process cache
+        default_ttl: Seconds cached values live
+        prefix: Prefix of every Redis key
+
+    Returns:
+        RedisCache or LRUCache
+    """
+    if redis_url:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+            client.ping()
+            print(f"✅ Sharing results through Redis at {redis_url}")
+            return RedisCache(client, prefix=prefix, default_ttl=default_ttl)
+        except ImportError:
+            print("⚠️  redis not installed, using the in-process cache")
+        except Exception as e:
+            print(f"⚠️  Redis at {redis_url} not reachable, using the in-process cache: {e}")
+    return LRUCache(default_ttl=default_ttl)
+
+class SharedSnapshotStore(SnapshotStore):
+    """
+    Snapshot store publishing its snapshots through a result cache
+
+    The writer computes snapshots with the loader and stores them; followers
+    adopt the newest stored snapshot on refresh() and only run the loader
+    when the cache holds no snapshot (e.g. before the writer's first
+    publication, or after every stored snapshot expired), one worker at a
+    time, or in the background when the stored snapshot is stale.
+    """
+
+    def __init__(self, loader: Callable[[], Dict], cache, ttl: Optional[float] = None, follower: bool = False,
+                 namespace: str = 'snapshot', stale_after: Optional[float] = None,
+                 lock_ttl: float = DEFAULT_LOCK_TTL):
+        """
+        Args:
+            loader: Function returning a fresh dictionary of endpoint payloads
+            cache: LRUCache or RedisCache
+            ttl: Seconds stored snapshots live (default: the cache's default_ttl)
+            follower: Adopt the writer's snapshots instead of computing them
+            namespace: Prefix of the snapshot keys
+            stale_after: Age (seconds) from which a follower recomputes the
+                snapshot in the background while serving it (None: never)
+            lock_ttl: Seconds a follower may hold the computation lock
+        """
+        super().__init__(loader)
+        self.cache = cache
+        self.ttl = ttl
+        self.follower = follower
+        self.namespace = namespace
+        self.stale_after = stale_after
+        self.lock_ttl = lock_ttl
+        self.flight = SingleFlight()
+
+    def _key(self, *parts) -> str:
+        return ':'.join((self.namespace,) + tuple(str(part) for part in parts))
+
+    def _next_version(self) -> int:
+        version = self.cache.incr(self._key('counter'))
+        if version <= self._snapshot.version:
+            # The cache lost its counter (e.g. Redis restarted): never go backwards
+            version = self.cache.incr(self._key('counter'), self._snapshot.version + 1 - version)
+        return version
+
+    def publish(self, payloads: Dict) -> Snapshot:
+        """
+        Build a snapshot from payloads, store it in the cache and make it current
+
+        Returns:
+            The published snapshot
+        """
+        with self._lock:
+            merged = empty_payloads()
+            merged.update(payloads)
+            snapshot = Snapshot.build(merged, self._next_version())
+            self.cache.set_many({self._key(snapshot.version, endpoint): body
+                                 for endpoint, body in snapshot.bodies.items()}, self.ttl)
+            # Bodies first, pointer last: a reader that sees the pointer finds every body
+            pointer = json.dumps({'version': snapshot.version, 'built_at': snapshot.built_at}).encode()
+            self.cache.set(self._key('latest'), pointer, self.ttl)
+            return self._install(snapshot)
+
+    def cached_snapshot(self) -> Optional[Snapshot]:
+        """Newest snapshot in the cache, or None when none is stored (or it expired)"""
+        pointer = self.cache.get(self._key('latest'))
+        if pointer is None:
+            return None
+        latest = json.loads(pointer)
+        version = latest['version']
+        if version == self._snapshot.version:
+            return self._snapshot
+        bodies = self.cache.get_many([self._key(version, endpoint) for endpoint in SNAPSHOT_ENDPOINTS])
+        if any(body is None for body in bodies):
+            return None
+        return Snapshot.from_bodies(dict(zip(SNAPSHOT_ENDPOINTS, bodies)), version, latest['built_at'])
+
+    def sync(self) -> Optional[Snapshot]:
+        """
+        Adopt the newest cached snapshot if it is newer than the current one
+
+        Returns:
+            The current snapshot, or None when the cache holds no snapshot
+        """
+        with self._lock:
+            snapshot = self.cached_snapshot()
+            if snapshot is None:
+                return None
+            if snapshot.version > self._snapshot.version:
+                self._install(snapshot)
+            return self._snapshot
+
+    def _compute_shared(self) -> Snapshot:
+        """
+        Compute and publish a snapshot unless another process is already doing it
+
+        Returns:
+            The new snapshot, the one published by the worker holding the
+            lock, or the current one if that worker did not publish within
+            lock_ttl (never a second concurrent computation)
+        """
+        start_version = self._snapshot.version
+        lock_key = self._key('lock')
+        token = secrets.token_hex(16).encode()
+        deadline = time.monotonic() + self.lock_ttl
+        while not self.cache.add(lock_key, token, self.lock_ttl):
+            if time.monotonic() >= deadline:
+                print("⚠️  No snapshot from the worker computing it, serving the current one")
+                return self._snapshot
+            # Another worker is computing: wait for its snapshot
+            time.sleep(LOCK_POLL_INTERVAL)
+            snapshot = self.sync()
+            if snapshot is not None and snapshot.version > start_version:
+                return snapshot
+        try:
+            # Loaded without the store lock: sync() keeps serving meanwhile
+            return self.publish(self.loader())
+        finally:
+            # Only our own lock: it may have expired and been taken by another worker
+            self.cache.delete_if(lock_key, token)
+
+    def is_stale(self, snapshot: Snapshot) -> bool:
+        return self.stale_after is not None and time.time() - snapshot.built_at > self.stale_after
+
+    def refresh(self) -> Snapshot:
+        """
+        Writer: load and publish fresh payloads
+
+        Follower: adopt the cached snapshot. Without one, compute it (a
+        single computation across concurrent callers and processes); when it
+        is stale, or expired from the cache while this process still serves
+        it, return it and revalidate in the background.
+        """
+        if not self.follower:
+            with self._lock:
+                return self.publish(self.loader())
+        snapshot = self.sync()
+        if snapshot is None:
+            if self._snapshot.version == 0:
+                return self.flight.do('compute', self._compute_shared)
+            snapshot = self._snapshot
+            self.flight.start('compute', self._compute_shared)
+        elif self.is_stale(snapshot):
+            self.flight.start('compute', self._compute_shared)
+        return snapshot
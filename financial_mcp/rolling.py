@@ -0,0 +1,334 @@
+"""
+Rolling Analytics Module
+
+This module computes rolling (windowed) analytics for every asset and many
+window lengths at once: rolling mean, volatility, Sharpe ratio, beta and
+correlation against a benchmark, and historical VaR. Windowed sums come from
+cumulative sums shared by all window lengths, and VaR from sliding-window
+views, so no window is re-aggregated from scratch.
+
+Windows count each asset's own observations (as rolling over the asset's
+dropna() series), which keeps assets with different trading calendars (e.g.
+stocks and crypto) comparable. Results are stored as a
+(window x date x asset x metric) array that plots and the dashboard can load
+instead of recomputing.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Sequence
+import json
+
+DEFAULT_WINDOWS = (30, 90, 252)
+
+ROLLING_METRICS = ('mean', 'volatility', 'sharpe', 'beta', 'correlation', 'var_95')
+
+# Element budget for one block of sliding windows in the VaR computation
+_VAR_BLOCK_ELEMENTS = 16_000_000
+
+def _pack(values: np.ndarray, mask: np.ndarray):
+    """
+    Move each column's observations (where mask is True) to the top, in order
+
+    Returns:
+        Tuple of (packed values with NaN tail, permutation used, counts)
+    """
+    order = np.argsort(~mask, axis=0, kind='stable')
+    packed = np.take_along_axis(values, order, axis=0)
+    counts = mask.sum(axis=0)
+    packed[np.arange(len(values))[:, None] >= counts] = np.nan
+    return packed, order, counts
+
+def _unpack(packed_result: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Scatter packed per-observation results back to their original rows"""
+    result = np.empty_like(packed_result)
+    np.put_along_axis(result, order, packed_result, axis=0)
+    return result
+
+def _cumsum0(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum along rows with a leading zero row"""
+    out = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+def _window_sum(cumsum: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window sums from a leading-zero cumulative sum (NaN before a full window)"""
+    n_rows = cumsum.shape[0] - 1
+    out = np.full((n_rows,) + cumsum.shape[1:], np.nan)
+    if window <= n_rows:
+        out[window - 1:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+def _rolling_quantile(packed: np.ndarray, window: int, q: float) -> np.ndarray:
+    """Trailing window quantile of each column (NaN if the window has a gap)"""
+    n_rows, n_cols = packed.shape
+    out = np.full((n_rows, n_cols), np.nan)
+    if window > n_rows:
+        return out
+
+    block = max(1, _VAR_BLOCK_ELEMENTS // ((n_rows - window + 1) * window))
+    for start in range(0, n_cols, block):
+        columns = slice(start, start + block)
+        windows = np.lib.stride_tricks.sliding_window_view(packed[:, columns], window, axis=0)
+        out[window - 1:, columns] = np.quantile(windows, q, axis=-1)
+    return out
+
+class RollingAnalytics:
+    """
+    Rolling analytics stored as a (window x date x asset x metric) array
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        dates: pd.DatetimeIndex,
+        assets: List[str],
+        windows: List[int],
+        metrics: List[str],
+        benchmark: Optional[str] = None
+    ):
+        """
+        Args:
+            values: Array of shape (window, date, asset, metric)
+            dates: Date index
+            assets: Asset names
+            windows: Window lengths
+            metrics: Metric names
+            benchmark: Benchmark used for beta and correlation
+        """
+        self.values = values
+        self.dates = pd.DatetimeIndex(dates)
+        self.assets = list(assets)
+        self.windows = [int(w) for w in windows]
+        self.metrics = list(metrics)
+        self.benchmark = benchmark
+
+    def get(self, metric: str, window: int) -> pd.DataFrame:
+        """
+        Return one metric for one window length as a (date x asset) frame
+
+        Args:
+            metric: Metric name
+            window: Window length
+
+        Returns:
+            DataFrame of the metric
+        """
+        values = self.values[self.windows.index(window), :, :, self.metrics.index(metric)]
+        return pd.DataFrame(np.asarray(values), index=self.dates, columns=self.assets)
+
+    def save(self, output_dir: str, stem: str = "rolling_analytics") -> Path:
+        """
+        Save the array (.npy, memory-mappable) and its labels (.json)
+
+        Args:
+            output_dir: Output directory
+            stem: File name without extension
+
+        Returns:
+            Path of the array file
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        array_file = output_path / f"{stem}.npy"
+        np.save(array_file, self.values)
+
+        metadata = {
+            'shape': ['window', 'date', 'asset', 'metric'],
+            'dates': [d.strftime('%Y-%m-%d') for d in self.dates],
+            'assets': self.assets,
+            'windows': self.windows,
+            'metrics': self.metrics,
+            'benchmark': self.benchmark,
+        }
+        with open(output_path / f"{stem}.json", 'w') as f:
+            json.dump(metadata, f, indent=2)
+        return array_file
+
+    @classmethod
+    def load(cls, input_dir: str, stem: str = "rolling_analytics", mmap: bool = True) -> Optional['RollingAnalytics']:
+        """
+        Load rolling analytics written by save()
+
+        Args:
+            input_dir: Input directory
+            stem: File name without extension
+            mmap: Memory-map the array instead of reading it into memory
+
+        Returns:
+            RollingAnalytics, or None if the files do not exist
+        """
+        input_path = Path(input_dir)
+        array_file = input_path / f"{stem}.npy"
+        metadata_file = input_path / f"{stem}.json"
+        if not array_file.exists() or not metadata_file.exists():
+            return None
+
+        with open(metadata_file) as f:
+            metadata = json.load(f)
+        values = np.load(array_file, mmap_mode='r' if mmap else None)
+        return cls(
+            values,
+            pd.to_datetime(metadata['dates']),
+            metadata['assets'],
+            metadata['windows'],
+            metadata['metrics'],
+            metadata.get('benchmark')
+        )
+
+def rolling_analytics(
+    daily_returns_df: pd.DataFrame,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    benchmark: Optional[str] = None,
+    var_quantile: float = 0.05,
+    dtype=np.float64
+) -> RollingAnalytics:
+    """
+    Compute rolling analytics for every asset and window length
+
+    Args:
+        daily_returns_df: DataFrame with daily returns data
+        windows: Window lengths in observations
+        benchmark: Benchmark column for beta and correlation (default: first asset)
+        var_quantile: Quantile used for historical VaR (0.05 -> var_95)
+        dtype: dtype of the output array (e.g. np.float32 to halve its size)
+
+    Returns:
+        RollingAnalytics with metrics mean, volatility, sharpe, beta,
+        correlation and var_XX. Values are placed on the date of the window's
+        last observation; dates on which an asset has no observation are NaN.
+    """
+    windows = [int(w) for w in windows]
+    if benchmark is None:
+        benchmark = daily_returns_df.columns[0]
+    if benchmark not in daily_returns_df.columns:
+        raise ValueError(f"Benchmark not found in returns data: {benchmark}")
+
+    var_metric = f"var_{int(round((1 - var_quantile) * 100))}"
+    metrics = list(ROLLING_METRICS[:-1]) + [var_metric]
+
+    values = daily_returns_df.to_numpy(dtype=float)
+    n_rows, n_cols = values.shape
+    valid = ~np.isnan(values)
+
+    # Center each column (moments are shift invariant) for accurate cumsums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.nan_to_num(np.where(valid, values, 0.0).sum(axis=0) / valid.sum(axis=0))
+    centered = values - centers
+
+    # Per-asset observation windows
+    packed, order, counts = _pack(centered, valid)
+    filled = np.nan_to_num(packed)
+    cum_x = _cumsum0(filled)
+    cum_xx = _cumsum0(filled ** 2)
+
+    # Pairwise windows against the benchmark (rows where both are observed)
+    bench_position = daily_returns_df.columns.get_loc(benchmark)
+    bench = np.broadcast_to(centered[:, [bench_position]], (n_rows, n_cols))
+    pair_mask = valid & valid[:, [bench_position]]
+    pair_x, pair_order, _ = _pack(centered, pair_mask)
+    pair_b = np.take_along_axis(bench, pair_order, axis=0)
+    pair_b = np.where(np.isnan(pair_x), np.nan, pair_b)
+    pair_x, pair_b = np.nan_to_num(pair_x), np.nan_to_num(pair_b)
+    cum_px = _cumsum0(pair_x)
+    cum_pb = _cumsum0(pair_b)
+    cum_pxx = _cumsum0(pair_x ** 2)
+    cum_pbb = _cumsum0(pair_b ** 2)
+    cum_pxb = _cumsum0(pair_x * pair_b)
+
+    # Packed rows at or beyond an asset's observation count hold no window
+    packed_rows = np.arange(n_rows)[:, None]
+    pair_counts = pair_mask.sum(axis=0)
+
+    result = np.full((len(windows), n_rows, n_cols, len(metrics)), np.nan, dtype=dtype)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for w_index, window in enumerate(windows):
+            in_range = packed_rows < counts
+            sum_x = _window_sum(cum_x, window)
+            sum_xx = _window_sum(cum_xx, window)
+            mean = sum_x / window
+            variance = np.maximum(sum_xx - sum_x * mean, 0.0) / (window - 1)
+            volatility = np.sqrt(variance)
+            var = _rolling_quantile(packed, window, var_quantile)
+
+            packed_metrics = {
+                'mean': mean + centers,
+                'volatility': volatility,
+                'sharpe': np.where(volatility > 0, (mean + centers) / volatility, 0.0),
+                var_metric: var + centers,
+            }
+            for name, metric_values in packed_metrics.items():
+                metric_values = np.where(in_range, metric_values, np.nan)
+                result[w_index, :, :, metrics.index(name)] = _unpack(metric_values, order)
+
+            # Beta and correlation on pairwise-complete windows
+            pair_in_range = packed_rows < pair_counts
+            s_x = _window_sum(cum_px, window)
+            s_b = _window_sum(cum_pb, window)
+            ss_x = _window_sum(cum_pxx, window) - s_x * s_x / window
+            ss_b = _window_sum(cum_pbb, window) - s_b * s_b / window
+            s_xb = _window_sum(cum_pxb, window) - s_x * s_b / window
+
+            beta = np.where(ss_b > 0, s_xb / ss_b, np.nan)
+            correlation = np.clip(s_xb / np.sqrt(ss_x * ss_b), -1.0, 1.0)
+            for name, metric_values in (('beta', beta), ('correlation', correlation)):
+                metric_values = np.where(pair_in_range, metric_values, np.nan)
+                result[w_index, :, :, metrics.index(name)] = _unpack(metric_values, pair_order)
+
+    return RollingAnalytics(
+        result, daily_returns_df.index, list(daily_returns_df.columns), windows, metrics, benchmark
+    )
+
+def rolling_correlation_matrix(
+    daily_returns_df: pd.DataFrame,
+    window: int,
+    min_periods: Optional[int] = None
+) -> np.ndarray:
+    """
+    Rolling pairwise correlation matrices over trailing windows of rows
+
+    Unlike rolling_analytics, windows count rows of the frame (as
+    DataFrame.rolling), not each asset's own observations. Intended for
+    small universes: the result holds one full matrix per date.
+
+    Args:
+        daily_returns_df: DataFrame with daily returns data
+        window: Window length in rows
+        min_periods: Minimum pairwise-complete observations (default: window)
+
+    Returns:
+        Array of shape (date, asset, asset), matching
+        daily_returns_df.rolling(window, min_periods).corr()
+    """
+    min_periods = window if min_periods is None else min_periods
+    values = daily_returns_df.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.nan_to_num(np.where(valid, values, 0.0).sum(axis=0) / valid.sum(axis=0))
+    x = np.where(valid, values - centers, 0.0)
+    m = valid.astype(float)
+
+    # Windowed sums of pairwise products, shape (date, asset, asset)
+    def windowed(products):
+        cumsum = _cumsum0(products)
+        start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+        return cumsum[1:] - cumsum[start]
+
+    n = windowed(m[:, :, None] * m[:, None, :])
+    s_x = windowed(x[:, :, None] * m[:, None, :])
+    s_y = np.swapaxes(s_x, 1, 2)
+    s_xx = windowed((x ** 2)[:, :, None] * m[:, None, :])
+    s_yy = np.swapaxes(s_xx, 1, 2)
+    s_xy = windowed(x[:, :, None] * x[:, None, :])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = s_xy - s_x * s_y / n
+        var_x = s_xx - s_x ** 2 / n
+        var_y = s_yy - s_y ** 2 / n
+        correlation = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+
+    correlation[n < max(min_periods, 2)] = np.nan
+    return correlation
@@ -0,0 +1,193 @@
+"""
+Scheduler Module
+
+This module runs the recurring pipeline jobs (incremental fetch, incremental
+analytics, model retraining) in background worker threads on interval
+triggers, backed by APScheduler. Each job runs at most once at a time: a run
+that comes due while the previous one is still going is skipped and counted
+instead of stacking up, and missed runs are coalesced into one. Every job
+keeps timing metrics (runs, failures, skips, last/mean/max duration, last
+error) for monitoring.
+
+Settings are read from the environment:
+    REFRESH_INTERVAL      seconds between incremental refreshes (default 300)
+    MODEL_RETRAIN_HOURS   hours between full retrains (default 24)
+    MODEL_KEEP_VERSIONS   model versions kept on disk after a retrain (default 5)
+    MAX_HISTORY_DAYS      trailing window of the VaR, correlations and risk
+                          metrics (default 365)
+"""
+
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, Mapping, Optional
+
+DEFAULT_REFRESH_INTERVAL = 300
+DEFAULT_MODEL_RETRAIN_HOURS = 24
+DEFAULT_MAX_HISTORY_DAYS = 365
+DEFAULT_MODEL_KEEP_VERSIONS = 5
+
+def scheduler_settings(environ: Optional[Mapping[str, str]] = None) -> Dict[str, float]:
+    """
+    Scheduler settings from environment variables
+
+    Args:
+        environ: Environment mapping (default: os.environ)
+
+    Returns:
+        Dictionary with refresh_interval (seconds), model_retrain_hours,
+        max_history_days and model_keep_versions
+    """
+    environ = os.environ if environ is None else environ
+    settings = {
+        'refresh_interval': float(environ.get('REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)),
+        'model_retrain_hours': float(environ.get('MODEL_RETRAIN_HOURS', DEFAULT_MODEL_RETRAIN_HOURS)),
+        'max_history_days': int(environ.get('MAX_HISTORY_DAYS', DEFAULT_MAX_HISTORY_DAYS)),
+        'model_keep_versions': int(environ.get('MODEL_KEEP_VERSIONS', DEFAULT_MODEL_KEEP_VERSIONS))
+    }
+    for name, value in settings.items():
+        if value <= 0:
+            raise ValueError(f"{name} must be positive, got {value}")
+    return settings
+
+@dataclass
+class JobMetrics:
+    """
+    Timing metrics of one scheduled job
+    """
+
+    name: str
+    interval_seconds: Optional[float]
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    running: bool = False
+    last_started: Optional[str] = None
+    last_finished: Optional[str] = None
+    last_duration: Optional[float] = None
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_error: Optional[str] = None
+
+    def as_dict(self) -> Dict:
+        """Metrics with the mean duration of completed runs"""
+        metrics = asdict(self)
+        metrics['mean_duration'] = self.total_duration / self.runs if self.runs else None
+        return metrics
+
+class JobScheduler:
+    """
+    Interval job runner with overlap protection and per-job metrics
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, JobMetrics] = {}
+        self._jobs = {}
+        self._locks = {}
+        self._metrics_lock = threading.Lock()
+        self._scheduler = None
+
+    def add_job(self, name: str, func: Callable[[], object], interval_seconds: Optional[float] = None,
+                run_at_start: bool = False) -> None:
+        """
+        Register a job
+
+        Args:
+            name: Job name (unique)
+            func: Function run by the job, called without arguments
+            interval_seconds: Seconds between runs; None registers a job that
+                only runs when triggered with run_job (e.g. by another job)
+            run_at_start: Also run the job as soon as the scheduler starts
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job '{name}' is already registered")
+        if interval_seconds is not None and interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self._jobs[name] = (func, interval_seconds, run_at_start)
+        self._locks[name] = threading.Lock()
+        self.metrics[name] = JobMetrics(name, interval_seconds)
+
+    def run_job(self, name: str) -> bool:
+        """
+        Run a job now in the calling thread, unless it is already running
+
+        Failures are recorded in the metrics, not raised.
+
+        Returns:
+            True if the job ran and succeeded
+        """
+        lock = self._locks[name]
+        if not lock.acquire(blocking=False):
+            with self._metrics_lock:
+                self.metrics[name].skipped += 1
+            return False
+
+        metrics = self.metrics[name]
+        try:
+            with self._metrics_lock:
+                metrics.running = True
+                metrics.last_started = datetime.now().isoformat()
+            start = time.perf_counter()
+            error = None
+            try:
+                self._jobs[name][0]()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+            duration = time.perf_counter() - start
+
+            with self._metrics_lock:
+                metrics.running = False
+                metrics.last_finished = datetime.now().isoformat()
+                metrics.last_duration = duration
+                metrics.runs += 1
+                metrics.total_duration += duration
+                metrics.max_duration = max(metrics.max_duration, duration)
+                if error is not None:
+                    metrics.failures += 1
+                metrics.last_error = error
+            return error is None
+        finally:
+            lock.release()
+
+    def _on_max_instances(self, event) -> None:
+        """A run came due while the previous run was still going"""
+        if event.job_id in self.metrics:
+            with self._metrics_lock:
+                self.metrics[event.job_id].skipped += 1
+
+    def start(self) -> None:
+        """Start running the jobs in background threads"""
+        from apscheduler.events import EVENT_JOB_MAX_INSTANCES
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        if self._scheduler is not None:
+            return
+        scheduler = BackgroundScheduler(job_defaults={'max_instances': 1, 'coalesce': True})
+        for name, (_, interval_seconds, run_at_start) in self._jobs.items():
+            if interval_seconds is None:
+                continue
+            options = {'next_run_time': datetime.now()} if run_at_start else {}
+            scheduler.add_job(self.run_job, 'interval', seconds=interval_seconds, args=[name],
+                              id=name, name=name, misfire_grace_time=None, **options)
+        scheduler.add_listener(self._on_max_instances, EVENT_JOB_MAX_INSTANCES)
+        scheduler.start()
+        self._scheduler = scheduler
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop scheduling jobs (running jobs finish unless the process exits)"""
+        if self._scheduler is not None:
+            self._scheduler.shutdown(wait=wait)
+            self._scheduler = None
+
+    @property
+    def running(self) -> bool:
+        return self._scheduler is not None
+
+    def job_metrics(self) -> Dict[str, Dict]:
+        """Dictionary of job name to its metrics"""
+        with self._metrics_lock:
+            return {name: metrics.as_dict() for name, metrics in self.metrics.items()}
@@ -0,0 +1,98 @@
+"""
+Single-Flight Module
+
+This module coalesces concurrent computations of the same result. While a
+computation for a key is in flight, further callers asking for that key
+wait for it and share its result (or its exception) instead of starting
+their own, so a burst of cache misses costs one computation rather than
+one per caller. start() runs a computation in a background thread unless
+one is already in flight, which is how stale results are revalidated
+while they keep being served.
+"""
+
+import threading
+import traceback
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """One in-flight computation"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Thread-safe per-key coalescing of concurrent computations
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run func for key, or wait for the run already in flight
+
+        Args:
+            key: Identity of the result
+            func: Computation, called without arguments
+
+        Returns:
+            Result of the single run (its exception is raised to every caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def start(self, key: Hashable, func: Callable[[], Any]) -> bool:
+        """
+        Run func for key in a background thread unless a run is already in flight
+
+        Failures are printed, not raised.
+
+        Returns:
+            True if a background run was started
+        """
+        if self.in_flight(key):
+            return False
+
+        def run():
+            try:
+                self.do(key, func)
+            except Exception:
+                traceback.print_exc()
+
+        threading.Thread(target=run, name=f'single-flight-{key}', daemon=True).start()
+        return True
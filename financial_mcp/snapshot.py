@@ -0,0 +1,514 @@
+"""
+Snapshot Module
+
+This module turns the outputs of the data pipeline (enhanced price data,
+feature matrices, analysis results, correlation matrix, risk metrics,
+registered and online models) into the payloads served by the API: prices,
+predictions, correlations, alerts, opportunities, market sentiment and risk
+metrics. Everything, including model inference on the latest feature rows,
+is computed once per refresh.
+
+A Snapshot holds the payloads together with their pre-serialized JSON bodies
+and ETags and is never modified after it is built. SnapshotStore publishes a
+new snapshot by swapping a single reference, so request handlers read a
+consistent snapshot without locks, disk access or serialization. Subscribers
+are notified of every publication; snapshot_delta() gives the entries that
+changed between two snapshots, which is what push clients receive.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from .storage import find_frame, load_frame
+
+# Payloads served by the API (/api/<endpoint>)
+SNAPSHOT_ENDPOINTS = (
+    'prices', 'predictions', 'correlations', 'alerts',
+    'opportunities', 'market-sentiment', 'risk-metrics'
+)
+
+# Analysis output directories, in order of preference
+DEFAULT_ANALYSIS_DIRS = ('analysis_results', 'financial_data')
+
+# Days of price history per asset in the prices payload
+DEFAULT_HISTORY_DAYS = 30
+
+# Window (bars) of the recent volatility and the traditional momentum forecast
+LOOKBACK_DAYS = 20
+
+# Daily move (%) that raises a price alert
+MOVE_ALERT_THRESHOLD = 3.0
+
+# Recent / long-run volatility ratio that raises a volatility alert
+VOLATILITY_ALERT_RATIO = 1.5
+
+# Predicted next-day return (%) that counts as a trading signal
+SIGNAL_THRESHOLD = 0.5
+
+# Mean predicted return (%) separating bullish / neutral / bearish
+SENTIMENT_THRESHOLD = 0.1
+
+# Payloads keyed by asset, diffed entry by entry (others are replaced whole)
+KEYED_ENDPOINTS = ('prices', 'predictions', 'correlations')
+
+def _plain(value):
+    """Plain JSON types (numpy scalars, timestamps, non-finite floats as null)"""
+    if isinstance(value, Mapping):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+def serialize(payload) -> bytes:
+    """Compact UTF-8 JSON body of a payload"""
+    return json.dumps(_plain(payload), separators=(',', ':'), allow_nan=False).encode()
+
+def empty_payloads() -> Dict[str, Any]:
+    """Payloads served before the first refresh"""
+    return {
+        'prices': {},
+        'predictions': {},
+        'correlations': {},
+        'alerts': [],
+        'opportunities': [],
+        'market-sentiment': {'sentiment': 'neutral', 'score': 0.0, 'advancing': 0, 'declining': 0},
+        'risk-metrics': {}
+    }
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Immutable set of served payloads with their JSON bodies and ETags
+    """
+
+    version: int
+    built_at: float
+    payloads: Mapping[str, Any]
+    bodies: Mapping[str, bytes]
+    etags: Mapping[str, str]
+
+    @classmethod
+    def build(cls, payloads: Dict[str, Any], version: int, built_at: Optional[float] = None) -> 'Snapshot':
+        """
+        Serialize payloads into a snapshot
+
+        Args:
+            payloads: Dictionary of endpoint name to payload
+            version: Snapshot version number
+            built_at: Build time (epoch seconds, default: now)
+
+        Returns:
+            Snapshot
+        """
+        bodies = {endpoint: serialize(payload) for endpoint, payload in payloads.items()}
+        return cls._assemble(payloads, bodies, version, built_at)
+
+    @classmethod
+    def from_bodies(cls, bodies: Dict[str, bytes], version: int, built_at: Optional[float] = None) -> 'Snapshot':
+        """
+        Rebuild a snapshot from its serialized JSON bodies (e.g. read from a cache)
+
+        Args:
+            bodies: Dictionary of endpoint name to JSON body
+            version: Snapshot version number
+            built_at: Build time (epoch seconds, default: now)
+
+        Returns:
+            Snapshot with the same bodies and ETags as the one serialized
+        """
+        payloads = {endpoint: json.loads(body) for endpoint, body in bodies.items()}
+        return cls._assemble(payloads, dict(bodies), version, built_at)
+
+    @classmethod
+    def _assemble(cls, payloads, bodies, version, built_at) -> 'Snapshot':
+        # Content-based ETags stay valid across versions when a payload is unchanged
+        etags = {endpoint: '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                 for endpoint, body in bodies.items()}
+        return cls(
+            version=version,
+            built_at=time.time() if built_at is None else built_at,
+            payloads=MappingProxyType(dict(payloads)),
+            bodies=MappingProxyType(bodies),
+            etags=MappingProxyType(etags)
+        )
+
+class SnapshotStore:
+    """
+    Holder of the current snapshot, replaced atomically on refresh
+    """
+
+    def __init__(self, loader: Callable[[], Dict[str, Any]]):
+        """
+        Args:
+            loader: Function returning a fresh dictionary of endpoint payloads
+        """
+        self.loader = loader
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._snapshot = Snapshot.build(empty_payloads(), version=0)
+
+    def subscribe(self, listener: Callable[[Snapshot, Snapshot], None]) -> None:
+        """
+        Call listener(previous, published) after every publication
+
+        Listeners run in the publishing thread, in publication order, and
+        must not block.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    @property
+    def current(self) -> Snapshot:
+        """Latest published snapshot (readers take no lock)"""
+        return self._snapshot
+
+    def publish(self, payloads: Dict[str, Any]) -> Snapshot:
+        """
+        Build and publish a snapshot from payloads
+
+        Endpoints missing from payloads keep their empty payload.
+
+        Returns:
+            The published snapshot
+        """
+        with self._lock:
+            merged = empty_payloads()
+            merged.update(payloads)
+            return self._install(Snapshot.build(merged, self._snapshot.version + 1))
+
+    def _install(self, snapshot: Snapshot) -> Snapshot:
+        """Make snapshot current and notify the listeners (lock held by the caller)"""
+        # A single reference assignment: readers see the old or the new snapshot, never a mix
+        previous, self._snapshot = self._snapshot, snapshot
+        for listener in self._listeners:
+            try:
+                listener(previous, snapshot)
+            except Exception as e:
+                print(f"⚠️  Snapshot listener failed: {e}")
+        return snapshot
+
+    def refresh(self) -> Snapshot:
+        """Load fresh payloads and publish them"""
+        with self._lock:
+            return self.publish(self.loader())
+
+def snapshot_message(snapshot: Snapshot) -> bytes:
+    """
+    Full-state push message, assembled from the pre-serialized bodies
+
+    {"type": "snapshot", "version": N, "data": {endpoint: payload}}
+    """
+    data = b','.join(b'"%s":%s' % (endpoint.encode(), body) for endpoint, body in snapshot.bodies.items())
+    return b'{"type":"snapshot","version":%d,"data":{%s}}' % (snapshot.version, data)
+
+def snapshot_delta(base: Snapshot, snapshot: Snapshot) -> Dict[str, Any]:
+    """
+    Changes from one snapshot to another
+
+    Only endpoints whose ETag changed are included. Keyed payloads (prices,
+    predictions, correlations) give {'changed': {key: entry}, 'removed': [key]};
+    other payloads are included whole.
+
+    Args:
+        base: Snapshot the receiver already has
+        snapshot: New snapshot
+
+    Returns:
+        Dictionary of endpoint name to change (empty if nothing changed)
+    """
+    delta = {}
+    for endpoint, etag in snapshot.etags.items():
+        if base.etags.get(endpoint) == etag:
+            continue
+        new, old = snapshot.payloads[endpoint], base.payloads.get(endpoint)
+        if endpoint in KEYED_ENDPOINTS and isinstance(new, Mapping) and isinstance(old, Mapping):
+            delta[endpoint] = {
+                'changed': {key: entry for key, entry in new.items()
+                            if key not in old or serialize(old[key]) != serialize(entry)},
+                'removed': [key for key in old if key not in new]
+            }
+        else:
+            delta[endpoint] = new
+    return delta
+
+def delta_message(base: Snapshot, snapshot: Snapshot) -> Optional[bytes]:
+    """
+    Delta push message, or None when nothing changed
+
+    {"type": "delta", "version": N, "base_version": M, "changes": snapshot_delta(...)}
+    """
+    delta = snapshot_delta(base, snapshot)
+    if not delta:
+        return None
+    return serialize({'type': 'delta', 'version': snapshot.version,
+                      'base_version': base.version, 'changes': delta})
+
+def _read_frames(directory: Path, suffix: str) -> Dict[str, pd.DataFrame]:
+    """Dictionary of asset name to <asset><suffix> CSV frames (tz-naive date index) in a directory"""
+    frames = {}
+    for path in sorted(Path(directory).glob(f'*{suffix}')):
+        frame = load_frame(path, parse_dates=True)
+        if not frame.empty:
+            frames[path.name[:-len(suffix)]] = frame
+    return frames
+
+def _read_json(path: Path) -> Dict:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def price_payload(all_data: Dict[str, pd.DataFrame], history_days: int = DEFAULT_HISTORY_DAYS) -> Dict:
+    """
+    Latest price, daily change, volatility and recent history per asset
+
+    Args:
+        all_data: Dictionary of asset name to enhanced data (Close, Daily_Return)
+        history_days: Number of most recent days in each history
+
+    Returns:
+        Dictionary of asset name to price summary
+    """
+    prices = {}
+    for asset, data in all_data.items():
+        data = data.dropna(subset=['Close'])
+        if data.empty:
+            continue
+        returns = data['Daily_Return'] if 'Daily_Return' in data else data['Close'].pct_change() * 100
+        recent = data.tail(history_days)
+        prices[asset] = {
+            'date': data.index[-1].strftime('%Y-%m-%d'),
+            'current': float(data['Close'].iloc[-1]),
+            'change': float(returns.iloc[-1]),
+            'volatility': float(returns.tail(LOOKBACK_DAYS).std()),
+            'long_run_volatility': float(returns.std()),
+            'history': [
+                {'date': date.strftime('%Y-%m-%d'), 'price': float(price), 'return': float(ret)}
+                for date, price, ret in zip(recent.index, recent['Close'], returns.reindex(recent.index))
+            ]
+        }
+    return prices
+
+def model_predictions(registry, features: Dict[str, pd.DataFrame]) -> Dict[str, float]:
+    """
+    Next-day return predictions of the latest registered models
+
+    Per-asset models predict their asset's latest feature row; a pooled model
+    predicts the latest rows of all its assets in one batched call.
+
+    Args:
+        registry: ModelRegistry
+        features: Dictionary of asset name to feature matrix
+
+    Returns:
+        Dictionary of asset name to predicted next-day return (%)
+    """
+    from .training import POOLED_MODEL_NAME, predict_pooled
+
+    registry.refresh()
+    if registry.latest_version is None:
+        return {}
+
+    predictions = {}
+    for name in registry.models():
+        try:
+            model_data = registry.get(name)
+            if name == POOLED_MODEL_NAME:
+                latest = {asset: features[asset].iloc[[-1]]
+                          for asset in model_data['assets'] if asset in features}
+                for asset, y_pred in predict_pooled(model_data, latest).items():
+                    predictions[asset] = float(y_pred[0])
+            elif name in features:
+                row = features[name][model_data['features']].iloc[[-1]].to_numpy(dtype=float)
+                predictions[name] = float(registry.get_predictor(name)(row)[0])
+        except (ImportError, KeyError, ValueError) as e:
+            print(f"⚠️  Skipping predictions of model {name}: {e}")
+    return predictions
+
+def online_predictions(models: Dict, features: Dict[str, pd.DataFrame]) -> Dict[str, float]:
+    """Predictions of online models for each asset's latest feature row"""
+    predictions = {}
+    for asset, model in models.items():
+        if asset in features and set(model.columns) <= set(features[asset].columns):
+            predictions[asset] = float(model.predict(features[asset][model.columns].iloc[[-1]])[0])
+    return predictions
+
+def prediction_payload(
+    prices: Dict,
+    ai: Dict[str, float],
+    online: Dict[str, float],
+    all_data: Dict[str, pd.DataFrame],
+    directional_accuracy: Dict[str, float],
+    model_version: Optional[int] = None
+) -> Dict:
+    """
+    Combined predictions per asset
+
+    'traditional' is the mean daily return over the last LOOKBACK_DAYS bars;
+    'confidence' is the walk-forward directional accuracy of the asset's model.
+    """
+    predictions = {}
+    for asset in prices:
+        data = all_data[asset]
+        returns = data['Daily_Return'].dropna() if 'Daily_Return' in data else pd.Series(dtype=float)
+        predictions[asset] = {
+            'ai': ai.get(asset),
+            'online': online.get(asset),
+            'traditional': float(returns.tail(LOOKBACK_DAYS).mean()) if len(returns) else None,
+            'confidence': directional_accuracy.get(asset),
+            'model_version': model_version
+        }
+    return predictions
+
+def _signal(prediction: Dict) -> Optional[float]:
+    """Preferred forecast of a prediction entry (model, then online, then momentum)"""
+    for key in ('ai', 'online', 'traditional'):
+        value = prediction.get(key)
+        if value is not None and np.isfinite(value):
+            return value
+    return None
+
+def alert_payload(prices: Dict, predictions: Dict) -> List[Dict]:
+    """Large moves, volatility spikes and strong model signals"""
+    alerts = []
+    for asset, price in prices.items():
+        change = price['change']
+        if np.isfinite(change) and abs(change) >= MOVE_ALERT_THRESHOLD:
+            direction = 'up' if change > 0 else 'down'
+            alerts.append({'asset': asset, 'type': 'large_move', 'severity': 'high',
+                           'message': f"{asset} moved {direction} {abs(change):.2f}% on {price['date']}"})
+
+        ratio = price['volatility'] / price['long_run_volatility'] if price['long_run_volatility'] > 0 else np.nan
+        if np.isfinite(ratio) and ratio >= VOLATILITY_ALERT_RATIO:
+            alerts.append({'asset': asset, 'type': 'volatility_spike', 'severity': 'medium',
+                           'message': f"{asset} {LOOKBACK_DAYS}-day volatility is {ratio:.1f}x its long-run level"})
+
+        ai = predictions.get(asset, {}).get('ai')
+        if ai is not None and np.isfinite(ai) and abs(ai) >= SIGNAL_THRESHOLD:
+            direction = 'gain' if ai > 0 else 'loss'
+            alerts.append({'asset': asset, 'type': 'strong_signal', 'severity': 'low',
+                           'message': f"AI model predicts a {abs(ai):.2f}% {direction} for {asset}"})
+    return alerts
+
+def opportunity_payload(predictions: Dict) -> List[Dict]:
+    """Assets with a predicted move of at least SIGNAL_THRESHOLD, strongest first"""
+    opportunities = []
+    for asset, prediction in predictions.items():
+        signal = _signal(prediction)
+        if signal is None or abs(signal) < SIGNAL_THRESHOLD:
+            continue
+        opportunities.append({
+            'asset': asset,
+            'prediction': signal,
+            'direction': 'long' if signal > 0 else 'short',
+            'confidence': prediction.get('confidence')
+        })
+    return sorted(opportunities, key=lambda item: -abs(item['prediction']))
+
+def sentiment_payload(prices: Dict, predictions: Dict) -> Dict:
+    """Mean forecast across assets and market breadth of the latest bar"""
+    signals = [signal for signal in map(_signal, predictions.values()) if signal is not None]
+    score = float(np.mean(signals)) if signals else 0.0
+    if score > SENTIMENT_THRESHOLD:
+        sentiment = 'bullish'
+    elif score < -SENTIMENT_THRESHOLD:
+        sentiment = 'bearish'
+    else:
+        sentiment = 'neutral'
+    changes = [price['change'] for price in prices.values() if np.isfinite(price['change'])]
+    return {
+        'sentiment': sentiment,
+        'score': score,
+        'advancing': sum(change > 0 for change in changes),
+        'declining': sum(change < 0 for change in changes)
+    }
+
+def correlation_payload(correlation: Optional[pd.DataFrame], all_data: Dict[str, pd.DataFrame]) -> Dict:
+    """Nested {asset: {asset: correlation}}; computed from the daily returns when no matrix was saved"""
+    if correlation is None:
+        returns = pd.DataFrame({asset: data['Daily_Return'] for asset, data in all_data.items()
+                                if 'Daily_Return' in data})
+        if returns.empty:
+            return {}
+        correlation = returns.corr()
+    return {str(row): {str(column): value for column, value in values.items()}
+            for row, values in correlation.to_dict(orient='index').items()}
+
+def load_payloads(
+    enhanced_dir: str = 'enhanced_data',
+    model_dir: str = 'models',
+    analysis_dirs: Sequence[str] = DEFAULT_ANALYSIS_DIRS,
+    registry=None,
+    history_days: int = DEFAULT_HISTORY_DAYS
+) -> Dict[str, Any]:
+    """
+    Build every endpoint payload from the pipeline outputs on disk
+
+    Args:
+        enhanced_dir: Directory of <asset>_enhanced_data.csv and <asset>_features.csv
+        model_dir: Model registry directory (also holds online/ and backtest_folds.csv)
+        analysis_dirs: Candidate directories of analyze outputs; the first
+            one holding analysis_results.json is used
+        registry: ModelRegistry to reuse across refreshes (keeps compiled
+            predictors warm); opened on model_dir when None
+        history_days: Days of price history per asset
+
+    Returns:
+        Dictionary of endpoint name to payload
+    """
+    from .online_model import load_online_models
+
+    all_data = _read_frames(enhanced_dir, '_enhanced_data.csv')
+    features = _read_frames(enhanced_dir, '_features.csv')
+    model_dir = Path(model_dir)
+
+    analysis_dir = next((Path(d) for d in analysis_dirs if (Path(d) / 'analysis_results.json').exists()), None)
+    analysis, risk, correlation = {}, {}, None
+    if analysis_dir is not None:
+        analysis = _read_json(analysis_dir / 'analysis_results.json')
+        risk = _read_json(analysis_dir / 'risk_metrics.json')
+        correlation_file = find_frame(analysis_dir, ['correlation_matrix'])
+        if correlation_file is not None:
+            correlation = load_frame(correlation_file)
+
+    ai, model_version = {}, None
+    if (model_dir / 'manifest.json').exists():
+        if registry is None:
+            from .model_registry import ModelRegistry
+            registry = ModelRegistry(model_dir)
+        ai = model_predictions(registry, features)
+        model_version = registry.latest_version
+    online = online_predictions(load_online_models(model_dir / 'online'), features)
+
+    directional_accuracy = {}
+    folds_file = model_dir / 'backtest_folds.csv'
+    if folds_file.exists():
+        folds = pd.read_csv(folds_file)
+        if {'asset', 'directional_accuracy'} <= set(folds.columns):
+            directional_accuracy = folds.groupby('asset')['directional_accuracy'].mean().to_dict()
+
+    prices = price_payload(all_data, history_days)
+    predictions = prediction_payload(prices, ai, online, all_data, directional_accuracy, model_version)
+    return {
+        'prices': prices,
+        'predictions': predictions,
+        'correlations': correlation_payload(correlation, all_data),
+        'alerts': alert_payload(prices, predictions),
+        'opportunities': opportunity_payload(predictions),
+        'market-sentiment': sentiment_payload(prices, predictions),
+        'risk-metrics': {'assets': analysis, **risk}
+    }
@@ -0,0 +1,174 @@
+"""
+Storage Module
+
+This module provides a pluggable storage layer for pipeline artifacts
+(per-asset price files, combined returns, correlation matrices). Frames can
+be written as CSV or in the columnar Parquet and Feather (Arrow) formats,
+which preserve dtypes and load without re-parsing text and dates.
+
+Parquet and Feather require the optional pyarrow dependency.
+"""
+
+import re
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+
+# File extension for each supported format
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+SUPPORTED_FORMATS = tuple(FORMAT_EXTENSIONS.keys())
+DEFAULT_FORMAT = 'csv'
+
+# Preference among equally recent files when no format is requested:
+# columnar files load fastest
+_SEARCH_ORDER = ('parquet', 'feather', 'csv')
+
+# UTC offset after a time of day, e.g. the '-05:00' of '2024-03-08 00:00:00-05:00'
+_UTC_OFFSET = re.compile(r'(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)(?:[+-]\d{2}:\d{2}|Z)$')
+
+def naive_datetime_index(index: pd.Index) -> pd.DatetimeIndex:
+    """
+    Timezone-naive DatetimeIndex in local wall-clock time
+
+    Yahoo's Ticker.history frames have a tz-aware index. Written to CSV, a
+    history spanning a DST change holds mixed UTC offsets, which
+    pd.read_csv(parse_dates=True) leaves as strings. The offsets are dropped
+    (not converted to UTC) so daily bars stay at midnight of their trading
+    day, aligned with tz-naive yf.download frames and 24/7 crypto bars.
+
+    Args:
+        index: DatetimeIndex (tz-aware or naive) or index of date strings
+
+    Returns:
+        Timezone-naive DatetimeIndex
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        values = pd.Index(index).astype(str).str.replace(_UTC_OFFSET, r'\1', regex=True)
+        index = pd.DatetimeIndex(pd.to_datetime(values, format='ISO8601'), name=index.name)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index
+
+def _check_format(file_format: str) -> None:
+    """Validate a storage format name and its dependencies"""
+    if file_format not in FORMAT_EXTENSIONS:
+        raise ValueError(
+            f"Unsupported format '{file_format}'. Expected one of: {list(SUPPORTED_FORMATS)}"
+        )
+    if file_format != 'csv':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                f"The {file_format} format requires pyarrow. "
+                "Install it with: pip install financial-mcp[storage]"
+            )
+
+def format_from_path(path: Path) -> str:
+    """
+    Infer the storage format from a file extension
+
+    Args:
+        path: File path
+
+    Returns:
+        Format name
+    """
+    suffix = Path(path).suffix.lower()
+    for file_format, extension in FORMAT_EXTENSIONS.items():
+        if suffix == extension:
+            return file_format
+    raise ValueError(f"Unknown storage format for file: {path}")
+
+def save_frame(
+    df: pd.DataFrame,
+    output_path: Path,
+    stem: str,
+    file_format: str = DEFAULT_FORMAT
+) -> Path:
+    """
+    Save a DataFrame (including its index) in the requested format
+
+    Args:
+        df: DataFrame to save
+        output_path: Output directory
+        stem: File name without extension
+        file_format: One of SUPPORTED_FORMATS
+
+    Returns:
+        Path of the written file
+    """
+    _check_format(file_format)
+    filepath = Path(output_path) / f"{stem}{FORMAT_EXTENSIONS[file_format]}"
+
+    if file_format == 'csv':
+        df.to_csv(filepath)
+    elif file_format == 'parquet':
+        df.to_parquet(filepath)
+    else:
+        # Feather stores plain columns only, so keep the index as a column
+        df.reset_index().to_feather(filepath)
+
+    return filepath
+
+def load_frame(filepath: Path, parse_dates: bool = False) -> pd.DataFrame:
+    """
+    Load a DataFrame written by save_frame
+
+    Args:
+        filepath: File to load; the format is inferred from its extension
+        parse_dates: Parse the index of CSV files as timezone-naive dates
+            (see naive_datetime_index)
+
+    Returns:
+        Loaded DataFrame
+    """
+    file_format = format_from_path(filepath)
+    _check_format(file_format)
+
+    if file_format == 'csv':
+        df = pd.read_csv(filepath, index_col=0)
+        if parse_dates:
+            df.index = naive_datetime_index(df.index)
+        return df
+    if file_format == 'parquet':
+        return pd.read_parquet(filepath)
+
+    df = pd.read_feather(filepath)
+    df = df.set_index(df.columns[0])
+    if df.index.name == 'index':
+        df.index.name = None
+    return df
+
+def find_frame(
+    input_path: Path,
+    stems: List[str],
+    file_format: Optional[str] = None
+) -> Optional[Path]:
+    """
+    Find the first existing file among candidate names
+
+    Args:
+        input_path: Directory to search
+        stems: Candidate file names without extension, in order of preference
+        file_format: Restrict the search to one format; None searches all
+            formats and takes the most recently written file of a stem, so a
+            stale file left by a run in another format never shadows a fresh one
+
+    Returns:
+        Path of the file found, or None
+    """
+    formats = [file_format] if file_format else list(_SEARCH_ORDER)
+    for stem in stems:
+        candidates = [Path(input_path) / f"{stem}{FORMAT_EXTENSIONS[candidate_format]}"
+                      for candidate_format in formats]
+        candidates = [filepath for filepath in candidates if filepath.exists()]
+        if candidates:
+            # max() keeps the first (columnar) file among equal modification times
+            return max(candidates, key=lambda filepath: filepath.stat().st_mtime_ns)
+    return None
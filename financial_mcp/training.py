@@ -0,0 +1,354 @@
+"""
+Model Training Module
+
+This module trains the per-asset next-day return models used by
+EnhancedDataFetcher on a process pool. Each asset's training arrays are
+written once to .npy files that workers open memory-mapped and read-only, so
+feature matrices are never pickled to the workers, and every model is fitted
+single-threaded so the process pool is the only level of parallelism. The
+regressor comes from a pluggable backend (see model_backends).
+
+The pooled mode instead fits a single model on the stacked panel of all
+assets, with an asset identifier and one-hot asset-class columns appended to
+the features, so the whole universe is one file to store and load and one
+batched predict to serve.
+
+scikit-learn is imported when training runs, so the package itself does not
+depend on it.
+"""
+
+import math
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .model_backends import DEFAULT_BACKEND, get_backend, fit_model, predict
+
+DEFAULT_TEST_SIZE = 0.2
+MIN_TRAINING_ROWS = 100
+
+# One model per asset, or one model on the stacked panel of all assets
+TRAINING_MODES = ('per_asset', 'pooled')
+POOLED_MODEL_NAME = 'pooled'
+ASSET_ID_COLUMN = 'asset_id'
+
+def build_training_set(
+    features: pd.DataFrame,
+    data: pd.DataFrame,
+    target_column: str = 'Daily_Return'
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Align a feature matrix with its next-day return target
+
+    Args:
+        features: Feature matrix of one asset (date index)
+        data: Raw data of the asset containing the target column
+        target_column: Column whose next-day value is predicted
+
+    Returns:
+        Tuple of (features, target) restricted to rows where every feature
+        is finite and the target is known
+    """
+    target = data[target_column].shift(-1).reindex(features.index)
+    valid = np.isfinite(features.to_numpy(dtype=float)).all(axis=1) & target.notna().to_numpy()
+    return features[valid], target[valid]
+
+def chronological_split(n_samples: int, test_size: float = DEFAULT_TEST_SIZE) -> int:
+    """
+    Number of training rows of an unshuffled train/test split
+
+    Matches train_test_split(shuffle=False): the test set holds
+    ceil(test_size * n_samples) rows at the end.
+    """
+    return n_samples - math.ceil(test_size * n_samples)
+
+def _save_arrays(X: pd.DataFrame, y: pd.Series, directory: str, name: str) -> Tuple[str, str]:
+    """Write one training set to .npy files that workers open memory-mapped"""
+    x_path = Path(directory) / f"{name}_X.npy"
+    y_path = Path(directory) / f"{name}_y.npy"
+    np.save(x_path, X.to_numpy(dtype=float))
+    np.save(y_path, np.asarray(y, dtype=float))
+    return str(x_path), str(y_path)
+
+def _train_asset(task):
+    """Fit and evaluate one asset's model from its memory-mapped arrays"""
+    asset, x_path, y_path, columns, test_size, random_state, backend = task
+    try:
+        from sklearn.metrics import mean_squared_error, r2_score
+
+        X = np.load(x_path, mmap_mode='r')
+        y = np.load(y_path, mmap_mode='r')
+        split = chronological_split(len(X), test_size)
+
+        # Single-threaded: parallelism comes from the process pool
+        model, scaler = fit_model(X[:split], y[:split], columns, random_state, backend, n_threads=1)
+        y_pred = predict(model, scaler, X[split:], columns)
+        performance = {
+            'r2_score': float(r2_score(y[split:], y_pred)),
+            'rmse': float(np.sqrt(mean_squared_error(y[split:], y_pred))),
+            'training_samples': int(split),
+            'test_samples': int(len(X) - split)
+        }
+        return asset, {'model': model, 'scaler': scaler, 'backend': backend}, performance, None
+    except Exception as e:
+        return asset, None, None, str(e)
+
+def train_asset_models(
+    training_sets: Dict[str, Tuple[pd.DataFrame, pd.Series]],
+    test_size: float = DEFAULT_TEST_SIZE,
+    n_jobs: Optional[int] = None,
+    random_state: int = 42,
+    backend: str = DEFAULT_BACKEND
+) -> Tuple[Dict, Dict, Dict]:
+    """
+    Train one model per asset in parallel
+
+    Args:
+        training_sets: Dictionary of asset name to (features, target)
+        test_size: Fraction of the most recent rows held out for evaluation
+        n_jobs: Worker processes (default: CPU count)
+        random_state: Seed of every model
+        backend: Model backend (see model_backends.available_backends)
+
+    Returns:
+        Tuple of (models, model_performance, errors): models maps asset to
+        {'model', 'scaler', 'backend', 'features'} (scaler is None for
+        backends without scaling), model_performance to r2_score, rmse,
+        training_samples and test_samples, and errors to the message of any
+        asset whose training failed
+    """
+    get_backend(backend)
+    models, model_performance, errors = {}, {}, {}
+    if not training_sets:
+        return models, model_performance, errors
+
+    with tempfile.TemporaryDirectory(prefix='financial_mcp_training_') as temp_dir:
+        tasks = []
+        for i, (asset, (X, y)) in enumerate(training_sets.items()):
+            x_path, y_path = _save_arrays(X, y, temp_dir, str(i))
+            tasks.append((asset, x_path, y_path, list(X.columns), test_size, random_state, backend))
+
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(tasks) == 1:
+            results = [_train_asset(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+                results = list(executor.map(_train_asset, tasks))
+
+    for asset, model_data, performance, error in results:
+        if error is not None:
+            errors[asset] = error
+            continue
+        model_data['features'] = training_sets[asset][0].columns.tolist()
+        models[asset] = model_data
+        model_performance[asset] = performance
+
+    return models, model_performance, errors
+
+def _pooled_matrix(
+    features_by_asset: Dict[str, pd.DataFrame],
+    assets: List[str],
+    asset_classes: Dict[str, str],
+    classes: List[str],
+    columns: List[str]
+) -> np.ndarray:
+    """Stack per-asset feature rows with asset id and asset-class columns (float32)"""
+    asset_ids = {asset: i for i, asset in enumerate(assets)}
+    n_rows = sum(len(X) for X in features_by_asset.values())
+    n_features = len(columns)
+    stacked = np.zeros((n_rows, n_features + 1 + len(classes)), dtype=np.float32)
+
+    position = 0
+    for asset, X in features_by_asset.items():
+        if asset not in asset_ids:
+            raise ValueError(f"Asset '{asset}' is not covered by the pooled model")
+        block = stacked[position:position + len(X)]
+        block[:, :n_features] = X[columns].to_numpy(dtype=np.float32)
+        block[:, n_features] = asset_ids[asset]
+        asset_class = asset_classes.get(asset)
+        if asset_class in classes:
+            block[:, n_features + 1 + classes.index(asset_class)] = 1
+        position += len(X)
+    return stacked
+
+def train_pooled_model(
+    training_sets: Dict[str, Tuple[pd.DataFrame, pd.Series]],
+    asset_classes: Optional[Dict[str, str]] = None,
+    test_size: float = DEFAULT_TEST_SIZE,
+    n_jobs: Optional[int] = None,
+    random_state: int = 42,
+    backend: str = DEFAULT_BACKEND
+) -> Tuple[Dict, Dict]:
+    """
+    Train one model on the stacked panel of all assets
+
+    Each asset's most recent test_size rows are held out, as in the
+    per-asset mode, so the performance figures are comparable.
+
+    Args:
+        training_sets: Dictionary of asset name to (features, target); all
+            assets must share the same feature columns
+        asset_classes: Dictionary of asset name to asset class (e.g. crypto)
+        test_size: Fraction of each asset's most recent rows held out
+        n_jobs: Threads of the estimator (default: CPU count)
+        random_state: Seed of the model
+        backend: Model backend (see model_backends.available_backends)
+
+    Returns:
+        Tuple of (model_data, model_performance): model_data holds 'model',
+        'scaler', 'backend', 'features' (input feature columns),
+        'model_features' (with asset columns), 'assets', 'asset_classes' and
+        'classes'; model_performance maps each asset to r2_score, rmse,
+        training_samples and test_samples on its own held-out rows
+    """
+    from sklearn.metrics import mean_squared_error, r2_score
+
+    get_backend(backend)
+    if not training_sets:
+        raise ValueError("No training data for the pooled model")
+    assets = list(training_sets)
+    columns = list(training_sets[assets[0]][0].columns)
+    for asset, (X, _) in training_sets.items():
+        if list(X.columns) != columns:
+            raise ValueError(f"Feature columns of '{asset}' differ from those of '{assets[0]}'")
+
+    asset_classes = {asset: (asset_classes or {}).get(asset, 'other') for asset in assets}
+    classes = sorted(set(asset_classes.values()))
+    model_features = columns + [ASSET_ID_COLUMN] + [f'class_{c}' for c in classes]
+
+    splits = {asset: chronological_split(len(X), test_size) for asset, (X, _) in training_sets.items()}
+    train = {asset: X.iloc[:splits[asset]] for asset, (X, _) in training_sets.items()}
+    test = {asset: X.iloc[splits[asset]:] for asset, (X, _) in training_sets.items()}
+    y_train = np.concatenate([np.asarray(y, dtype=float)[:splits[asset]] for asset, (_, y) in training_sets.items()])
+
+    model, scaler = fit_model(
+        _pooled_matrix(train, assets, asset_classes, classes, columns), y_train, model_features,
+        random_state, backend, n_jobs=n_jobs or os.cpu_count() or 1
+    )
+    y_pred = predict(model, scaler, _pooled_matrix(test, assets, asset_classes, classes, columns), model_features)
+
+    model_performance = {}
+    position = 0
+    for asset, (X, y) in training_sets.items():
+        actual = np.asarray(y, dtype=float)[splits[asset]:]
+        predicted = y_pred[position:position + len(actual)]
+        position += len(actual)
+        model_performance[asset] = {
+            'r2_score': float(r2_score(actual, predicted)),
+            'rmse': float(np.sqrt(mean_squared_error(actual, predicted))),
+            'training_samples': int(splits[asset]),
+            'test_samples': int(len(actual))
+        }
+
+    model_data = {
+        'model': model,
+        'scaler': scaler,
+        'backend': backend,
+        'features': columns,
+        'model_features': model_features,
+        'assets': assets,
+        'asset_classes': asset_classes,
+        'classes': classes
+    }
+    return model_data, model_performance
+
+def predict_pooled(model_data: Dict, features_by_asset: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    Predict several assets with a pooled model in one batched call
+
+    Args:
+        model_data: Output of train_pooled_model
+        features_by_asset: Dictionary of asset name to feature rows
+
+    Returns:
+        Dictionary of asset name to predictions
+    """
+    stacked = _pooled_matrix(features_by_asset, model_data['assets'], model_data['asset_classes'],
+                             model_data['classes'], model_data['features'])
+    y_pred = predict(model_data['model'], model_data['scaler'], stacked, model_data['model_features'])
+
+    predictions = {}
+    position = 0
+    for asset, X in features_by_asset.items():
+        predictions[asset] = y_pred[position:position + len(X)]
+        position += len(X)
+    return predictions
+
+def compare_training_modes(
+    training_sets: Dict[str, Tuple[pd.DataFrame, pd.Series]],
+    asset_classes: Optional[Dict[str, str]] = None,
+    n_jobs: Optional[int] = None,
+    random_state: int = 42,
+    backend: str = DEFAULT_BACKEND
+) -> pd.DataFrame:
+    """
+    Compare per-asset and pooled training on the same data
+
+    Models are saved with joblib (one file per asset vs one file) to a
+    temporary directory and loaded back to time serving start-up.
+
+    Args:
+        training_sets: Dictionary of asset name to (features, target)
+        asset_classes: Dictionary of asset name to asset class
+        n_jobs: Worker processes / estimator threads (default: CPU count)
+        random_state: Seed of every model
+        backend: Model backend
+
+    Returns:
+        DataFrame indexed by mode with train_seconds, model_files,
+        model_bytes, load_seconds, predict_seconds (latest row of every
+        asset), mean_r2_score and mean_rmse
+    """
+    import joblib
+
+    latest = {asset: X.iloc[-1:] for asset, (X, _) in training_sets.items()}
+    rows = {}
+    with tempfile.TemporaryDirectory(prefix='financial_mcp_modes_') as temp_dir:
+        for mode in TRAINING_MODES:
+            start = time.perf_counter()
+            if mode == 'pooled':
+                model_data, performance = train_pooled_model(
+                    training_sets, asset_classes, n_jobs=n_jobs, random_state=random_state, backend=backend
+                )
+                models = {POOLED_MODEL_NAME: model_data}
+            else:
+                models, performance, _ = train_asset_models(
+                    training_sets, n_jobs=n_jobs, random_state=random_state, backend=backend
+                )
+            train_seconds = time.perf_counter() - start
+
+            paths = []
+            for name, data in models.items():
+                path = Path(temp_dir) / f"{mode}_{name}_model.joblib"
+                joblib.dump(data, path)
+                paths.append(path)
+
+            start = time.perf_counter()
+            loaded = {name: joblib.load(path) for name, path in zip(models, paths)}
+            load_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if mode == 'pooled':
+                predict_pooled(loaded[POOLED_MODEL_NAME], latest)
+            else:
+                for asset, X in latest.items():
+                    if asset in loaded:
+                        data = loaded[asset]
+                        predict(data['model'], data['scaler'], X.to_numpy(dtype=float), data['features'])
+            predict_seconds = time.perf_counter() - start
+
+            rows[mode] = {
+                'train_seconds': train_seconds,
+                'model_files': len(paths),
+                'model_bytes': sum(path.stat().st_size for path in paths),
+                'load_seconds': load_seconds,
+                'predict_seconds': predict_seconds,
+                'mean_r2_score': float(np.mean([p['r2_score'] for p in performance.values()])),
+                'mean_rmse': float(np.mean([p['rmse'] for p in performance.values()]))
+            }
+    return pd.DataFrame.from_dict(rows, orient='index')
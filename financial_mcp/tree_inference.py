@@ -0,0 +1,176 @@
+"""
+Tree Inference Module
+
+This module compiles trained scikit-learn tree ensembles (random forests,
+extra trees and single decision trees), together with the StandardScaler in
+front of them, into flat NumPy arrays: split feature, threshold, child
+indices and leaf value of every node of every tree. Prediction walks all
+rows and trees at once with vectorized traversal, which avoids the per-call
+validation and per-tree dispatch of model.predict that dominate single-row
+latency.
+
+Results are bit-identical to model.predict: inputs are scaled in float64 and
+rounded to float32 as scikit-learn does, missing values follow each node's
+learned direction, and tree outputs are accumulated in estimator order
+before dividing by the number of trees.
+"""
+
+import time
+import numpy as np
+from typing import Callable, Dict, Optional
+
+class CompiledForest:
+    """
+    Array-backed tree ensemble
+    """
+
+    def __init__(self, trees, scaler=None):
+        """
+        Args:
+            trees: Fitted sklearn Tree objects (estimator.tree_) in estimator order
+            scaler: Fitted StandardScaler applied before the trees, optional
+        """
+        features, thresholds, children, values, missing_left, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            n_nodes = tree.node_count
+            left = tree.children_left.astype(np.intp)
+            right = tree.children_right.astype(np.intp)
+            leaf = left == -1
+            own = np.arange(n_nodes, dtype=np.intp)
+
+            # Leaves point to themselves, so every row can take max_depth steps
+            pair = np.empty((n_nodes, 2), dtype=np.intp)
+            pair[:, 0] = np.where(leaf, own, left) + offset
+            pair[:, 1] = np.where(leaf, own, right) + offset
+
+            features.append(np.where(leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(tree.threshold.astype(np.float64))
+            children.append(pair)
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            goes_left = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(n_nodes, dtype=bool) if goes_left is None
+                                else np.asarray(goes_left, dtype=bool))
+            roots.append(offset)
+            offset += n_nodes
+
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.children = np.concatenate(children).ravel()
+        self.value = np.concatenate(values)
+        self.missing_left = np.concatenate(missing_left)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.max_depth = max(tree.max_depth for tree in trees)
+        self.n_trees = len(roots)
+        self.n_features = int(trees[0].n_features)
+
+        self.mean = None
+        self.scale = None
+        if scaler is not None:
+            if getattr(scaler, 'with_mean', True) and getattr(scaler, 'mean_', None) is not None:
+                self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+            if getattr(scaler, 'with_std', True) and getattr(scaler, 'scale_', None) is not None:
+                self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+    def _prepare(self, X) -> np.ndarray:
+        """Scaled float64 rows holding float32-rounded values"""
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        # Trees compare float32 inputs with float64 thresholds
+        return X.astype(np.float32).astype(np.float64)
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict rows
+
+        Args:
+            X: (n_rows x n_features) array or DataFrame of unscaled features
+
+        Returns:
+            Array of n_rows predictions, identical to scaler + model.predict
+        """
+        X = self._prepare(X)
+        n_rows = len(X)
+        flat = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * self.n_features)[:, None]
+        has_missing = bool(np.isnan(flat).any())
+
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+        for _ in range(self.max_depth):
+            x = flat[row_offsets + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_missing:
+                go_left |= np.isnan(x) & self.missing_left[nodes]
+            nodes = self.children[2 * nodes + (~go_left)]
+
+        # Sequential sum in estimator order, then divide (as ForestRegressor.predict)
+        return np.cumsum(self.value[nodes], axis=1)[:, -1] / self.n_trees
+
+def compile_model(model, scaler=None) -> CompiledForest:
+    """
+    Compile a fitted tree ensemble
+
+    Args:
+        model: Fitted RandomForestRegressor, ExtraTreesRegressor or
+            DecisionTreeRegressor (single output)
+        scaler: Fitted StandardScaler applied before the model, optional
+
+    Returns:
+        CompiledForest with the same predictions as the model
+    """
+    if hasattr(model, 'tree_'):
+        trees = [model.tree_]
+    elif hasattr(model, 'estimators_') and all(hasattr(e, 'tree_') for e in np.ravel(model.estimators_)):
+        if type(model).__name__ not in ('RandomForestRegressor', 'ExtraTreesRegressor'):
+            raise ValueError(f"Unsupported ensemble for compiled inference: {type(model).__name__}")
+        trees = [estimator.tree_ for estimator in model.estimators_]
+    else:
+        raise ValueError(f"Unsupported model for compiled inference: {type(model).__name__}")
+
+    if trees[0].n_outputs != 1:
+        raise ValueError("Compiled inference supports single-output models only")
+    return CompiledForest(trees, scaler)
+
+def compile_model_data(model_data: Dict) -> Optional[CompiledForest]:
+    """
+    Compile a saved {'model', 'scaler', ...} dictionary
+
+    Returns:
+        CompiledForest, or None when the model type is not supported (the
+        caller then falls back to model.predict)
+    """
+    try:
+        return compile_model(model_data['model'], model_data.get('scaler'))
+    except ValueError:
+        return None
+
+def measure_latency(predict: Callable, X: np.ndarray, repeats: int = 1000) -> Dict[str, float]:
+    """
+    Single-row prediction latency
+
+    Args:
+        predict: Function taking a (1 x n_features) array
+        X: Rows to cycle through
+        repeats: Number of timed predictions
+
+    Returns:
+        Dictionary with p50_ms, p99_ms and max_ms
+    """
+    X = np.asarray(X, dtype=np.float64)
+    latencies = np.empty(repeats)
+    for i in range(repeats):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        predict(row)
+        latencies[i] = time.perf_counter() - start
+    latencies *= 1000
+    return {
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max())
+    }
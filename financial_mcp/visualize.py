@@ -13,6 +13,9 @@ from pathlib import Path
 from typing import Optional, Dict
 import warnings
 
+from .storage import load_frame, find_frame
+from .rolling import RollingAnalytics
+
 # Set style for better-looking plots
 plt.style.use('default')
 sns.set_palette("husl")
@@ -91,7 +94,8 @@ def create_volatility_plot(
     daily_returns_df: pd.DataFrame,
     output_dir: str = "plots",
     filename: str = "rolling_volatility.png",
-    window: int = 30
+    window: int = 30,
+    rolling_analytics: Optional[RollingAnalytics] = None
 ) -> None:
     """
     Create rolling volatility plot
@@ -101,14 +105,27 @@ def create_volatility_plot(
         output_dir: Output directory for plots
         filename: Output filename
         window: Rolling window size
+        rolling_analytics: Precomputed rolling analytics; used instead of
+            recomputing when it contains the window and every date
     """
     plt.figure(figsize=(14, 8))
     
+    precomputed = None
+    if rolling_analytics is not None and window in rolling_analytics.windows:
+        if daily_returns_df.index.isin(rolling_analytics.dates).all():
+            precomputed = rolling_analytics.get('volatility', window)
+        else:
+            # Saved before the latest fetch: newer dates would plot as gaps
+            print("⚠️  Saved rolling analytics do not cover every date, recomputing the volatility")
+    
     # Calculate rolling volatility for each asset
     for asset in daily_returns_df.columns:
         returns = daily_returns_df[asset].dropna()
         if len(returns) > window:
-            rolling_vol = returns.rolling(window=window).std()
+            if precomputed is not None and asset in precomputed.columns:
+                rolling_vol = precomputed[asset].reindex(returns.index)
+            else:
+                rolling_vol = returns.rolling(window=window).std()
             plt.plot(rolling_vol.index, rolling_vol.values, 
                     label=asset, linewidth=2)
     
@@ -230,7 +247,8 @@ def create_distribution_plots(
 def create_visualizations(
     daily_returns_df: Optional[pd.DataFrame] = None,
     correlation_matrix: Optional[pd.DataFrame] = None,
-    output_dir: str = "plots"
+    output_dir: str = "plots",
+    rolling_analytics: Optional[RollingAnalytics] = None
 ) -> None:
     """
     Create all visualizations
@@ -239,13 +257,14 @@ def create_visualizations(
         daily_returns_df: DataFrame with daily returns data
         correlation_matrix: Correlation matrix DataFrame
         output_dir: Output directory for plots
+        rolling_analytics: Precomputed rolling analytics, if available
     """
     print(f"\nCreating visualizations in {output_dir}/")
     
     if daily_returns_df is not None:
         # Time series plots
         create_cumulative_returns_plot(daily_returns_df, output_dir)
-        create_volatility_plot(daily_returns_df, output_dir)
+        create_volatility_plot(daily_returns_df, output_dir, rolling_analytics=rolling_analytics)
         
         # Statistical plots
         create_risk_return_scatter(daily_returns_df, output_dir)
@@ -255,12 +274,16 @@ def create_visualizations(
         # Correlation heatmap
         create_correlation_heatmap(correlation_matrix, output_dir)
 
-def load_data_for_visualization(input_dir: str = "financial_data") -> tuple:
+def load_data_for_visualization(
+    input_dir: str = "financial_data",
+    file_format: Optional[str] = None
+) -> tuple:
     """
     Load data files for visualization
     
     Args:
         input_dir: Input directory path
+        file_format: Storage format to look for; None tries columnar files first
         
     Returns:
         Tuple of (daily_returns_df, correlation_matrix)
@@ -270,31 +293,27 @@ def load_data_for_visualization(input_dir: str = "financial_data") -> tuple:
     # Load daily returns
     daily_returns_df = None
     possible_files = [
-        "combined_daily_returns_2020_2024.csv",
-        "all_assets_daily_returns_with_currencies_2020_2024.csv",
-        "all_assets_daily_returns_2020_2024.csv"
+        "combined_daily_returns_2020_2024",
+        "all_assets_daily_returns_with_currencies_2020_2024",
+        "all_assets_daily_returns_2020_2024"
     ]
     
-    for filename in possible_files:
-        filepath = input_path / filename
-        if filepath.exists():
-            print(f"Loading returns data from {filename}")
-            daily_returns_df = pd.read_csv(filepath, index_col=0, parse_dates=True)
-            break
+    filepath = find_frame(input_path, possible_files, file_format)
+    if filepath is not None:
+        print(f"Loading returns data from {filepath.name}")
+        daily_returns_df = load_frame(filepath, parse_dates=True)
     
     # Load correlation matrix
     correlation_matrix = None
     corr_files = [
-        "correlation_matrix.csv",
-        "correlation_matrix_with_currencies.csv"
+        "correlation_matrix",
+        "correlation_matrix_with_currencies"
     ]
     
-    for filename in corr_files:
-        filepath = input_path / filename
-        if filepath.exists():
-            print(f"Loading correlation matrix from {filename}")
-            correlation_matrix = pd.read_csv(filepath, index_col=0)
-            break
+    filepath = find_frame(input_path, corr_files, file_format)
+    if filepath is not None:
+        print(f"Loading correlation matrix from {filepath.name}")
+        correlation_matrix = load_frame(filepath)
     
     return daily_returns_df, correlation_matrix
 
@@ -314,7 +333,10 @@ def main():
         return
     
     # Create visualizations
-    create_visualizations(daily_returns_df, correlation_matrix)
+    create_visualizations(
+        daily_returns_df, correlation_matrix,
+        rolling_analytics=RollingAnalytics.load("financial_data")
+    )
     
     print("\n" + "=" * 50)
     print("Visualization completed successfully!")
@@ -0,0 +1,187 @@
+"""
+Tests for the financial_mcp.analyze module
+"""
+
+import unittest
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp import analyze
+from financial_mcp.fetch_data import calculate_summary_statistics
+
+
+def make_returns(n_days=400, n_assets=6, seed=0):
+    """Random percentage returns with ragged histories and gaps"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2021-01-01', periods=n_days)
+    data = rng.standard_t(df=4, size=(n_days, n_assets))
+    df = pd.DataFrame(data, index=index, columns=[f'A{i}' for i in range(n_assets)])
+    df.iloc[:50, 1] = np.nan           # late listing
+    df.iloc[-30:, 2] = np.nan          # delisted
+    df.iloc[::7, 3] = np.nan           # holidays
+    df.iloc[:, 4] = np.nan             # no data at all
+    df.iloc[3:, 5] = np.nan            # very short history
+    return df
+
+
+def reference_asset_stats(returns):
+    """Per-column statistics computed with pandas"""
+    cumulative_series = (1 + returns / 100).cumprod()
+    drawdown = (cumulative_series - cumulative_series.expanding().max()) / cumulative_series.expanding().max()
+    return {
+        'mean_return': returns.mean(),
+        'std_return': returns.std(),
+        'min_return': returns.min(),
+        'max_return': returns.max(),
+        'skewness': returns.skew(),
+        'kurtosis': returns.kurtosis(),
+        'var_95': returns.quantile(0.05),
+        'var_99': returns.quantile(0.01),
+        'cumulative_return': (cumulative_series.iloc[-1] - 1) * 100,
+        'max_drawdown': drawdown.min() * 100,
+        'count': len(returns),
+    }
+
+
+class TestAnalyzeReturns(unittest.TestCase):
+    """Test the vectorized statistics against per-column pandas results"""
+
+    def test_matches_pandas(self):
+        """analyze_returns matches the per-asset pandas calculations"""
+        df = make_returns()
+        results = analyze.analyze_returns(df)
+
+        self.assertEqual(list(results.keys()), ['A0', 'A1', 'A2', 'A3', 'A5'])
+        for asset, metrics in results.items():
+            expected = reference_asset_stats(df[asset].dropna())
+            for name, value in expected.items():
+                with self.subTest(asset=asset, metric=name):
+                    np.testing.assert_allclose(metrics[name], value, rtol=1e-9, atol=1e-12, equal_nan=True)
+
+    def test_summary_statistics_match(self):
+        """calculate_summary_statistics agrees with analyze_returns"""
+        df = make_returns()
+        daily_returns = {asset: df[asset].dropna() for asset in df.columns}
+        summary = calculate_summary_statistics(daily_returns)
+        results = analyze.analyze_returns(df)
+
+        self.assertEqual(set(summary.keys()), set(results.keys()))
+        for asset in summary:
+            for name in ('mean_return', 'std_return', 'skewness', 'kurtosis', 'sharpe_ratio', 'count'):
+                np.testing.assert_allclose(summary[asset][name], results[asset][name], equal_nan=True)
+
+
+class TestRiskMetrics(unittest.TestCase):
+    """Test the vectorized beta/alpha engine against scipy.stats.linregress"""
+
+    def assert_matches_linregress(self, df, benchmark, betas):
+        for asset, metrics in betas.items():
+            pair = df[[benchmark, asset]].dropna()
+            expected = stats.linregress(pair.iloc[:, 0], pair.iloc[:, 1])
+            with self.subTest(benchmark=benchmark, asset=asset):
+                np.testing.assert_allclose(metrics['beta'], expected.slope, rtol=1e-8)
+                np.testing.assert_allclose(metrics['alpha'], expected.intercept, rtol=1e-8, atol=1e-12)
+                np.testing.assert_allclose(metrics['r_squared'], expected.rvalue ** 2, rtol=1e-8, atol=1e-14,
+                                           equal_nan=True)
+                np.testing.assert_allclose(metrics['p_value'], expected.pvalue, rtol=1e-6, atol=1e-14,
+                                           equal_nan=True)
+
+    def test_default_benchmark_is_first_asset(self):
+        """Without a benchmark, betas are relative to the first asset"""
+        df = make_returns()
+        risk_metrics = analyze.calculate_risk_metrics(df)
+
+        self.assertEqual(risk_metrics['benchmark'], 'A0')
+        self.assertEqual(sorted(risk_metrics['betas']), ['A1', 'A2', 'A3', 'A5'])
+        self.assert_matches_linregress(df, 'A0', risk_metrics['betas'])
+
+    def test_multiple_benchmarks(self):
+        """Each benchmark gets its own pairwise-complete regressions"""
+        df = make_returns()
+        risk_metrics = analyze.calculate_risk_metrics(df, ['A3', 'A1'])
+
+        self.assertEqual(risk_metrics['benchmark'], 'A3')
+        self.assertEqual(risk_metrics['betas'], risk_metrics['betas_by_benchmark']['A3'])
+        for benchmark, betas in risk_metrics['betas_by_benchmark'].items():
+            self.assertNotIn(benchmark, betas)
+            self.assert_matches_linregress(df, benchmark, betas)
+
+    def test_constant_asset(self):
+        """A zero-variance asset has a beta but no R² or p-value, as linregress"""
+        df = make_returns()
+        df['A4'] = 0.0
+        betas = analyze.calculate_risk_metrics(df)['betas']
+        self.assertEqual(betas['A4']['beta'], 0.0)
+        self.assertTrue(np.isnan(betas['A4']['r_squared']))
+        self.assertTrue(np.isnan(betas['A4']['p_value']))
+        self.assert_matches_linregress(df, 'A0', betas)
+
+    def test_unknown_benchmark(self):
+        """An unknown benchmark column is rejected"""
+        with self.assertRaises(ValueError):
+            analyze.calculate_risk_metrics(make_returns(), 'NOPE')
+
+
+
+class TestUpdateAnalysis(unittest.TestCase):
+    """Incremental analysis for scheduled refreshes"""
+
+    def test_incremental_state_and_window(self):
+        df = make_returns(n_days=300)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            analyze.update_analysis(df.iloc[:200], temp_dir, max_history_days=90)
+            results, correlation, risk = analyze.update_analysis(df, temp_dir, max_history_days=90)
+
+            with open(Path(temp_dir) / 'analysis_results.json') as f:
+                saved = json.load(f)
+            self.assertTrue((Path(temp_dir) / analyze.RETURN_STATISTICS_FILE).exists())
+            self.assertTrue((Path(temp_dir) / 'risk_metrics.json').exists())
+            self.assertFalse((Path(temp_dir) / 'correlation_matrix_with_currencies.csv').exists())
+
+        # Full-history statistics from the state, windowed VaR and correlations
+        window = df[df.index > df.index[-1] - pd.Timedelta(days=90)]
+        full, windowed = analyze.analyze_returns(df), analyze.analyze_returns(window)
+        self.assertEqual(set(results), set(full))
+        for asset in results:
+            with self.subTest(asset=asset):
+                np.testing.assert_allclose(results[asset]['mean_return'], full[asset]['mean_return'], rtol=1e-9)
+                self.assertEqual(results[asset]['count'], full[asset]['count'])
+                for metric in ('var_95', 'var_99'):
+                    np.testing.assert_allclose(results[asset][metric],
+                                               windowed.get(asset, {}).get(metric, np.nan), equal_nan=True)
+        self.assertEqual(saved['A0']['count'], 300)
+        pd.testing.assert_frame_equal(correlation, analyze.calculate_correlation_matrix(window))
+        self.assertEqual(risk, analyze.calculate_risk_metrics(window))
+
+    def test_late_values_and_string_index(self):
+        """Returns read back from CSV with DST offsets; a late value is applied"""
+        df = make_returns(n_days=300)
+        df.index = df.index.tz_localize('America/New_York')
+        late = df.copy()
+        late.iloc[199, 0] = np.nan
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for returns in (late.iloc[:200], df):
+                path = Path(temp_dir) / 'returns.csv'
+                returns.to_csv(path)
+                results, _, _ = analyze.update_analysis(pd.read_csv(path, index_col=0), temp_dir,
+                                                        max_history_days=90)
+
+        full = analyze.analyze_returns(df.tz_localize(None))
+        for asset in results:
+            with self.subTest(asset=asset):
+                self.assertEqual(results[asset]['count'], full[asset]['count'])
+                np.testing.assert_allclose(results[asset]['mean_return'], full[asset]['mean_return'], rtol=1e-9)
+                np.testing.assert_allclose(results[asset]['max_drawdown'], full[asset]['max_drawdown'], rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for the financial_mcp.backtest module
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.backtest import walk_forward_splits, walk_forward_backtest
+from financial_mcp.training import build_training_set
+from test_training import make_asset, HAS_SKLEARN
+
+if HAS_SKLEARN:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.metrics import r2_score
+
+
+class TestWalkForwardSplits(unittest.TestCase):
+    """Fold layout"""
+
+    def test_expanding_covers_every_row_after_warm_up(self):
+        splits = walk_forward_splits(250, min_train_size=100, refit_every=40)
+        self.assertEqual(len(splits), 4)
+        for train, test in splits:
+            self.assertEqual(train.start, 0)
+            self.assertEqual(train.stop, test.start)
+        tested = np.concatenate([np.arange(test.start, test.stop) for _, test in splits])
+        np.testing.assert_array_equal(tested, np.arange(100, 250))
+
+    def test_rolling_window_and_embargo(self):
+        splits = walk_forward_splits(300, min_train_size=80, refit_every=50, embargo=5, window='rolling')
+        for train, test in splits:
+            self.assertEqual(train.stop - train.start, 80)
+            self.assertEqual(test.start - train.stop, 5)
+
+    def test_short_history_and_bad_options(self):
+        self.assertEqual(walk_forward_splits(101, min_train_size=100, refit_every=10), [])
+        with self.assertRaises(ValueError):
+            walk_forward_splits(300, window='anchored')
+        with self.assertRaises(ValueError):
+            walk_forward_splits(300, embargo=-1)
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestWalkForwardBacktest(unittest.TestCase):
+    """Parallel fold execution"""
+
+    def setUp(self):
+        self.training_sets = {}
+        for seed, asset in enumerate(['A', 'B']):
+            data, features = make_asset(seed)
+            self.training_sets[asset] = build_training_set(features, data)
+        self.options = dict(min_train_size=100, refit_every=40, embargo=2)
+
+    def test_fold_matches_direct_fit(self):
+        results = walk_forward_backtest(self.training_sets, n_jobs=2, **self.options)
+        X, y = self.training_sets['A']
+        folds = results['A']['folds']
+        self.assertEqual(len(folds), len(walk_forward_splits(len(X), **self.options)))
+
+        fold = folds.iloc[1]
+        train = (X.index >= fold['train_start']) & (X.index <= fold['train_end'])
+        test = (X.index >= fold['test_start']) & (X.index <= fold['test_end'])
+        scaler = StandardScaler()
+        model = RandomForestRegressor(n_estimators=100, random_state=42)
+        model.fit(scaler.fit_transform(X[train]), y[train])
+        expected = model.predict(scaler.transform(X[test]))
+
+        np.testing.assert_allclose(results['A']['predictions'].loc[X.index[test]].to_numpy(), expected)
+        self.assertAlmostEqual(fold['r2_score'], r2_score(y[test], expected))
+        self.assertAlmostEqual(fold['directional_accuracy'], np.mean(np.sign(expected) == np.sign(y[test])))
+
+    def test_worker_count_does_not_change_results(self):
+        parallel = walk_forward_backtest(self.training_sets, n_jobs=2, **self.options)
+        serial = walk_forward_backtest(self.training_sets, n_jobs=1, **self.options)
+        for asset in self.training_sets:
+            pd.testing.assert_frame_equal(parallel[asset]['folds'], serial[asset]['folds'])
+            self.assertEqual(parallel[asset]['summary'], serial[asset]['summary'])
+
+    def test_short_asset_is_reported(self):
+        X, y = self.training_sets['A']
+        self.training_sets['short'] = (X.iloc[:50], y.iloc[:50])
+        results = walk_forward_backtest(self.training_sets, n_jobs=1, **self.options)
+        self.assertIn('error', results['short'])
+        self.assertIn('summary', results['A'])
+
+
+if __name__ == '__main__':
+    unittest.main()
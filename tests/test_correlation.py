@@ -0,0 +1,97 @@
+"""
+Tests for the financial_mcp.correlation module
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.correlation import (
+    pairwise_correlation, ledoit_wolf_covariance, shrunk_correlation
+)
+from financial_mcp.analyze import calculate_correlation_matrix, save_analysis_results
+from test_analyze import make_returns
+
+
+class TestPairwiseCorrelation(unittest.TestCase):
+    """Test the blocked correlation engine against DataFrame.corr()"""
+
+    def test_matches_pandas(self):
+        """Blocks of any size reproduce pairwise-complete correlations"""
+        df = make_returns()
+        expected = df.corr().to_numpy()
+
+        for block_size in (1, 2, 4, 512):
+            result = pairwise_correlation(df, block_size=block_size)
+            np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+            np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-12)
+
+    def test_float32_and_memmap(self):
+        """float32 results are streamed to a loadable .npy file"""
+        df = make_returns()
+        expected = df.corr().to_numpy()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            out = Path(temp_dir) / "correlation.npy"
+            result = pairwise_correlation(df, block_size=3, dtype=np.float32, out=out)
+            self.assertIsInstance(result, np.memmap)
+            self.assertEqual(result.dtype, np.float32)
+
+            loaded = np.load(out)
+            np.testing.assert_allclose(loaded, expected, atol=1e-4)
+            del result, loaded
+
+    def test_calculate_correlation_matrix(self):
+        """Empty columns are dropped and labels are preserved"""
+        df = make_returns()
+        matrix = calculate_correlation_matrix(df)
+        expected = df.dropna(axis=1, how='all').corr()
+
+        self.assertEqual(list(matrix.columns), list(expected.columns))
+        np.testing.assert_allclose(matrix.to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+class TestLedoitWolf(unittest.TestCase):
+    """Test Ledoit-Wolf shrinkage against scikit-learn"""
+
+    def test_matches_sklearn(self):
+        """Complete data reproduces sklearn.covariance.ledoit_wolf"""
+        from sklearn.covariance import ledoit_wolf
+
+        df = make_returns()[['A0', 'A1', 'A2', 'A3']].dropna()
+        expected, expected_shrinkage = ledoit_wolf(df.to_numpy())
+
+        covariance, shrinkage = ledoit_wolf_covariance(df, block_size=3)
+        np.testing.assert_allclose(covariance, expected, rtol=1e-10)
+        self.assertAlmostEqual(shrinkage, expected_shrinkage)
+
+        correlation, _ = shrunk_correlation(df, block_size=3)
+        scale = np.sqrt(np.diag(expected))
+        np.testing.assert_allclose(correlation, expected / np.outer(scale, scale), rtol=1e-10)
+
+
+class TestSaveCorrelation(unittest.TestCase):
+    """Test persisting the correlation matrix"""
+
+    def test_compat_copies(self):
+        """The legacy CSV copy can be skipped"""
+        df = make_returns()
+        matrix = calculate_correlation_matrix(df)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_analysis_results({}, matrix, {}, temp_dir, compat_copies=False)
+            self.assertTrue((Path(temp_dir) / "correlation_matrix.csv").exists())
+            self.assertFalse((Path(temp_dir) / "correlation_matrix_with_currencies.csv").exists())
+
+            save_analysis_results({}, matrix, {}, temp_dir)
+            self.assertTrue((Path(temp_dir) / "correlation_matrix_with_currencies.csv").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
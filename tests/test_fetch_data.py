@@ -0,0 +1,122 @@
+"""
+Tests for the financial_mcp.fetch_data module
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp import fetch_data
+
+
+def _fake_history(symbol, start_date, end_date, cache=None):
+    """Return a small deterministic price history for a symbol"""
+    if symbol == 'BAD':
+        raise ValueError("network error")
+    if symbol == 'EMPTY':
+        return pd.DataFrame()
+    index = pd.date_range('2024-01-01', periods=4, freq='D')
+    return pd.DataFrame({'Close': [100.0, 101.0, 99.99, 102.0]}, index=index)
+
+
+class TestConcurrentFetch(unittest.TestCase):
+    """Test the concurrent fetch engine"""
+
+    assets = {'AAA': 'Alpha', 'BAD': 'Broken', 'EMPTY': 'Empty', 'BBB': 'Beta'}
+
+    def test_results_match_sequential_fetch(self):
+        """Concurrent and sequential fetches return the same data"""
+        with mock.patch.object(fetch_data, '_fetch_symbol_history', _fake_history):
+            sequential = fetch_data.fetch_financial_data(assets=self.assets, max_workers=1)
+            concurrent = fetch_data.fetch_financial_data(assets=self.assets, max_workers=4)
+
+        for (seq, conc) in zip(sequential, concurrent):
+            self.assertEqual(list(seq.keys()), list(conc.keys()))
+            for name in seq:
+                pd.testing.assert_frame_equal(pd.DataFrame(seq[name]), pd.DataFrame(conc[name]))
+
+    def test_failed_symbols_are_skipped(self):
+        """Errors and empty downloads are reported per symbol and skipped"""
+        with mock.patch.object(fetch_data, '_fetch_symbol_history', _fake_history):
+            all_data, daily_returns = fetch_data.fetch_financial_data(assets=self.assets)
+
+        self.assertEqual(list(all_data.keys()), ['Alpha', 'Beta'])
+        self.assertEqual(len(daily_returns['Alpha']), 3)
+        self.assertAlmostEqual(daily_returns['Alpha'].iloc[0], 1.0)
+
+
+def _fake_batch(symbols, start_date, end_date):
+    """Return a yf.download-style (ticker, field) frame for the symbols"""
+    if 'BAD' in symbols:
+        raise ValueError("rate limited")
+    frames = {symbol: _fake_history(symbol, start_date, end_date) for symbol in symbols
+              if symbol != 'EMPTY'}
+    return pd.concat(frames, axis=1)
+
+
+class TestBatchedFetch(unittest.TestCase):
+    """Test the batched multi-ticker download mode"""
+
+    def test_split_batch_frame(self):
+        """A multi-ticker frame is split back into per-symbol frames"""
+        frame = _fake_batch(['AAA', 'BBB'], '2024-01-01', '2024-01-05')
+        histories = fetch_data.split_batch_frame(frame, ['AAA', 'BBB', 'MISSING'])
+
+        self.assertEqual(list(histories['AAA'].columns), ['Close'])
+        self.assertEqual(len(histories['BBB']), 4)
+        self.assertTrue(histories['MISSING'].empty)
+
+    def test_batched_matches_per_symbol_fetch(self):
+        """Batched downloads produce the same per-asset data"""
+        assets = {'AAA': 'Alpha', 'EMPTY': 'Empty', 'BBB': 'Beta', 'CCC': 'Gamma'}
+        with mock.patch.object(fetch_data, '_fetch_symbol_history', _fake_history), \
+                mock.patch.object(fetch_data, '_download_batch', wraps=_fake_batch) as batch:
+            expected = fetch_data.fetch_financial_data(assets=assets)
+            batched = fetch_data.fetch_financial_data(assets=assets, batch_size=2)
+
+        self.assertEqual(batch.call_count, 2)
+        self.assertEqual(list(expected[1].keys()), list(batched[1].keys()))
+        for name in expected[1]:
+            pd.testing.assert_series_equal(expected[1][name], batched[1][name])
+
+    def test_failed_chunk_is_skipped(self):
+        """A failed chunk drops only its own symbols"""
+        assets = {'AAA': 'Alpha', 'BAD': 'Broken', 'BBB': 'Beta'}
+        with mock.patch.object(fetch_data, '_download_batch', _fake_batch):
+            all_data, _ = fetch_data.fetch_financial_data(assets=assets, batch_size=2)
+
+        self.assertEqual(list(all_data.keys()), ['Beta'])
+
+    def test_modes_share_a_cache_directory(self):
+        """Batched (tz-naive) and per-symbol (tz-aware) frames are cached apart"""
+        def tz_aware_history(symbol, start_date, end_date, interval='1d'):
+            index = pd.date_range('2024-01-01', periods=4, freq='D', tz='America/New_York')
+            return pd.DataFrame({'Close': [100.0, 101.0, 99.99, 102.0]}, index=index)
+
+        assets = {'AAA': 'Alpha', 'BBB': 'Beta'}
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch('financial_mcp.price_cache.yahoo_history_downloader', tz_aware_history), \
+                mock.patch.object(fetch_data, '_download_batch', _fake_batch):
+            for batch_size in (None, 2, None, 2):
+                all_data, _ = fetch_data.fetch_financial_data(
+                    start_date='2024-01-01', end_date='2024-01-05', assets=assets,
+                    cache_dir=cache_dir, batch_size=batch_size
+                )
+                self.assertEqual(list(all_data.keys()), ['Alpha', 'Beta'])
+                self.assertEqual(all_data['Alpha'].index.tz is None, batch_size is not None)
+            self.assertTrue((Path(cache_dir) / fetch_data.BATCH_CACHE_SUBDIR).is_dir())
+
+        # collect_daily_returns.py caches a third frame shape under its own subdirectory
+        from collect_daily_returns import DOWNLOAD_CACHE_SUBDIR
+        self.assertNotEqual(fetch_data.BATCH_CACHE_SUBDIR, DOWNLOAD_CACHE_SUBDIR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for the financial_mcp.indicator_state module
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.indicator_state import (
+    IndicatorState, feature_matrix_columns, save_indicator_states, load_indicator_states
+)
+from financial_mcp.storage import naive_datetime_index
+from test_indicators import make_prices
+
+try:
+    from enhanced_fetch_data import EnhancedDataFetcher
+    HAS_ENHANCED = True
+except ImportError:
+    HAS_ENHANCED = False
+
+
+def asset_bars(asset):
+    """OHLC bars of one asset on its own calendar"""
+    close, high, low = make_prices()
+    bars = close[asset].dropna().index
+    return pd.DataFrame({
+        'Open': close[asset].loc[bars],
+        'High': high[asset].loc[bars],
+        'Low': low[asset].loc[bars],
+        'Close': close[asset].loc[bars],
+        'Volume': 1.0
+    })
+
+
+@unittest.skipUnless(HAS_ENHANCED, "enhanced_fetch_data dependencies not installed")
+class TestIndicatorState(unittest.TestCase):
+    """Test incremental feature rows against the full-history feature matrix"""
+
+    def enhanced_data(self, bars):
+        fetcher = EnhancedDataFetcher.__new__(EnhancedDataFetcher)
+        data = bars.copy()
+        data['Daily_Return'] = data['Close'].pct_change() * 100
+        data = fetcher._add_technical_indicators(data)
+        data = fetcher._add_time_features(data)
+        return fetcher._add_volatility_features(data)
+
+    def full_feature_matrix(self, bars):
+        fetcher = EnhancedDataFetcher.__new__(EnhancedDataFetcher)
+        return fetcher._create_feature_matrix(self.enhanced_data(bars))
+
+    def assert_rows_match(self, rows, expected):
+        actual = pd.DataFrame(rows, index=expected.index)
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        np.testing.assert_array_equal(actual.isna().to_numpy(), expected.isna().to_numpy())
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    def test_matches_feature_matrix(self):
+        """Seeding at any point and appending bars reproduces the full history"""
+        for asset in ('BTC', 'SP500', 'EUR_USD'):
+            bars = asset_bars(asset)
+            expected = self.full_feature_matrix(bars)
+            self.assertEqual(list(expected.columns), feature_matrix_columns())
+
+            for split in (0, 3, 60):
+                with self.subTest(asset=asset, split=split):
+                    state = IndicatorState.from_history(bars.iloc[:split])
+                    rows = [state.update(date, bar['Close'], bar['High'], bar['Low'])
+                            for date, bar in bars.iloc[split:].iterrows()]
+                    self.assert_rows_match(rows, expected.iloc[split:])
+
+    def test_save_and_load(self):
+        """A persisted state continues exactly where it stopped"""
+        bars = asset_bars('BTC')
+        expected = self.full_feature_matrix(bars)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "state.json"
+            save_indicator_states({'BTC': IndicatorState.from_history(bars.iloc[:200])}, path)
+            state = load_indicator_states(path)['BTC']
+
+        self.assertEqual(state.last_date, bars.index[199])
+        rows = [state.update(date, bar['Close'], bar['High'], bar['Low'])
+                for date, bar in bars.iloc[200:].iterrows()]
+        self.assert_rows_match(rows, expected.iloc[200:])
+
+    def test_refresh_appends_new_rows(self):
+        """refresh_enhanced_data appends the rows a full rebuild would produce"""
+        for tz in (None, 'America/New_York'):
+            with self.subTest(tz=tz):
+                bars = asset_bars('SP500')
+                if tz is not None:
+                    # Ticker.history bars: UTC offsets change across DST
+                    bars = bars.tz_localize(tz)
+                self.check_refresh(bars)
+
+    def check_refresh(self, bars):
+        saved = self.full_feature_matrix(bars)
+        expected = saved.set_axis(naive_datetime_index(saved.index))
+        history = bars.iloc[:-5]
+
+        class Cache:
+            def get_history(self, symbol, start_date, end_date):
+                return bars.copy()
+
+        fetcher = EnhancedDataFetcher.__new__(EnhancedDataFetcher)
+        fetcher.assets = {'SP500': '^GSPC'}
+        fetcher.start_date = '2020-01-01'
+        fetcher.price_cache = Cache()
+        fetcher.indicator_states = {'SP500': IndicatorState.from_history(history)}
+        fetcher.online_models = {}
+        fetcher.new_bars = {}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            self.enhanced_data(history).to_csv(temp_dir / 'SP500_enhanced_data.csv')
+            saved.iloc[:-5].to_csv(temp_dir / 'SP500_features.csv')
+
+            appended = fetcher.refresh_enhanced_data(temp_dir, temp_dir / 'state.json', temp_dir / 'online')
+            features = pd.read_csv(temp_dir / 'SP500_features.csv', index_col=0, parse_dates=True)
+            data = pd.read_csv(temp_dir / 'SP500_enhanced_data.csv', index_col=0, parse_dates=True)
+            returns = fetcher.load_daily_returns(temp_dir)
+
+        self.assertEqual(appended, 5)
+        self.assertEqual(returns.columns.tolist(), ['SP500'])
+        self.assertTrue(returns.index.equals(expected.index))
+        self.assertEqual(fetcher.indicator_states['SP500'].last_date, bars.index[-1])
+        self.assertTrue(features.index.equals(expected.index))
+        np.testing.assert_allclose(features.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+        self.assertTrue(data.index.equals(expected.index))
+        np.testing.assert_allclose(data['Daily_Return'].to_numpy()[1:],
+                                   bars['Close'].pct_change().to_numpy()[1:] * 100, rtol=1e-9)
+        self.assertEqual(data['Month'].iloc[-1], bars.index[-1].month)
+
+    def test_missing_state_file(self):
+        """Loading from a missing file gives no states"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertEqual(load_indicator_states(Path(temp_dir) / "missing.json"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for the financial_mcp.indicators module
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp import indicators
+from financial_mcp.indicators import compute_indicators, register_indicator
+
+
+def make_prices(seed=0, n_days=400):
+    """Ragged close/high/low panel: daily crypto, weekday stock, late-listed FX"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2021-01-01', periods=n_days)
+    close = pd.DataFrame({
+        asset: scale * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        for asset, scale in (('BTC', 30000.0), ('SP500', 4000.0), ('EUR_USD', 1.1))
+    }, index=index)
+    close.loc[close.index.dayofweek >= 5, 'SP500'] = np.nan
+    close.iloc[:60, 2] = np.nan
+    return close, close * 1.01, close * 0.985
+
+
+def pandas_indicators(close, high, low):
+    """Per-asset pandas calculations previously used by EnhancedDataFetcher"""
+    data = pd.DataFrame({'Close': close, 'High': high, 'Low': low})
+    data['Daily_Return'] = data['Close'].pct_change() * 100
+    for window in (5, 10, 20, 50):
+        data[f'MA_{window}'] = data['Close'].rolling(window=window).mean()
+    data['EMA_12'] = data['Close'].ewm(span=12).mean()
+    data['EMA_26'] = data['Close'].ewm(span=26).mean()
+    data['MACD'] = data['EMA_12'] - data['EMA_26']
+    data['MACD_Signal'] = data['MACD'].ewm(span=9).mean()
+    data['MACD_Histogram'] = data['MACD'] - data['MACD_Signal']
+
+    delta = data['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    data['RSI'] = 100 - (100 / (1 + gain / loss))
+
+    rolling_mean = data['Close'].rolling(window=20).mean()
+    rolling_std = data['Close'].rolling(window=20).std()
+    data['BB_Upper'] = rolling_mean + rolling_std * 2
+    data['BB_Lower'] = rolling_mean - rolling_std * 2
+    data['BB_Width'] = data['BB_Upper'] - data['BB_Lower']
+    data['BB_Position'] = (data['Close'] - data['BB_Lower']) / data['BB_Width']
+
+    data['Momentum_5'] = data['Close'].pct_change(5)
+    data['Momentum_10'] = data['Close'].pct_change(10)
+    for window in (5, 10, 20, 30):
+        data[f'Vol_{window}'] = data['Daily_Return'].rolling(window=window).std()
+    data['Vol_Ratio_5_20'] = data['Vol_5'] / data['Vol_20']
+    data['Vol_Ratio_10_30'] = data['Vol_10'] / data['Vol_30']
+    data['HL_Volatility'] = (data['High'] - data['Low']) / data['Close']
+    return data
+
+
+class TestComputeIndicators(unittest.TestCase):
+    """Test the panel engine against per-asset pandas calculations"""
+
+    def test_matches_pandas_per_asset(self):
+        """Every feature matches pandas on each asset's own calendar"""
+        close, high, low = make_prices()
+        result = compute_indicators(close, high, low)
+
+        for asset in close.columns:
+            own = close[asset].dropna().index
+            expected = pandas_indicators(close[asset].loc[own], high[asset].loc[own],
+                                         low[asset].loc[own])
+            for feature, frame in result.items():
+                actual = frame[asset]
+                self.assertTrue(actual.drop(own).isna().all())
+                np.testing.assert_allclose(actual.loc[own], expected[feature],
+                                           rtol=1e-9, atol=1e-9, err_msg=f"{asset} {feature}")
+
+    def test_arrays_and_subsets(self):
+        """Arrays in give arrays out, restricted to the requested indicators"""
+        close, _, _ = make_prices()
+        values = close[['BTC']].to_numpy()
+        result = compute_indicators(values, indicators=['moving_average', 'macd'])
+
+        self.assertEqual(set(result), {'MA_5', 'MA_10', 'MA_20', 'MA_50',
+                                       'MACD', 'MACD_Signal', 'MACD_Histogram'})
+        expected = pandas_indicators(close['BTC'], close['BTC'], close['BTC'])
+        np.testing.assert_allclose(result['MACD_Signal'][:, 0], expected['MACD_Signal'], rtol=1e-9)
+
+        with self.assertRaises(ValueError):
+            compute_indicators(values, indicators=['unknown'])
+
+    def test_register_indicator(self):
+        """Registered indicators run after the built-ins and can use their outputs"""
+        @register_indicator('ma_spread')
+        def ma_spread(panel):
+            return {'MA_Spread': panel.features['MA_5'] - panel.rolling_mean(panel.close, 3)}
+
+        try:
+            close, _, _ = make_prices()
+            result = compute_indicators(close)
+            expected = close['BTC'].rolling(5).mean() - close['BTC'].rolling(3).mean()
+            np.testing.assert_allclose(result['MA_Spread']['BTC'], expected, rtol=1e-9)
+        finally:
+            del indicators._INDICATORS['ma_spread']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests for the financial_mcp.model_backends module
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp import model_backends
+from financial_mcp.model_backends import (
+    available_backends, get_backend, register_backend, fit_model, predict, benchmark_backends
+)
+from financial_mcp.training import build_training_set, chronological_split, train_asset_models
+from test_training import make_asset, HAS_SKLEARN
+
+if HAS_SKLEARN:
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.linear_model import LinearRegression
+
+
+class TestRegistry(unittest.TestCase):
+    """Backend registration"""
+
+    def test_builtin_backends(self):
+        self.assertEqual(available_backends()[:2], ['random_forest', 'hist_gradient_boosting'])
+        self.assertTrue(get_backend('random_forest').scale_features)
+        self.assertFalse(get_backend('hist_gradient_boosting').scale_features)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend('xgboost')
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestBackends(unittest.TestCase):
+    """Fitting, training and benchmarking with each backend"""
+
+    def setUp(self):
+        data, features = make_asset()
+        self.X, self.y = build_training_set(features, data)
+        self.columns = list(self.X.columns)
+
+    def test_hist_gradient_boosting_is_unscaled(self):
+        split = chronological_split(len(self.X))
+        values = self.X.to_numpy()
+        model, scaler = fit_model(values[:split], self.y.to_numpy()[:split], self.columns,
+                                  backend='hist_gradient_boosting', n_threads=1)
+        self.assertIsNone(scaler)
+
+        reference = HistGradientBoostingRegressor(max_iter=100, random_state=42)
+        reference.fit(self.X.iloc[:split], self.y.iloc[:split])
+        np.testing.assert_allclose(predict(model, scaler, values[split:], self.columns),
+                                   reference.predict(self.X.iloc[split:]))
+
+    def test_train_asset_models_with_backend(self):
+        models, performance, errors = train_asset_models(
+            {'A': (self.X, self.y)}, n_jobs=1, backend='hist_gradient_boosting'
+        )
+        self.assertEqual(errors, {})
+        self.assertEqual(models['A']['backend'], 'hist_gradient_boosting')
+        self.assertIsNone(models['A']['scaler'])
+        with self.assertRaises(ValueError):
+            train_asset_models({'A': (self.X, self.y)}, backend='xgboost')
+
+    def test_registered_backend(self):
+        register_backend('linear', lambda random_state: LinearRegression())
+        try:
+            models, _, errors = train_asset_models({'A': (self.X, self.y)}, n_jobs=1, backend='linear')
+            self.assertEqual(errors, {})
+            self.assertIsInstance(models['A']['model'], LinearRegression)
+        finally:
+            del model_backends._BACKENDS['linear']
+
+    def test_benchmark(self):
+        results = benchmark_backends(self.X, self.y, latency_samples=5)
+        self.assertEqual(list(results.index), available_backends())
+        self.assertEqual(list(results.columns), [
+            'train_seconds', 'batch_predict_seconds', 'single_predict_ms', 'single_predict_p99_ms',
+            'r2_score', 'rmse', 'directional_accuracy'
+        ])
+        self.assertTrue((results['train_seconds'] > 0).all())
+        self.assertTrue(results['directional_accuracy'].between(0, 1).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests for the financial_mcp.model_registry module
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.model_registry import ModelRegistry, data_fingerprint
+from financial_mcp.training import build_training_set, train_asset_models, train_pooled_model
+from test_training import make_asset, HAS_SKLEARN
+from test_single_flight import run_concurrently
+
+try:
+    from enhanced_fetch_data import EnhancedDataFetcher
+    HAS_ENHANCED = True
+except ImportError:
+    HAS_ENHANCED = False
+
+
+class TestDataFingerprint(unittest.TestCase):
+    """Training-data fingerprint"""
+
+    def test_fingerprint_tracks_content(self):
+        data, _ = make_asset()
+        first = data_fingerprint({'A': data, 'B': data})
+        self.assertEqual(first, data_fingerprint({'B': data, 'A': data.copy()}))
+
+        changed = data.copy()
+        changed.iloc[-1, 0] += 1e-9
+        self.assertNotEqual(first, data_fingerprint({'A': changed, 'B': data}))
+        self.assertNotEqual(first, data_fingerprint({'A': data, 'C': data}))
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestModelRegistry(unittest.TestCase):
+    """Versioned manifest and lazy loading"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.training_sets = {}
+        for seed, asset in enumerate(['A', 'B', 'C']):
+            data, features = make_asset(seed, n_days=150)
+            cls.training_sets[asset] = build_training_set(features, data)
+        cls.models, cls.performance, _ = train_asset_models(
+            cls.training_sets, n_jobs=1, backend='hist_gradient_boosting'
+        )
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name) / 'models'
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_register_writes_manifest(self):
+        registry = ModelRegistry(self.directory)
+        version = registry.register(self.models, self.performance, 'abc')
+        self.assertEqual(version, 1)
+
+        with open(self.directory / 'manifest.json') as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['latest'], 1)
+        entry = manifest['versions']['1']
+        self.assertEqual(entry['data_fingerprint'], 'abc')
+        self.assertEqual(set(entry['models']), {'A', 'B', 'C'})
+        self.assertEqual(entry['models']['A']['metrics'], self.performance['A'])
+        self.assertEqual(entry['models']['A']['backend'], 'hist_gradient_boosting')
+        self.assertEqual(registry.verify(), {'A': True, 'B': True, 'C': True})
+
+        (self.directory / entry['models']['B']['file']).write_bytes(b'corrupt')
+        self.assertFalse(registry.verify()['B'])
+
+    def test_lazy_loading_and_lru_bound(self):
+        ModelRegistry(self.directory).register(self.models, self.performance)
+        registry = ModelRegistry(self.directory, max_loaded=2)
+        self.assertEqual(registry.loaded(), [])
+
+        X, _ = self.training_sets['A']
+        model_data = registry.get('A')
+        np.testing.assert_allclose(model_data['model'].predict(X.iloc[-5:]),
+                                   self.models['A']['model'].predict(X.iloc[-5:]))
+        self.assertIs(registry.get('A'), model_data)
+
+        registry.get('B')
+        registry.get('A')
+        registry.get('C')
+        self.assertEqual(registry.loaded(), [(1, 'A'), (1, 'C')])
+
+        with self.assertRaises(KeyError):
+            registry.get('D')
+
+    def test_predictor(self):
+        ModelRegistry(self.directory).register(self.models, self.performance)
+        registry = ModelRegistry(self.directory)
+        X, _ = self.training_sets['B']
+        predictor = registry.get_predictor('B')
+        self.assertIs(registry.get_predictor('B'), predictor)
+        np.testing.assert_allclose(predictor(X.iloc[-5:].to_numpy()),
+                                   self.models['B']['model'].predict(X.iloc[-5:]))
+
+    def test_predictors_are_evicted_with_their_models(self):
+        ModelRegistry(self.directory).register(self.models, self.performance)
+        registry = ModelRegistry(self.directory, max_loaded=2)
+        for name in ('A', 'B', 'C'):
+            registry.get_predictor(name)
+        self.assertEqual(registry.loaded(), [(1, 'B'), (1, 'C')])
+        self.assertEqual(set(registry._predictors), {(1, 'B'), (1, 'C')})
+
+        # A cached predictor counts as a use of its model
+        registry.get_predictor('B')
+        registry.get('A')
+        self.assertEqual(registry.loaded(), [(1, 'B'), (1, 'A')])
+        self.assertEqual(set(registry._predictors), {(1, 'B')})
+
+    def test_concurrent_registrations_get_distinct_versions(self):
+        # One registry per worker process, all opened before any registration
+        registries = [ModelRegistry(self.directory) for _ in range(4)]
+        turns = iter(registries)
+        versions = run_concurrently(lambda: next(turns).register({'A': self.models['A']}), 4)
+
+        self.assertEqual(sorted(versions), [1, 2, 3, 4])
+        registry = ModelRegistry(self.directory)
+        self.assertEqual(registry.versions(), [1, 2, 3, 4])
+        self.assertEqual(registry.latest_version, 4)
+        self.assertTrue(all(registry.verify(version)['A'] for version in versions))
+
+    def test_versions_refresh_and_prune(self):
+        writer = ModelRegistry(self.directory)
+        reader = ModelRegistry(self.directory)
+        writer.register(self.models, self.performance)
+        reader.refresh()
+        self.assertEqual(reader.latest_version, 1)
+
+        model_data, performance = train_pooled_model(self.training_sets, n_jobs=1,
+                                                     backend='hist_gradient_boosting')
+        writer.register({'pooled': model_data}, performance)
+        self.assertEqual(writer.versions(), [1, 2])
+        self.assertEqual(set(writer.models()['pooled']['metrics']), {'A', 'B', 'C'})
+        self.assertEqual(writer.get('A', version=1)['features'], self.models['A']['features'])
+
+        self.assertEqual(writer.prune(keep=1), [1])
+        self.assertEqual(writer.versions(), [2])
+        self.assertFalse((self.directory / 'v1').exists())
+        with self.assertRaises(KeyError):
+            writer.get('A', version=1)
+
+    @unittest.skipUnless(HAS_ENHANCED, "enhanced_fetch_data dependencies not installed")
+    def test_retrains_prune_old_versions(self):
+        fetcher = EnhancedDataFetcher.__new__(EnhancedDataFetcher)
+        fetcher.indicator_states = {}
+        fetcher.online_models = {}
+        fetcher.keep_model_versions = 2
+
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        try:
+            for _ in range(3):
+                fetcher.save_enhanced_data({}, {}, {'A': self.models['A']}, self.performance)
+        finally:
+            os.chdir(cwd)
+
+        registry = ModelRegistry(self.directory)
+        self.assertEqual(registry.versions(), [2, 3])
+        self.assertEqual(sorted(path.name for path in self.directory.glob('v*')), ['v2', 'v3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for the financial_mcp.monte_carlo module
+"""
+
+import unittest
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.cli import create_parser, run_analyze
+from financial_mcp.monte_carlo import monte_carlo_var, simulate_portfolio_returns
+from financial_mcp.storage import save_frame
+from test_analyze import make_returns
+
+
+def make_complete_returns(n_days=500, n_assets=4, seed=7):
+    """Correlated Gaussian returns without missing values"""
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 1, size=(n_days, 1))
+    values = 0.05 + 0.8 * common + rng.normal(0, 0.6, size=(n_days, n_assets))
+    return pd.DataFrame(values, columns=[f"B{i}" for i in range(n_assets)])
+
+
+class TestSimulation(unittest.TestCase):
+    """Test the simulated portfolio returns"""
+
+    def test_reproducible_across_workers(self):
+        """The same seed gives identical paths for any number of workers"""
+        df = make_returns()
+        for method in ('gaussian', 'student_t', 'bootstrap'):
+            serial = simulate_portfolio_returns(df, n_paths=5000, horizon=3, method=method,
+                                                seed=11, chunk_size=700, n_jobs=1)
+            pooled = simulate_portfolio_returns(df, n_paths=5000, horizon=3, method=method,
+                                                seed=11, chunk_size=700, n_jobs=2)
+            self.assertEqual(len(serial), 5000)
+            np.testing.assert_array_equal(serial, pooled)
+
+    def test_one_day_matches_full_paths(self):
+        """The one-day projection is consistent with full multi-day asset paths"""
+        df = make_complete_returns()
+        weights = {'B0': 0.5, 'B1': 0.3, 'B3': 0.2}
+        projected = simulate_portfolio_returns(df, weights, n_paths=40000, seed=1, n_jobs=1)
+
+        # Two independent days roughly double the mean and the variance
+        full = simulate_portfolio_returns(df, weights, n_paths=40000, horizon=2, seed=2, n_jobs=1)
+        self.assertAlmostEqual(full.mean(), 2 * projected.mean(), delta=0.05)
+        self.assertAlmostEqual(full.std(), np.sqrt(2) * projected.std(), delta=0.05)
+
+    def test_weights_validation(self):
+        """Unknown assets and misaligned weights are rejected"""
+        df = make_returns()
+        with self.assertRaises(ValueError):
+            simulate_portfolio_returns(df, {'missing': 1.0}, n_paths=10, n_jobs=1)
+        with self.assertRaises(ValueError):
+            simulate_portfolio_returns(df, [0.5, 0.5], n_paths=10, n_jobs=1)
+        with self.assertRaises(ValueError):
+            simulate_portfolio_returns(df, n_paths=10, method='student_t', dof=2, n_jobs=1)
+
+
+class TestMonteCarloVaR(unittest.TestCase):
+    """Test VaR and CVaR figures"""
+
+    def test_gaussian_matches_analytic(self):
+        """Gaussian VaR/CVaR converge to the closed-form normal values"""
+        df = make_complete_returns()
+        weights = np.array([0.4, 0.3, 0.2, 0.1])
+        result = monte_carlo_var(df, weights, n_paths=400000, seed=3, n_jobs=1)
+
+        mean = df.mean().to_numpy() @ weights
+        std = np.sqrt(weights @ df.cov().to_numpy() @ weights)
+        for confidence in (0.95, 0.99):
+            label = f"{round(confidence * 100):d}"
+            z = stats.norm.ppf(1 - confidence)
+            expected_var = mean + std * z
+            expected_cvar = mean - std * stats.norm.pdf(z) / (1 - confidence)
+            # Ledoit-Wolf shrinkage moves the covariance slightly
+            self.assertAlmostEqual(result[f'var_{label}'], expected_var, delta=0.05)
+            self.assertAlmostEqual(result[f'cvar_{label}'], expected_cvar, delta=0.05)
+            self.assertLessEqual(result[f'cvar_{label}'], result[f'var_{label}'])
+
+    def test_bootstrap_matches_history(self):
+        """One-day bootstrap reproduces the historical portfolio quantile"""
+        df = make_complete_returns()
+        result = monte_carlo_var(df, n_paths=400000, method='bootstrap', seed=5, n_jobs=1)
+        historical = df.mean(axis=1)
+        self.assertAlmostEqual(result['var_95'], historical.quantile(0.05), delta=0.05)
+
+    def test_loss_distribution(self):
+        """The loss histogram covers every path"""
+        result = monte_carlo_var(make_returns(), n_paths=2000, bins=20, seed=0, n_jobs=1)
+        distribution = result['loss_distribution']
+        self.assertEqual(len(distribution['counts']), 20)
+        self.assertEqual(len(distribution['bin_edges']), 21)
+        self.assertEqual(sum(distribution['counts']), 2000)
+        self.assertAlmostEqual(sum(result['weights'].values()), 1.0)
+
+
+    def test_cli_portfolio_weights(self):
+        """analyze --mc-weights simulates the given portfolio"""
+        with self.assertRaises(SystemExit):
+            create_parser().parse_args(['analyze', '--mc-weights', 'B0:0.5'])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            df = make_complete_returns()
+            df.index = pd.date_range('2022-01-03', periods=len(df), freq='B', name='Date')
+            save_frame(df, Path(tmp), 'combined_daily_returns_2020_2024')
+            args = create_parser().parse_args([
+                'analyze', '--input-dir', tmp, '--output-dir', tmp,
+                '--mc-paths', '1000', '--mc-weights', 'B0=0.75', 'B2=0.25'
+            ])
+            self.assertEqual(run_analyze(args), 0)
+            with open(Path(tmp) / 'risk_metrics.json') as f:
+                monte_carlo = json.load(f)['monte_carlo']
+        self.assertEqual(monte_carlo['weights'], {'B0': 0.75, 'B2': 0.25})
+
+
+if __name__ == '__main__':
+    unittest.main()
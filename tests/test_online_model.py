@@ -0,0 +1,125 @@
+"""
+Tests for the financial_mcp.online_model module
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.online_model import (
+    OnlineRLSRegressor, train_online_models, save_online_models, load_online_models
+)
+from financial_mcp.training import build_training_set
+from test_training import make_asset
+
+
+def make_regression(seed=0, n_rows=300, n_features=4):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features)) * [1, 2, 0.5, 3] + [0, 1, -1, 2]
+    y = X @ np.array([0.5, -0.2, 1.0, 0.1]) + 0.3 + rng.normal(scale=0.1, size=n_rows)
+    return X, y
+
+
+class TestOnlineRLSRegressor(unittest.TestCase):
+    """Recursive least squares updates"""
+
+    def setUp(self):
+        self.X, self.y = make_regression()
+        self.columns = ['a', 'b', 'c', 'd']
+
+    def test_fit_equals_sequential_updates(self):
+        model = OnlineRLSRegressor(self.columns, forgetting=0.99).fit(self.X[:200], self.y[:200])
+        model.partial_fit(self.X[200:], self.y[200:])
+
+        # Same frozen scaler, every row through the RLS recursion
+        sequential = OnlineRLSRegressor(self.columns, forgetting=0.99)
+        sequential.mean, sequential.scale = model.mean, model.scale
+        sequential.partial_fit(self.X, self.y)
+
+        np.testing.assert_allclose(model.weights, sequential.weights, rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(model.predict(self.X[:5]), sequential.predict(self.X[:5]), rtol=1e-8)
+        self.assertEqual(model.count, 300)
+
+    def test_recovers_coefficients_and_skips_missing_rows(self):
+        model = OnlineRLSRegressor(self.columns, forgetting=1.0).fit(self.X, self.y)
+        np.testing.assert_allclose(model.predict(self.X), self.X @ [0.5, -0.2, 1.0, 0.1] + 0.3, atol=0.05)
+
+        weights = model.weights.copy()
+        row = self.X[:1].copy()
+        row[0, 2] = np.nan
+        model.partial_fit(row, [1.0])
+        np.testing.assert_array_equal(model.weights, weights)
+
+    def test_forgetting_tracks_regime_change(self):
+        flipped = -self.y
+        errors = {}
+        for forgetting in (1.0, 0.95):
+            model = OnlineRLSRegressor(self.columns, forgetting=forgetting).fit(self.X, self.y)
+            model.partial_fit(self.X[:100], flipped[:100])
+            errors[forgetting] = np.abs(model.predict(self.X[100:]) - flipped[100:]).mean()
+        self.assertLess(errors[0.95], errors[1.0] / 5)
+
+    def test_observe_learns_pending_row_from_next_close(self):
+        model = OnlineRLSRegressor(self.columns).fit(self.X[:200], self.y[:200])
+        index = pd.bdate_range('2024-01-01', periods=3)
+        features = pd.DataFrame(self.X[200:203], index=index, columns=self.columns)
+        closes = pd.Series([100.0, 102.0, 101.0], index=index)
+
+        self.assertEqual(model.observe(features, closes), 2)
+        np.testing.assert_array_equal(model.pending_row, self.X[202])
+        self.assertEqual(model.last_date, index[-1])
+
+        expected = OnlineRLSRegressor(self.columns).fit(self.X[:200], self.y[:200])
+        expected.partial_fit(self.X[200:202], [2.0, (101 / 102 - 1) * 100])
+        np.testing.assert_allclose(model.weights, expected.weights)
+
+    def test_checkpoint_roundtrip(self):
+        model = OnlineRLSRegressor(self.columns, forgetting=0.98).fit(self.X, self.y)
+        model.pending_row = self.X[-1]
+        model.pending_close = 50.0
+        model.last_date = pd.Timestamp('2024-05-01')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'online' / 'A.npz'
+            model.save(path)
+            restored = OnlineRLSRegressor.load(path)
+
+        np.testing.assert_array_equal(restored.predict(self.X), model.predict(self.X))
+        np.testing.assert_array_equal(restored.covariance, model.covariance)
+        np.testing.assert_array_equal(restored.pending_row, model.pending_row)
+        self.assertEqual((restored.forgetting, restored.count, restored.pending_close, restored.last_date),
+                         (0.98, 300, 50.0, model.last_date))
+
+
+class TestOnlineModelSet(unittest.TestCase):
+    """Per-asset online models"""
+
+    def test_train_save_load(self):
+        training_sets, features, closes = {}, {}, {}
+        for seed, asset in enumerate(['A', 'B']):
+            data, features[asset] = make_asset(seed)
+            training_sets[asset] = build_training_set(features[asset], data)
+            closes[asset] = data['Close']
+
+        models = train_online_models(training_sets, features, closes)
+        self.assertEqual(models['A'].last_date, features['A'].index[-1])
+        self.assertEqual(models['A'].pending_close, closes['A'].iloc[-1])
+        np.testing.assert_array_equal(models['A'].pending_row, features['A'].iloc[-1].to_numpy())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertEqual(load_online_models(Path(temp_dir) / 'missing'), {})
+            save_online_models(models, temp_dir)
+            restored = load_online_models(temp_dir)
+        self.assertEqual(set(restored), {'A', 'B'})
+        np.testing.assert_array_equal(restored['B'].weights, models['B'].weights)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for the financial_mcp.online_stats module
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.analyze import analyze_returns
+from financial_mcp.online_stats import OnlineReturnStatistics, REVISION_DAYS
+from test_analyze import make_returns
+
+
+class TestOnlineReturnStatistics(unittest.TestCase):
+    """Test incremental statistics against the full-history analysis"""
+
+    def assert_matches_full_history(self, state, df):
+        expected = analyze_returns(df)
+        actual = state.results()
+        self.assertEqual(set(actual.keys()), set(expected.keys()))
+        for asset, metrics in actual.items():
+            for name, value in metrics.items():
+                with self.subTest(asset=asset, metric=name):
+                    np.testing.assert_allclose(value, expected[asset][name], rtol=1e-8, atol=1e-10,
+                                               equal_nan=True)
+
+    def test_matches_analyze_returns(self):
+        """Row-by-row updates reproduce analyze_returns"""
+        df = make_returns()
+        self.assert_matches_full_history(OnlineReturnStatistics.from_returns(df), df)
+
+    def test_persisted_state_resumes(self):
+        """A saved state continues with only the new rows"""
+        df = make_returns()
+        state = OnlineReturnStatistics.from_returns(df.iloc[:300])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'stats_state.npz'
+            state.save(path)
+            restored = OnlineReturnStatistics.load(path)
+
+        self.assertEqual(restored.update_frame(df), 100)
+        self.assertEqual(restored.update_frame(df), 0)
+        self.assert_matches_full_history(restored, df)
+
+    def test_changed_history_rebuilds(self):
+        """Late and restated values in the revision window are not lost"""
+        df = make_returns()
+
+        # A lagging asset reports its last bar late, another restates a return
+        late = df.copy()
+        late.iloc[299, 0] = np.nan
+        restated = df.copy()
+        restated.iloc[296, 3] = 5.0
+
+        for name, seen in (('late', late), ('restated', df)):
+            with self.subTest(name):
+                state = OnlineReturnStatistics.from_returns(seen.iloc[:300])
+                updated = df if name == 'late' else restated
+                with tempfile.TemporaryDirectory() as tmp:
+                    path = Path(tmp) / 'stats_state.npz'
+                    state.save(path)
+                    restored = OnlineReturnStatistics.load(path)
+                self.assertEqual(restored.sync_frame(updated), len(updated))
+                self.assert_matches_full_history(restored, updated)
+
+        # An unchanged history only consumes the new rows and hashes a bounded tail
+        state = OnlineReturnStatistics.from_returns(df.iloc[:300])
+        self.assertEqual(state.sync_frame(df), 100)
+        self.assertEqual(state.sync_frame(df), 0)
+        self.assertLessEqual(len(state.row_hashes), REVISION_DAYS)
+        self.assert_matches_full_history(state, df)
+
+        # Rows older than the revision window are treated as final
+        old = df.copy()
+        old.iloc[100, 0] = 5.0
+        self.assertEqual(state.sync_frame(old), 0)
+
+if __name__ == '__main__':
+    unittest.main()
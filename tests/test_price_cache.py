@@ -0,0 +1,123 @@
+"""
+Tests for the financial_mcp.price_cache module
+"""
+
+import unittest
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.price_cache import PriceCache, missing_ranges
+
+
+class RecordingDownloader:
+    """Fake downloader that records every requested range"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start_date, end_date, interval):
+        self.calls.append((start_date, end_date))
+        index = pd.date_range(start_date, end_date, freq='D', inclusive='left')
+        return pd.DataFrame({'Close': range(len(index))}, index=index, dtype=float)
+
+
+class TestPriceCache(unittest.TestCase):
+    """Test incremental refresh of the price cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.downloader = RecordingDownloader()
+        self.cache = PriceCache(self.tmp.name, downloader=self.downloader)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_missing_ranges_are_downloaded(self):
+        """Repeated and extended requests download only the delta"""
+        first = self.cache.get_history('^GSPC', '2021-01-01', '2021-02-01')
+        again = self.cache.get_history('^GSPC', '2021-01-10', '2021-01-20')
+        extended = self.cache.get_history('^GSPC', '2020-12-01', '2021-03-01')
+
+        self.assertEqual(self.downloader.calls, [
+            ('2021-01-01', '2021-02-01'),
+            ('2020-12-01', '2021-01-01'),
+            ('2021-02-01', '2021-03-01'),
+        ])
+        self.assertEqual(len(first), 31)
+        self.assertEqual(len(again), 10)
+        self.assertEqual(len(extended), 90)
+        self.assertTrue(extended.index.is_monotonic_increasing)
+
+    def test_cache_persists_across_instances(self):
+        """A new cache instance reuses the ranges stored on disk"""
+        self.cache.get_history('BTC-USD', '2021-01-01', '2021-02-01')
+        reopened = PriceCache(self.tmp.name, downloader=self.downloader)
+        reopened.get_history('BTC-USD', '2021-01-01', '2021-02-01')
+
+        self.assertEqual(len(self.downloader.calls), 1)
+        self.assertEqual(
+            reopened.covered_ranges('BTC-USD'),
+            [(pd.Timestamp('2021-01-01'), pd.Timestamp('2021-02-01'))]
+        )
+
+    def test_empty_or_short_downloads_are_retried(self):
+        """Coverage stops at the last bar received; empty downloads cover nothing"""
+        def flaky(symbol, start_date, end_date, interval):
+            self.downloader.calls.append((start_date, end_date))
+            if len(self.downloader.calls) <= 2:
+                # yfinance reports errors and rate limits as an empty frame
+                return pd.DataFrame()
+            # Bars only up to 2021-01-20, with a tz-aware index like Ticker.history
+            index = pd.date_range(start_date, '2021-01-20', freq='D', tz='America/New_York')
+            return pd.DataFrame({'Close': range(len(index))}, index=index, dtype=float)
+
+        cache = PriceCache(self.tmp.name, downloader=flaky)
+        self.assertTrue(cache.get_history('^GSPC', '2021-01-01', '2021-02-01').empty)
+        self.assertEqual(cache.covered_ranges('^GSPC'), [])
+        self.assertTrue(cache.get_history('^GSPC', '2021-01-01', '2021-02-01').empty)
+
+        self.assertEqual(len(cache.get_history('^GSPC', '2021-01-01', '2021-02-01')), 20)
+        self.assertEqual(cache.covered_ranges('^GSPC'),
+                         [(pd.Timestamp('2021-01-01'), pd.Timestamp('2021-01-21'))])
+        self.assertEqual(cache.missing('^GSPC', '2021-01-01', '2021-02-01'), [('2021-01-21', '2021-02-01')])
+
+    def test_expired_entries_are_downloaded_again(self):
+        """max_age_days forces a full re-download of adjusted prices"""
+        self.cache.get_history('^GSPC', '2021-01-01', '2021-02-01')
+        fresh = PriceCache(self.tmp.name, downloader=self.downloader, max_age_days=30)
+        fresh.get_history('^GSPC', '2021-01-01', '2021-02-01')
+        self.assertEqual(len(self.downloader.calls), 1)
+
+        # Pretend the entry was first downloaded long ago
+        manifest_path = fresh._paths('^GSPC', '1d')[1]
+        manifest = json.loads(manifest_path.read_text())
+        manifest['created'] = '2021-02-01'
+        manifest_path.write_text(json.dumps(manifest))
+
+        self.assertTrue(fresh.expired('^GSPC'))
+        self.assertEqual(len(fresh.get_history('^GSPC', '2021-01-01', '2021-02-01')), 31)
+        self.assertEqual(len(self.downloader.calls), 2)
+        self.assertFalse(fresh.expired('^GSPC'))
+        self.assertFalse(self.cache.expired('^GSPC'))
+
+    def test_missing_ranges(self):
+        """Gaps between covered ranges are reported"""
+        ts = pd.Timestamp
+        covered = [(ts('2021-01-05'), ts('2021-01-10')), (ts('2021-01-15'), ts('2021-01-20'))]
+        self.assertEqual(
+            missing_ranges(covered, ts('2021-01-01'), ts('2021-01-25')),
+            [(ts('2021-01-01'), ts('2021-01-05')),
+             (ts('2021-01-10'), ts('2021-01-15')),
+             (ts('2021-01-20'), ts('2021-01-25'))]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
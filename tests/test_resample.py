@@ -0,0 +1,75 @@
+"""
+Tests for the financial_mcp.resample module
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.resample import compound_returns, period_statistics, resample_rule
+from test_analyze import make_returns
+
+
+class TestCompoundReturns(unittest.TestCase):
+    """Test panel compounding against the per-asset resample lambda"""
+
+    def test_matches_resample_apply(self):
+        """Every frequency matches (1 + x/100).prod() - 1 per asset"""
+        df = make_returns()
+
+        for freq in ('W', 'M', 'Q', 'Y'):
+            with self.subTest(freq=freq):
+                result = compound_returns(df, freq)
+                for asset in df.columns:
+                    returns = df[asset].dropna()
+                    if returns.empty:
+                        self.assertTrue(result[asset].isna().all())
+                        continue
+                    expected = returns.resample(resample_rule(freq)).apply(
+                        lambda x: (1 + x / 100).prod() - 1
+                    ) * 100
+                    actual = result[asset].dropna()
+                    self.assertTrue(actual.index.equals(expected.index))
+                    np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_dictionary_of_series(self):
+        """Per-asset Series with different calendars are aligned"""
+        df = make_returns()
+        series = {asset: df[asset].dropna() for asset in ('A0', 'A5')}
+        result = compound_returns(series, 'M')
+        np.testing.assert_allclose(result['A0'], compound_returns(df[['A0']], 'M')['A0'])
+        self.assertEqual(result['A5'].notna().sum(), 1)
+
+    def test_unsupported_frequency(self):
+        """Unknown aliases are rejected"""
+        with self.assertRaises(ValueError):
+            compound_returns(make_returns(), 'fortnight')
+
+
+class TestPeriodStatistics(unittest.TestCase):
+    """Test statistics derived from period returns"""
+
+    def test_statistics(self):
+        """Best/worst/average/volatility follow the period returns"""
+        period_returns = compound_returns(make_returns(), 'M')
+        stats = period_statistics(period_returns)
+
+        for asset in ('A0', 'A3'):
+            returns = period_returns[asset].dropna()
+            self.assertAlmostEqual(stats.loc[asset, 'best'], returns.max())
+            self.assertAlmostEqual(stats.loc[asset, 'worst'], returns.min())
+            self.assertAlmostEqual(stats.loc[asset, 'average'], returns.mean())
+            self.assertAlmostEqual(stats.loc[asset, 'volatility'], returns.std())
+            self.assertEqual(stats.loc[asset, 'positive_periods'], (returns > 0).sum())
+            self.assertEqual(stats.loc[asset, 'total_periods'], len(returns))
+        self.assertEqual(stats.loc['A4', 'total_periods'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
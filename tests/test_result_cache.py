@@ -0,0 +1,250 @@
+"""
+Tests for the financial_mcp.result_cache module
+"""
+
+import unittest
+import sys
+import itertools
+import threading
+import time
+from pathlib import Path
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.result_cache import (
+    LRUCache, RedisCache, SharedSnapshotStore, cache_settings, connect_cache
+)
+from test_scheduler import wait_until
+from test_single_flight import run_concurrently
+
+try:
+    import fakeredis
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+def payloads(price):
+    return {'prices': {'A': {'current': price}}, 'alerts': [{'asset': 'A'}]}
+
+
+def failing_loader():
+    raise AssertionError("follower should not compute a snapshot")
+
+
+class TestCacheSettings(unittest.TestCase):
+    """Settings from environment variables"""
+
+    def test_defaults_and_overrides(self):
+        self.assertEqual(cache_settings({}), {'redis_url': None, 'cache_ttl': 3600.0, 'poll_interval': 5.0,
+                                              'stale_after': 900.0})
+        settings = cache_settings({'REDIS_URL': 'redis://redis:6379/0', 'CACHE_TTL': '60'})
+        self.assertEqual((settings['redis_url'], settings['cache_ttl']), ('redis://redis:6379/0', 60.0))
+        with self.assertRaises(ValueError):
+            cache_settings({'CACHE_POLL_INTERVAL': '0'})
+
+    def test_without_redis_the_cache_is_in_process(self):
+        self.assertIsInstance(connect_cache(None), LRUCache)
+        # Nothing listens on port 1
+        self.assertIsInstance(connect_cache('redis://127.0.0.1:1/0'), LRUCache)
+
+
+class TestLRUCache(unittest.TestCase):
+    """In-process fallback cache"""
+
+    def test_ttl_eviction_and_counters(self):
+        cache = LRUCache(max_entries=2, default_ttl=60)
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        cache.get('a')
+        cache.set('c', b'3')  # evicts b, the least recently used
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), [b'1', None, b'3'])
+
+        cache.set('short', b'x', ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('short'))
+
+        self.assertEqual([cache.incr('n'), cache.incr('n'), cache.incr('n', 5)], [1, 2, 7])
+        cache.delete('n')
+        self.assertEqual(cache.incr('n'), 1)
+
+        self.assertTrue(cache.add('lock', b'1', ttl=0.01))
+        self.assertFalse(cache.add('lock', b'2'))
+        time.sleep(0.02)
+        self.assertTrue(cache.add('lock', b'3'))
+
+        self.assertFalse(cache.delete_if('lock', b'1'))
+        self.assertTrue(cache.delete_if('lock', b'3'))
+        self.assertIsNone(cache.get('lock'))
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis not installed")
+class TestRedisCache(unittest.TestCase):
+    """Redis-backed cache against fakeredis"""
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.client = fakeredis.FakeRedis(server=self.server)
+
+    def test_values_are_prefixed_and_expire(self):
+        cache = RedisCache(self.client, default_ttl=60)
+        cache.set_many({'a': b'1', 'b': b'2'})
+        cache.set('c', b'3', ttl=0.5)
+        self.assertEqual(cache.get_many(['a', 'b', 'missing']), [b'1', b'2', None])
+        self.assertEqual(self.client.get('financial_mcp:c'), b'3')
+        self.assertGreater(self.client.pttl('financial_mcp:a'), 50000)
+        self.assertLessEqual(self.client.pttl('financial_mcp:c'), 500)
+        self.assertEqual([cache.incr('n'), cache.incr('n', 2)], [1, 3])
+        self.assertTrue(cache.add('lock', b'1'))
+        self.assertFalse(cache.add('lock', b'2'))
+        self.assertEqual(cache.get('lock'), b'1')
+        self.assertFalse(cache.delete_if('lock', b'2'))
+        self.assertEqual(cache.get('lock'), b'1')
+        self.assertTrue(cache.delete_if('lock', b'1'))
+        self.assertIsNone(self.client.get('financial_mcp:lock'))
+
+    def test_outage_falls_back_to_process_cache(self):
+        cache = RedisCache(self.client)
+        cache.set('a', b'redis')
+        self.server.connected = False
+        cache.set('a', b'local')
+        self.assertFalse(cache.available)
+        self.assertEqual(cache.get('a'), b'local')
+
+        self.server.connected = True
+        self.assertEqual(cache.get('a'), b'redis')
+        self.assertTrue(cache.available)
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis not installed")
+class TestSharedSnapshotStore(unittest.TestCase):
+    """Snapshots shared between a writer and followers"""
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+
+    def cache(self):
+        return RedisCache(fakeredis.FakeRedis(server=self.server))
+
+    def test_followers_adopt_the_writer_snapshot(self):
+        state = {'price': 1.0}
+        writer = SharedSnapshotStore(lambda: payloads(state['price']), self.cache())
+        follower = SharedSnapshotStore(failing_loader, self.cache(), follower=True)
+        published = []
+        follower.subscribe(lambda previous, snapshot: published.append(snapshot.version))
+
+        first = writer.refresh()
+        adopted = follower.refresh()
+        self.assertEqual(adopted.version, first.version)
+        self.assertEqual(dict(adopted.bodies), dict(first.bodies))
+        self.assertEqual(dict(adopted.etags), dict(first.etags))
+        self.assertEqual(adopted.payloads['prices'], {'A': {'current': 1.0}})
+
+        # Nothing new: the follower keeps its snapshot and notifies nobody
+        self.assertIs(follower.refresh(), adopted)
+
+        state['price'] = 2.0
+        second = writer.refresh()
+        self.assertEqual(follower.sync().version, second.version)
+        self.assertEqual(follower.current.payloads['prices'], {'A': {'current': 2.0}})
+        self.assertEqual(published, [first.version, second.version])
+
+    def test_follower_computes_when_nothing_is_cached(self):
+        follower = SharedSnapshotStore(lambda: payloads(1.0), self.cache(), follower=True)
+        self.assertIsNone(follower.sync())
+        self.assertEqual(follower.refresh().version, 1)
+
+        # Expired bodies are not adopted
+        other = SharedSnapshotStore(failing_loader, self.cache(), follower=True)
+        client = fakeredis.FakeRedis(server=self.server)
+        client.delete(*client.keys('financial_mcp:snapshot:1:*'))
+        self.assertIsNone(other.sync())
+
+    def test_versions_never_go_backwards(self):
+        writer = SharedSnapshotStore(lambda: payloads(1.0), self.cache())
+        for _ in range(3):
+            writer.refresh()
+        fakeredis.FakeRedis(server=self.server).flushall()
+        self.assertEqual(writer.refresh().version, 4)
+
+    def test_concurrent_followers_compute_once(self):
+        runs = []
+
+        def slow_loader():
+            runs.append(1)
+            time.sleep(0.3)
+            return payloads(1.0)
+
+        # Two worker processes, each refreshing from several threads
+        followers = [SharedSnapshotStore(slow_loader, self.cache(), follower=True) for _ in range(2)]
+        turns = itertools.count()
+        snapshots = run_concurrently(lambda: followers[next(turns) % 2].refresh(), 8)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual({snapshot.version for snapshot in snapshots}, {1})
+        self.assertEqual([store.current.version for store in followers], [1, 1])
+        self.assertIsNone(fakeredis.FakeRedis(server=self.server).get('financial_mcp:snapshot:lock'))
+
+    def test_stale_snapshot_is_served_while_revalidating(self):
+        release = threading.Event()
+        state = {'price': 1.0}
+
+        def loader():
+            release.wait(5)
+            return payloads(state['price'])
+
+        writer = SharedSnapshotStore(lambda: payloads(1.0), self.cache())
+        writer.refresh()
+        follower = SharedSnapshotStore(loader, self.cache(), follower=True, stale_after=0.01)
+        time.sleep(0.02)
+
+        # Returned at once while a single background refresh runs
+        state['price'] = 2.0
+        stale = follower.refresh()
+        self.assertEqual(stale.version, 1)
+        self.assertIs(follower.refresh(), stale)
+        self.assertEqual(follower.flight.executions, 1)
+
+        release.set()
+        self.assertTrue(wait_until(lambda: follower.current.version == 2))
+        self.assertEqual(follower.current.payloads['prices'], {'A': {'current': 2.0}})
+        # The revalidated snapshot is shared with the other workers
+        self.assertEqual(SharedSnapshotStore(failing_loader, self.cache(), follower=True).refresh().version, 2)
+
+    def test_expired_lock_of_another_worker_is_kept(self):
+        client = fakeredis.FakeRedis(server=self.server)
+
+        def slow_loader():
+            time.sleep(0.3)
+            # Our lock expired and another worker took it meanwhile
+            self.assertTrue(client.set('financial_mcp:snapshot:lock', b'other', nx=True))
+            return payloads(1.0)
+
+        follower = SharedSnapshotStore(slow_loader, self.cache(), follower=True, lock_ttl=0.1)
+        self.assertEqual(follower.refresh().version, 1)
+        self.assertEqual(client.get('financial_mcp:snapshot:lock'), b'other')
+
+    def test_wait_timeout_serves_the_current_snapshot(self):
+        writer = SharedSnapshotStore(lambda: payloads(1.0), self.cache())
+        writer.refresh()
+        runs = []
+        follower = SharedSnapshotStore(lambda: runs.append(1) or payloads(2.0), self.cache(), follower=True,
+                                       stale_after=0.01, lock_ttl=0.2)
+        self.assertEqual(follower.refresh().version, 1)
+
+        # Another worker holds the lock and never publishes
+        fakeredis.FakeRedis(server=self.server).set('financial_mcp:snapshot:lock', b'other', px=60000)
+        time.sleep(0.02)
+        self.assertEqual(follower.refresh().version, 1)
+        self.assertTrue(wait_until(lambda: not follower.flight.in_flight('compute')))
+        self.assertEqual(runs, [])
+        self.assertEqual(follower.current.version, 1)
+
+    def test_in_process_cache(self):
+        store = SharedSnapshotStore(lambda: payloads(1.0), LRUCache(), follower=True)
+        self.assertEqual(store.refresh().version, 1)
+        self.assertEqual(store.refresh().version, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests for the financial_mcp.rolling module
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.cli import create_parser, run_analyze
+from financial_mcp.rolling import RollingAnalytics, rolling_analytics, rolling_correlation_matrix
+from financial_mcp.storage import save_frame
+
+try:
+    from financial_mcp import visualize
+    HAS_PLOTTING = True
+except ImportError:
+    HAS_PLOTTING = False
+from test_analyze import make_returns
+
+
+class TestRollingAnalytics(unittest.TestCase):
+    """Test rolling analytics against pandas rolling windows"""
+
+    def test_matches_pandas_rolling(self):
+        """Per-asset windows match rolling over each asset's observations"""
+        df = make_returns()
+        result = rolling_analytics(df, windows=(5, 30), benchmark='A0')
+
+        for window in result.windows:
+            for asset in df.columns:
+                returns = df[asset].dropna()
+                rolling = returns.rolling(window)
+                expected = {
+                    'mean': rolling.mean(),
+                    'volatility': rolling.std(),
+                    'var_95': rolling.quantile(0.05),
+                }
+                pair = df[['A0', asset]].dropna()
+                bench, other = pair.iloc[:, 0], pair.iloc[:, 1]
+                pair_expected = {
+                    'beta': bench.rolling(window).cov(other) / bench.rolling(window).var(),
+                    'correlation': bench.rolling(window).corr(other),
+                }
+                for metric, values in list(expected.items()) + list(pair_expected.items()):
+                    actual = result.get(metric, window)[asset].reindex(values.index)
+                    with self.subTest(window=window, asset=asset, metric=metric):
+                        np.testing.assert_allclose(actual, values, rtol=1e-6, atol=1e-9)
+
+    def test_save_and_load(self):
+        """Saved analytics load back as a memory-mapped array"""
+        df = make_returns()
+        result = rolling_analytics(df, windows=(10,))
+        with tempfile.TemporaryDirectory() as tmp:
+            result.save(tmp)
+            loaded = RollingAnalytics.load(tmp)
+            self.assertIsInstance(loaded.values, np.memmap)
+            self.assertEqual(loaded.metrics, result.metrics)
+            np.testing.assert_array_equal(loaded.values, result.values)
+            del loaded
+
+    def test_cli_rolling_is_opt_in(self):
+        """analyze saves rolling analytics only with --rolling"""
+        with tempfile.TemporaryDirectory() as tmp:
+            save_frame(make_returns(n_days=120), Path(tmp), 'combined_daily_returns_2020_2024')
+            arguments = ['analyze', '--input-dir', tmp, '--output-dir', tmp, '--rolling-windows', '10']
+            self.assertEqual(run_analyze(create_parser().parse_args(arguments)), 0)
+            self.assertIsNone(RollingAnalytics.load(tmp))
+
+            self.assertEqual(run_analyze(create_parser().parse_args(arguments + ['--rolling', '--float32'])), 0)
+            loaded = RollingAnalytics.load(tmp)
+            self.assertEqual(loaded.windows, [10])
+            self.assertEqual(loaded.values.dtype, np.float32)
+            del loaded
+
+    @unittest.skipUnless(HAS_PLOTTING, "matplotlib/seaborn not installed")
+    def test_stale_analytics_are_recomputed_for_plots(self):
+        """The volatility plot does not reuse analytics missing newer dates"""
+        df = make_returns(n_days=120)
+        stale = rolling_analytics(df.iloc[:100], windows=(10,))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(visualize.plt, 'plot') as plot:
+            visualize.create_volatility_plot(df, tmp, window=10, rolling_analytics=stale)
+        for call in plot.call_args_list:
+            dates, values = call.args[:2]
+            self.assertEqual(dates[-1], df[call.kwargs['label']].dropna().index[-1])
+            self.assertFalse(np.isnan(values[-1]))
+
+    def test_rolling_correlation_matrix(self):
+        """Pairwise rolling correlations match DataFrame.rolling().corr()"""
+        df = make_returns()[['A0', 'A1', 'A3']]
+        actual = rolling_correlation_matrix(df, 20, min_periods=10)
+        expected = df.rolling(20, min_periods=10).corr().to_numpy().reshape(len(df), 3, 3)
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
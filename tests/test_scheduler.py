@@ -0,0 +1,120 @@
+"""
+Tests for the financial_mcp.scheduler module
+"""
+
+import unittest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.scheduler import JobScheduler, scheduler_settings
+
+try:
+    import apscheduler  # noqa: F401
+    HAS_APSCHEDULER = True
+except ImportError:
+    HAS_APSCHEDULER = False
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestSchedulerSettings(unittest.TestCase):
+    """Settings from environment variables"""
+
+    def test_defaults_and_overrides(self):
+        self.assertEqual(scheduler_settings({}),
+                         {'refresh_interval': 300.0, 'model_retrain_hours': 24.0, 'max_history_days': 365,
+                          'model_keep_versions': 5})
+        settings = scheduler_settings({'REFRESH_INTERVAL': '60', 'MODEL_RETRAIN_HOURS': '0.5',
+                                       'MAX_HISTORY_DAYS': '90', 'MODEL_KEEP_VERSIONS': '2'})
+        self.assertEqual(settings, {'refresh_interval': 60.0, 'model_retrain_hours': 0.5, 'max_history_days': 90,
+                                    'model_keep_versions': 2})
+        with self.assertRaises(ValueError):
+            scheduler_settings({'REFRESH_INTERVAL': '0'})
+
+
+class TestJobScheduler(unittest.TestCase):
+    """Overlap protection and timing metrics"""
+
+    def test_run_job_records_metrics(self):
+        scheduler = JobScheduler()
+        scheduler.add_job('ok', lambda: time.sleep(0.01), 60)
+        scheduler.add_job('fails', lambda: 1 / 0)
+        with self.assertRaises(ValueError):
+            scheduler.add_job('ok', lambda: None, 60)
+
+        self.assertTrue(scheduler.run_job('ok'))
+        self.assertFalse(scheduler.run_job('fails'))
+
+        metrics = scheduler.job_metrics()
+        self.assertEqual((metrics['ok']['runs'], metrics['ok']['failures']), (1, 0))
+        self.assertGreaterEqual(metrics['ok']['last_duration'], 0.01)
+        self.assertEqual(metrics['ok']['mean_duration'], metrics['ok']['last_duration'])
+        self.assertEqual((metrics['fails']['runs'], metrics['fails']['failures']), (1, 1))
+        self.assertIn('ZeroDivisionError', metrics['fails']['last_error'])
+        self.assertIsNone(metrics['fails']['interval_seconds'])
+
+    def test_overlapping_run_is_skipped(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+
+        scheduler = JobScheduler()
+        scheduler.add_job('slow', slow, 60)
+        worker = threading.Thread(target=scheduler.run_job, args=['slow'])
+        worker.start()
+        started.wait(5)
+
+        self.assertTrue(scheduler.job_metrics()['slow']['running'])
+        self.assertFalse(scheduler.run_job('slow'))
+        release.set()
+        worker.join()
+
+        metrics = scheduler.job_metrics()['slow']
+        self.assertEqual((metrics['runs'], metrics['skipped'], metrics['running']), (1, 1, False))
+
+    @unittest.skipUnless(HAS_APSCHEDULER, "apscheduler not installed")
+    def test_background_runs_never_stack(self):
+        active, overlaps = [0], [0]
+        lock = threading.Lock()
+
+        def slow():
+            with lock:
+                active[0] += 1
+                overlaps[0] = max(overlaps[0], active[0])
+            time.sleep(0.25)
+            with lock:
+                active[0] -= 1
+
+        scheduler = JobScheduler()
+        scheduler.add_job('slow', slow, 0.05, run_at_start=True)
+        scheduler.add_job('manual', lambda: None)
+        scheduler.start()
+        try:
+            self.assertTrue(scheduler.running)
+            self.assertTrue(wait_until(lambda: scheduler.job_metrics()['slow']['runs'] >= 2))
+        finally:
+            scheduler.shutdown(wait=True)
+
+        metrics = scheduler.job_metrics()
+        self.assertEqual(overlaps[0], 1)
+        self.assertGreater(metrics['slow']['skipped'], 0)
+        self.assertEqual(metrics['manual']['runs'], 0)
+        self.assertFalse(scheduler.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
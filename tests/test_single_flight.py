@@ -0,0 +1,89 @@
+"""
+Tests for the financial_mcp.single_flight module
+"""
+
+import unittest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.single_flight import SingleFlight
+
+
+def run_concurrently(func, count):
+    """Results (or exceptions) of count threads calling func at once"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=[i]) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Coalescing of concurrent computations"""
+
+    def test_concurrent_callers_share_one_run(self):
+        flight = SingleFlight()
+        runs = []
+
+        def compute():
+            runs.append(1)
+            time.sleep(0.2)
+            return 'result'
+
+        self.assertEqual(run_concurrently(lambda: flight.do('key', compute), 8), ['result'] * 8)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual((flight.executions, flight.coalesced), (1, 7))
+        self.assertFalse(flight.in_flight('key'))
+
+        # Later calls run again, and other keys never wait
+        self.assertEqual(flight.do('key', lambda: 'again'), 'again')
+        self.assertEqual(flight.do('other', lambda: 'other'), 'other')
+
+    def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+
+        def fail():
+            time.sleep(0.2)
+            raise ValueError("fetch failed")
+
+        results = run_concurrently(lambda: flight.do('key', fail), 4)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(flight.executions, 1)
+
+    def test_background_runs_are_not_duplicated(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        runs = []
+
+        def compute():
+            runs.append(1)
+            release.wait(5)
+
+        self.assertTrue(flight.start('key', compute))
+        while not flight.in_flight('key'):
+            time.sleep(0.01)
+        self.assertFalse(flight.start('key', compute))
+        release.set()
+        while flight.in_flight('key'):
+            time.sleep(0.01)
+        self.assertEqual(len(runs), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,295 @@
+"""
+Tests for the financial_mcp.snapshot module and the API server
+"""
+
+import unittest
+import sys
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.scheduler import JobScheduler
+from financial_mcp.snapshot import (
+    SNAPSHOT_ENDPOINTS, Snapshot, SnapshotStore, load_payloads,
+    snapshot_delta, snapshot_message, delta_message
+)
+from financial_mcp.online_model import train_online_models, save_online_models
+from financial_mcp.training import build_training_set, train_asset_models
+from test_training import make_asset, HAS_SKLEARN
+from test_scheduler import wait_until, HAS_APSCHEDULER
+
+try:
+    from fastapi.testclient import TestClient
+    from api_server import create_app, UpdateBroadcaster, CLIENT_QUEUE_SIZE
+    HAS_FASTAPI = True
+except ImportError:
+    HAS_FASTAPI = False
+
+
+def write_pipeline_outputs(directory, with_models=True):
+    """Enhanced data, features, analysis results and models of two synthetic assets"""
+    directory = Path(directory)
+    enhanced_dir = directory / 'enhanced_data'
+    enhanced_dir.mkdir()
+    all_data, features, training_sets = {}, {}, {}
+    for seed, asset in enumerate(['A', 'B']):
+        all_data[asset], features[asset] = make_asset(seed, n_days=150)
+        all_data[asset].to_csv(enhanced_dir / f'{asset}_enhanced_data.csv')
+        features[asset].to_csv(enhanced_dir / f'{asset}_features.csv')
+        training_sets[asset] = build_training_set(features[asset], all_data[asset])
+
+    # A large last move on B
+    data = all_data['B'].copy()
+    data.iloc[-1, data.columns.get_loc('Daily_Return')] = -5.0
+    data.to_csv(enhanced_dir / 'B_enhanced_data.csv')
+
+    analysis_dir = directory / 'financial_data'
+    analysis_dir.mkdir()
+    with open(analysis_dir / 'analysis_results.json', 'w') as f:
+        json.dump({'A': {'sharpe_ratio': 0.1}}, f)
+    with open(analysis_dir / 'risk_metrics.json', 'w') as f:
+        json.dump({'portfolio': {'volatility': 1.2}}, f)
+    pd.DataFrame([[1.0, 0.3], [0.3, 1.0]], index=['A', 'B'], columns=['A', 'B']).to_csv(
+        analysis_dir / 'correlation_matrix.csv'
+    )
+
+    model_dir = directory / 'models'
+    save_online_models(train_online_models(training_sets, features,
+                                           {a: d['Close'] for a, d in all_data.items()}),
+                       model_dir / 'online')
+    pd.DataFrame({'asset': ['A', 'A', 'B'], 'directional_accuracy': [0.5, 0.6, 0.7]}).to_csv(
+        model_dir / 'backtest_folds.csv'
+    )
+    if with_models:
+        from financial_mcp.model_registry import ModelRegistry
+        models, performance, _ = train_asset_models(training_sets, n_jobs=1,
+                                                    backend='hist_gradient_boosting')
+        ModelRegistry(model_dir).register(models, performance)
+    return features
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Immutable snapshots and atomic publication"""
+
+    def test_publish_swaps_whole_snapshot(self):
+        store = SnapshotStore(lambda: {'prices': {'A': {'current': 1.5}}, 'alerts': [{'asset': 'A'}]})
+        empty = store.current
+        self.assertEqual(empty.version, 0)
+        self.assertEqual(set(empty.bodies), set(SNAPSHOT_ENDPOINTS))
+
+        snapshot = store.refresh()
+        self.assertIs(store.current, snapshot)
+        self.assertEqual(snapshot.version, 1)
+        self.assertEqual(json.loads(snapshot.bodies['prices']), {'A': {'current': 1.5}})
+        self.assertEqual(empty.bodies['prices'], b'{}')
+        # Unchanged payloads keep their ETag, changed ones do not
+        self.assertEqual(snapshot.etags['correlations'], empty.etags['correlations'])
+        self.assertNotEqual(snapshot.etags['prices'], empty.etags['prices'])
+
+        with self.assertRaises(TypeError):
+            snapshot.bodies['prices'] = b'{}'
+        with self.assertRaises(AttributeError):
+            snapshot.version = 5
+
+    def test_listeners_see_every_publication(self):
+        store = SnapshotStore(dict)
+        seen = []
+        store.subscribe(lambda previous, snapshot: seen.append((previous.version, snapshot.version)))
+        store.refresh()
+        store.publish({'alerts': []})
+        self.assertEqual(seen, [(0, 1), (1, 2)])
+
+    def test_delta_and_push_messages(self):
+        base = Snapshot.build({'prices': {'A': {'current': np.nan}, 'B': {'current': 2.0}},
+                               'alerts': [], 'correlations': {}}, version=1)
+        new = Snapshot.build({'prices': {'A': {'current': np.nan}, 'C': {'current': 3.0}},
+                              'alerts': [{'asset': 'C'}], 'correlations': {}}, version=2)
+        self.assertEqual(snapshot_delta(base, new), {
+            'prices': {'changed': {'C': {'current': 3.0}}, 'removed': ['B']},
+            'alerts': [{'asset': 'C'}]
+        })
+        self.assertEqual(json.loads(delta_message(base, new)),
+                         {'type': 'delta', 'version': 2, 'base_version': 1,
+                          'changes': json.loads(json.dumps(snapshot_delta(base, new)))})
+        self.assertIsNone(delta_message(new, Snapshot.build(dict(new.payloads), version=3)))
+        self.assertEqual(json.loads(snapshot_message(new)), {
+            'type': 'snapshot', 'version': 2,
+            'data': {'prices': {'A': {'current': None}, 'C': {'current': 3.0}},
+                     'alerts': [{'asset': 'C'}], 'correlations': {}}
+        })
+
+    def test_serialization_of_numpy_and_missing_values(self):
+        snapshot = Snapshot.build({'prices': {'A': {'current': np.float32(2.5), 'change': np.nan,
+                                                    'date': pd.Timestamp('2024-01-02')}}}, version=1)
+        self.assertEqual(json.loads(snapshot.bodies['prices']),
+                         {'A': {'current': 2.5, 'change': None, 'date': '2024-01-02T00:00:00'}})
+
+
+class TestLoadPayloads(unittest.TestCase):
+    """Payloads built from the pipeline outputs"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load(self):
+        return load_payloads(self.directory / 'enhanced_data', self.directory / 'models',
+                             [self.directory / 'analysis_results', self.directory / 'financial_data'])
+
+    def test_payloads_without_registered_models(self):
+        write_pipeline_outputs(self.directory, with_models=False)
+        payloads = self.load()
+        self.assertEqual(set(payloads), set(SNAPSHOT_ENDPOINTS))
+
+        prices = payloads['prices']
+        self.assertEqual(set(prices), {'A', 'B'})
+        self.assertEqual(prices['B']['change'], -5.0)
+        self.assertEqual(len(prices['A']['history']), 30)
+
+        predictions = payloads['predictions']
+        self.assertIsNone(predictions['A']['ai'])
+        self.assertIsInstance(predictions['A']['online'], float)
+        self.assertAlmostEqual(predictions['A']['confidence'], 0.55)
+
+        self.assertEqual(payloads['correlations']['A']['B'], 0.3)
+        self.assertEqual(payloads['risk-metrics']['portfolio'], {'volatility': 1.2})
+        self.assertIn(('B', 'large_move'), [(a['asset'], a['type']) for a in payloads['alerts']])
+        self.assertIn(payloads['market-sentiment']['sentiment'], ('bullish', 'bearish', 'neutral'))
+
+    def test_tz_aware_history_across_dst(self):
+        write_pipeline_outputs(self.directory, with_models=False)
+        # Ticker.history indexes are tz-aware; January to August crosses the March DST change
+        data, features = make_asset(0, n_days=150)
+        enhanced_dir = self.directory / 'enhanced_data'
+        for frame, name in ((data, 'A_enhanced_data.csv'), (features, 'A_features.csv')):
+            frame.tz_localize('America/New_York').to_csv(enhanced_dir / name)
+
+        prices = self.load()['prices']
+        self.assertEqual(prices['A']['date'], data.index[-1].strftime('%Y-%m-%d'))
+        self.assertEqual([bar['date'] for bar in prices['A']['history']],
+                         [date.strftime('%Y-%m-%d') for date in data.index[-30:]])
+
+    @unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+    def test_model_predictions_from_registry(self):
+        from financial_mcp.model_registry import ModelRegistry
+
+        features = write_pipeline_outputs(self.directory)
+        payloads = self.load()
+
+        registry = ModelRegistry(self.directory / 'models')
+        model_data = registry.get('A')
+        row = features['A'][model_data['features']].iloc[[-1]].to_numpy()
+        self.assertAlmostEqual(payloads['predictions']['A']['ai'], registry.get_predictor('A')(row)[0])
+        self.assertEqual(payloads['predictions']['A']['model_version'], 1)
+
+
+@unittest.skipUnless(HAS_FASTAPI, "fastapi not installed")
+class TestApiServer(unittest.TestCase):
+    """HTTP endpoints"""
+
+    def test_endpoints_serve_current_snapshot(self):
+        payloads = {'prices': {'A': {'current': 1.0, 'change': 0.5}}}
+        store = SnapshotStore(lambda: payloads)
+        with TestClient(create_app(store, refresh_interval=0)) as client:
+            for endpoint in SNAPSHOT_ENDPOINTS:
+                response = client.get(f'/api/{endpoint}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, store.current.bodies[endpoint])
+
+            response = client.get('/api/prices')
+            self.assertEqual(response.json(), payloads['prices'])
+            self.assertEqual(response.headers['x-snapshot-version'], '1')
+            etag = response.headers['etag']
+            self.assertEqual(client.get('/api/prices', headers={'If-None-Match': etag}).status_code, 304)
+
+            health = client.get('/api/health').json()
+            self.assertEqual((health['status'], health['snapshot_version'], health['assets']), ('ok', 1, 1))
+
+            payloads['prices'] = {}
+            store.refresh()
+            response = client.get('/api/prices', headers={'If-None-Match': etag})
+            self.assertEqual((response.status_code, response.json()), (200, {}))
+
+    @unittest.skipUnless(HAS_APSCHEDULER, "apscheduler not installed")
+    def test_scheduler_jobs_and_metrics(self):
+        store = SnapshotStore(lambda: {'alerts': [{'asset': 'A'}]})
+
+        def scheduler_factory(store):
+            scheduler = JobScheduler()
+            scheduler.add_job('snapshot', store.refresh, 3600, run_at_start=True)
+            return scheduler
+
+        with TestClient(create_app(store, scheduler_factory)) as client:
+            self.assertTrue(wait_until(lambda: store.current.version >= 2))
+            body = client.get('/api/scheduler').json()
+            self.assertTrue(body['running'])
+            self.assertEqual(set(body['settings']), {'refresh_interval', 'model_retrain_hours', 'max_history_days',
+                                                 'model_keep_versions'})
+            self.assertEqual(body['jobs']['snapshot']['runs'], 1)
+            self.assertEqual(client.get('/api/alerts').json(), [{'asset': 'A'}])
+
+    def test_websocket_pushes_deltas(self):
+        payloads = {'prices': {'A': {'current': 1.0}, 'B': {'current': 2.0}}}
+        store = SnapshotStore(lambda: dict(payloads))
+        with TestClient(create_app(store, refresh_interval=0)) as client:
+            with client.websocket_connect('/ws') as websocket:
+                message = json.loads(websocket.receive_text())
+                self.assertEqual((message['type'], message['version']), ('snapshot', 1))
+                self.assertEqual(message['data']['prices'], payloads['prices'])
+
+                payloads['prices'] = {'A': {'current': 1.5}, 'B': {'current': 2.0}}
+                store.refresh()
+                store.refresh()  # unchanged: nothing pushed
+                payloads['alerts'] = [{'asset': 'A'}]
+                store.refresh()
+
+                self.assertEqual(json.loads(websocket.receive_text()), {
+                    'type': 'delta', 'version': 2, 'base_version': 1,
+                    'changes': {'prices': {'changed': {'A': {'current': 1.5}}, 'removed': []}}
+                })
+                self.assertEqual(json.loads(websocket.receive_text()), {
+                    'type': 'delta', 'version': 4, 'base_version': 2,
+                    'changes': {'alerts': [{'asset': 'A'}]}
+                })
+                self.assertEqual(client.get('/api/health').json()['push_clients'], 1)
+
+            # A client that is up to date only receives later changes
+            with client.websocket_connect(f'/ws?version={store.current.version}') as websocket:
+                payloads['alerts'] = []
+                store.refresh()
+                self.assertEqual(json.loads(websocket.receive_text())['changes'], {'alerts': []})
+            self.assertEqual(client.get('/api/health').json()['push_clients'], 0)
+
+    def test_slow_client_is_resynchronized(self):
+        broadcaster = UpdateBroadcaster(SnapshotStore(dict))
+
+        async def fill():
+            queue = broadcaster.connect()
+            for _ in range(CLIENT_QUEUE_SIZE + 1):
+                broadcaster._fan_out(b'{}')
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        # The backlog is replaced by a single full-snapshot marker
+        self.assertEqual(asyncio.run(fill()), [None])
+
+    def test_failed_refresh_keeps_serving(self):
+        def loader():
+            raise OSError("disk unavailable")
+
+        with TestClient(create_app(SnapshotStore(loader), refresh_interval=0)) as client:
+            self.assertEqual(client.get('/api/health').json()['status'], 'starting')
+            self.assertEqual(client.get('/api/alerts').json(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
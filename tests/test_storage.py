@@ -0,0 +1,85 @@
+"""
+Tests for the financial_mcp.storage module
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp import storage
+from financial_mcp.analyze import load_data
+
+
+class TestStorage(unittest.TestCase):
+    """Test round trips through each storage format"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_path = Path(self.tmp.name)
+        index = pd.date_range('2024-01-01', periods=5, freq='D', name='Date')
+        self.returns = pd.DataFrame(
+            {'SP500': np.linspace(-1, 1, 5), 'BTC': [np.nan, 2.0, -3.0, 0.5, 1.5]},
+            index=index
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Every format restores the index, columns and values"""
+        for file_format in storage.SUPPORTED_FORMATS:
+            with self.subTest(file_format=file_format):
+                filepath = storage.save_frame(self.returns, self.output_path, 'returns', file_format)
+                loaded = storage.load_frame(filepath, parse_dates=True)
+                pd.testing.assert_frame_equal(loaded, self.returns, check_freq=False)
+
+    def test_round_trip_string_index(self):
+        """Correlation matrices keep their asset-name index"""
+        corr = self.returns.corr()
+        for file_format in storage.SUPPORTED_FORMATS:
+            with self.subTest(file_format=file_format):
+                filepath = storage.save_frame(corr, self.output_path, 'corr', file_format)
+                pd.testing.assert_frame_equal(storage.load_frame(filepath), corr)
+
+    def test_load_data_prefers_columnar_files(self):
+        """load_data finds the combined returns file in any format"""
+        storage.save_frame(self.returns, self.output_path, 'combined_daily_returns_2020_2024', 'parquet')
+        loaded = load_data(self.tmp.name)
+        pd.testing.assert_frame_equal(loaded, self.returns, check_freq=False)
+        self.assertIsNone(load_data(self.tmp.name, 'csv'))
+
+    def test_tz_aware_csv_index_across_dst(self):
+        """Mixed UTC offsets load as tz-naive wall-clock dates"""
+        aware = self.returns.set_axis(pd.date_range('2024-03-08', periods=5, freq='D', tz='America/New_York'))
+        filepath = storage.save_frame(aware, self.output_path, 'aware', 'csv')
+        loaded = storage.load_frame(filepath, parse_dates=True)
+        self.assertIsInstance(loaded.index, pd.DatetimeIndex)
+        self.assertEqual(list(loaded.index), list(pd.date_range('2024-03-08', periods=5, freq='D')))
+
+    def test_newest_file_wins_across_formats(self):
+        """A stale columnar file does not shadow a fresher CSV"""
+        stale = storage.save_frame(self.returns * 0, self.output_path, 'returns', 'parquet')
+        os.utime(stale, (1_000_000_000, 1_000_000_000))
+        fresh = storage.save_frame(self.returns, self.output_path, 'returns', 'csv')
+
+        self.assertEqual(storage.find_frame(self.output_path, ['returns']), fresh)
+        self.assertEqual(storage.find_frame(self.output_path, ['returns'], 'parquet'), stale)
+        os.utime(fresh, (1_000_000_000, 1_000_000_000))
+        self.assertEqual(storage.find_frame(self.output_path, ['returns']), stale)
+
+    def test_unsupported_format(self):
+        """Unknown formats are rejected"""
+        with self.assertRaises(ValueError):
+            storage.save_frame(self.returns, self.output_path, 'returns', 'xlsx')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Tests for the financial_mcp.training module
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.training import (
+    build_training_set, chronological_split, train_asset_models, train_pooled_model,
+    predict_pooled, compare_training_modes
+)
+
+try:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import train_test_split
+    from enhanced_fetch_data import EnhancedDataFetcher
+    HAS_SKLEARN = True
+except ImportError:
+    HAS_SKLEARN = False
+
+
+def make_asset(seed=0, n_days=220, n_features=6):
+    """Raw data and feature matrix of one synthetic asset"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2022-01-03', periods=n_days)
+    returns = rng.normal(0, 1, n_days)
+    data = pd.DataFrame({'Close': 100 * np.cumprod(1 + returns / 100), 'Daily_Return': returns}, index=index)
+
+    values = rng.normal(size=(n_days, n_features))
+    values[:, 0] += 0.5 * np.roll(returns, -1)  # weak signal on the next-day return
+    features = pd.DataFrame(values, index=index, columns=[f'f{i}' for i in range(n_features)])
+    features.iloc[:10, 1] = np.nan  # warm-up rows
+    return data, features
+
+
+class TestBuildTrainingSet(unittest.TestCase):
+    """Target alignment"""
+
+    def test_target_is_next_day_return(self):
+        data, features = make_asset()
+        features.iloc[50, 2] = np.inf
+        X, y = build_training_set(features, data)
+
+        self.assertEqual(len(X), len(data) - 10 - 1 - 1)
+        self.assertTrue(np.isfinite(X.to_numpy()).all())
+        self.assertNotIn(data.index[-1], X.index)
+        self.assertNotIn(data.index[50], X.index)
+        position = data.index.get_indexer(X.index)
+        np.testing.assert_array_equal(y.to_numpy(), data['Daily_Return'].to_numpy()[position + 1])
+
+    def test_features_on_other_calendar(self):
+        data, features = make_asset()
+        X, y = build_training_set(features.iloc[::2], data)
+        self.assertTrue(X.index.isin(features.index[::2]).all())
+        self.assertFalse(y.isna().any())
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestTrainAssetModels(unittest.TestCase):
+    """Parallel per-asset training"""
+
+    def setUp(self):
+        self.training_sets = {}
+        for seed, asset in enumerate(['A', 'B', 'C']):
+            data, features = make_asset(seed)
+            self.training_sets[asset] = build_training_set(features, data)
+
+    def test_chronological_split_matches_sklearn(self):
+        for n in (100, 101, 157, 999):
+            train, _ = train_test_split(np.arange(n), test_size=0.2, shuffle=False)
+            self.assertEqual(chronological_split(n, 0.2), len(train))
+
+    def test_matches_sequential_reference(self):
+        models, performance, errors = train_asset_models(self.training_sets, n_jobs=2)
+        self.assertEqual(errors, {})
+        self.assertEqual(set(models), {'A', 'B', 'C'})
+
+        X, y = self.training_sets['B']
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=False)
+        scaler = StandardScaler()
+        reference = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+        reference.fit(scaler.fit_transform(X_train), y_train)
+        expected = reference.predict(scaler.transform(X_test))
+
+        model = models['B']
+        self.assertEqual(model['features'], X.columns.tolist())
+        self.assertEqual(model['model'].n_jobs, 1)
+        np.testing.assert_allclose(model['model'].predict(model['scaler'].transform(X_test)), expected)
+        self.assertEqual(performance['B']['training_samples'], len(X_train))
+        self.assertEqual(performance['B']['test_samples'], len(X_test))
+        self.assertEqual(set(performance['B']), {'r2_score', 'rmse', 'training_samples', 'test_samples'})
+
+    def test_worker_count_does_not_change_results(self):
+        _, parallel, _ = train_asset_models(self.training_sets, n_jobs=2)
+        _, serial, _ = train_asset_models(self.training_sets, n_jobs=1)
+        self.assertEqual(parallel, serial)
+
+    def test_failed_asset_is_reported(self):
+        X, y = self.training_sets['A']
+        self.training_sets['bad'] = (X.iloc[:1], y.iloc[:1])
+        models, performance, errors = train_asset_models(self.training_sets, n_jobs=2)
+        self.assertIn('bad', errors)
+        self.assertNotIn('bad', models)
+        self.assertEqual(set(performance), {'A', 'B', 'C'})
+
+    def test_fetcher_uses_raw_returns(self):
+        fetcher = EnhancedDataFetcher.__new__(EnhancedDataFetcher)
+        fetcher.model_backend = 'random_forest'
+        fetcher.training_mode = 'per_asset'
+        all_data, enhanced_features = {}, {}
+        for seed, asset in enumerate(['A', 'B']):
+            all_data[asset], enhanced_features[asset] = make_asset(seed)
+        all_data['short'], enhanced_features['short'] = make_asset(5, n_days=60)
+
+        models, performance = fetcher.train_prediction_models(enhanced_features, all_data, n_jobs=1)
+        self.assertEqual(set(models), {'A', 'B'})
+        self.assertNotIn('Daily_Return', models['A']['features'])
+
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestPooledModel(unittest.TestCase):
+    """One model on the stacked panel"""
+
+    def setUp(self):
+        self.training_sets = {}
+        for seed, asset in enumerate(['A', 'B', 'C']):
+            data, features = make_asset(seed, n_days=150)
+            self.training_sets[asset] = build_training_set(features, data)
+        self.asset_classes = {'A': 'crypto', 'B': 'crypto', 'C': 'currencies'}
+
+    def test_pooled_model(self):
+        model_data, performance = train_pooled_model(
+            self.training_sets, self.asset_classes, n_jobs=1, backend='hist_gradient_boosting'
+        )
+        self.assertEqual(model_data['assets'], ['A', 'B', 'C'])
+        self.assertEqual(model_data['model_features'][-3:], ['asset_id', 'class_crypto', 'class_currencies'])
+        self.assertEqual(set(performance), {'A', 'B', 'C'})
+
+        X, _ = self.training_sets['C']
+        split = chronological_split(len(X))
+        self.assertEqual(performance['C']['training_samples'], split)
+
+        # Batched prediction equals predicting the asset's stacked rows directly
+        predictions = predict_pooled(model_data, {'C': X.iloc[split:], 'A': X.iloc[:3]})
+        rows = X.iloc[split:].assign(asset_id=2.0, class_crypto=0.0, class_currencies=1.0)
+        np.testing.assert_allclose(predictions['C'], model_data['model'].predict(rows.astype(np.float32)))
+        self.assertEqual(len(predictions['A']), 3)
+
+        with self.assertRaises(ValueError):
+            predict_pooled(model_data, {'D': X})
+
+    def test_mismatched_columns(self):
+        X, y = self.training_sets['A']
+        self.training_sets['A'] = (X.rename(columns={'f0': 'other'}), y)
+        with self.assertRaises(ValueError):
+            train_pooled_model(self.training_sets, n_jobs=1)
+
+    def test_compare_training_modes(self):
+        comparison = compare_training_modes(self.training_sets, self.asset_classes, n_jobs=1,
+                                            backend='hist_gradient_boosting')
+        self.assertEqual(list(comparison.index), ['per_asset', 'pooled'])
+        self.assertEqual(comparison.loc['per_asset', 'model_files'], 3)
+        self.assertEqual(comparison.loc['pooled', 'model_files'], 1)
+        self.assertTrue((comparison['load_seconds'] > 0).all())
+
+    def test_fetcher_pooled_mode(self):
+        fetcher = EnhancedDataFetcher.__new__(EnhancedDataFetcher)
+        fetcher.model_backend = 'hist_gradient_boosting'
+        fetcher.training_mode = 'pooled'
+        fetcher.asset_classes = self.asset_classes
+        all_data, enhanced_features = {}, {}
+        for seed, asset in enumerate(['A', 'B']):
+            all_data[asset], enhanced_features[asset] = make_asset(seed)
+
+        models, performance = fetcher.train_prediction_models(enhanced_features, all_data, n_jobs=1)
+        self.assertEqual(list(models), ['pooled'])
+        self.assertEqual(set(performance), {'A', 'B'})
+
+
+if __name__ == '__main__':
+    unittest.main()
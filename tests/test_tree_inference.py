@@ -0,0 +1,80 @@
+"""
+Tests for the financial_mcp.tree_inference module
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the package root to the path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from financial_mcp.tree_inference import compile_model, compile_model_data, measure_latency
+from test_training import HAS_SKLEARN
+
+if HAS_SKLEARN:
+    from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor, HistGradientBoostingRegressor
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.preprocessing import StandardScaler
+
+
+def make_data(seed=0, n_rows=600, n_features=12):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features)) * 3 + 1
+    y = 0.4 * X[:, 0] - 0.2 * X[:, 1] * X[:, 2] + rng.normal(size=n_rows)
+    return X, y
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestCompiledForest(unittest.TestCase):
+    """Bit-compatibility with model.predict"""
+
+    def setUp(self):
+        self.X, self.y = make_data()
+        self.train, self.test = self.X[:450], self.X[450:]
+
+    def test_random_forest_with_scaler(self):
+        scaler = StandardScaler().fit(self.train)
+        model = RandomForestRegressor(n_estimators=30, random_state=0, n_jobs=1)
+        model.fit(scaler.transform(self.train), self.y[:450])
+
+        compiled = compile_model(model, scaler)
+        np.testing.assert_array_equal(compiled.predict(self.test), model.predict(scaler.transform(self.test)))
+        self.assertEqual(compiled.predict(self.test[0]).shape, (1,))
+        self.assertEqual(compiled.predict(self.test[:1])[0], model.predict(scaler.transform(self.test[:1]))[0])
+
+    def test_other_tree_models(self):
+        for model in (ExtraTreesRegressor(n_estimators=20, random_state=0),
+                      DecisionTreeRegressor(max_depth=6, random_state=0)):
+            model.fit(self.train, self.y[:450])
+            np.testing.assert_array_equal(compile_model(model).predict(self.test), model.predict(self.test))
+
+    def test_missing_values_follow_learned_direction(self):
+        train = self.train.copy()
+        train[::5, 0] = np.nan
+        model = RandomForestRegressor(n_estimators=20, random_state=0).fit(train, self.y[:450])
+        test = self.test.copy()
+        test[::3, 0] = np.nan
+        np.testing.assert_array_equal(compile_model(model).predict(test), model.predict(test))
+
+    def test_unsupported_models(self):
+        model = HistGradientBoostingRegressor(max_iter=10).fit(self.train, self.y[:450])
+        with self.assertRaises(ValueError):
+            compile_model(model)
+        self.assertIsNone(compile_model_data({'model': model, 'scaler': None}))
+
+        forest = RandomForestRegressor(n_estimators=5, random_state=0).fit(self.train, self.y[:450])
+        with self.assertRaises(ValueError):
+            compile_model(forest).predict(self.test[:, :5])
+
+    def test_measure_latency(self):
+        model = RandomForestRegressor(n_estimators=10, random_state=0).fit(self.train, self.y[:450])
+        latency = measure_latency(compile_model(model).predict, self.test, repeats=50)
+        self.assertEqual(set(latency), {'p50_ms', 'p99_ms', 'max_ms'})
+        self.assertLessEqual(latency['p50_ms'], latency['p99_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()